@@ -28,11 +28,13 @@ from __future__ import (absolute_import, division,
 from builtins import *
 
 import abc
-from typing import Dict, Any, Set, Tuple, List
+from typing import Dict, Any, Set, Tuple, List, Iterable
 from future.utils import with_metaclass
 
 import bisect
 
+import numpy as np
+
 from bag.math import lcm
 from bag.util.interval import IntervalSet
 
@@ -48,6 +50,8 @@ from .base import LaygoPrimitive, LaygoSubstrate, LaygoEndRow, LaygoSpace
 
 
 class LaygoIntvSet(object):
+    __slots__ = ('_intv', '_end_flags')
+
     def __init__(self):
         super(LaygoIntvSet, self).__init__()
         self._intv = IntervalSet()
@@ -96,6 +100,143 @@ class LaygoIntvSet(object):
         return self._intv.get_end()
 
 
+class LaygoRowY(object):
+    """The Y coordinates of a laygo row.
+
+    Parameters
+    ----------
+    ybot : int
+        bottom Y coordinate of the row, including bottom extension.
+    yblk_bot : int
+        bottom Y coordinate of the transistor block.
+    yblk_top : int
+        top Y coordinate of the transistor block.
+    ytop : int
+        top Y coordinate of the row, including top extension.
+    """
+    __slots__ = ('ybot', 'yblk_bot', 'yblk_top', 'ytop')
+
+    def __init__(self, ybot, yblk_bot, yblk_top, ytop):
+        # type: (int, int, int, int) -> None
+        self.ybot = ybot
+        self.yblk_bot = yblk_bot
+        self.yblk_top = yblk_top
+        self.ytop = ytop
+
+    def __eq__(self, other):
+        return (isinstance(other, LaygoRowY) and self.ybot == other.ybot and self.yblk_bot == other.yblk_bot and
+                self.yblk_top == other.yblk_top and self.ytop == other.ytop)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def get_inst_y(self, orient):
+        # type: (str) -> int
+        """Returns the Y coordinate of a block instance in this row with the given orientation."""
+        return self.yblk_bot if orient == 'R0' else self.yblk_top
+
+
+class LaygoExtParams(object):
+    """The parameters of the extension block below a laygo row.
+
+    Parameters
+    ----------
+    lch : float
+        the channel length, in meters.
+    w : int
+        the extension width, in mos pitches.
+    bot_mtype : str
+        the bottom transistor type.
+    top_mtype : str
+        the top transistor type.
+    bot_thres : str
+        the bottom transistor threshold.
+    top_thres : str
+        the top transistor threshold.
+    top_ext_info : Any
+        the extension information of the top edge of the bottom row.
+    bot_ext_info : Any
+        the extension information of the bottom edge of the top row.
+    """
+    __slots__ = ('lch', 'w', 'bot_mtype', 'top_mtype', 'bot_thres', 'top_thres', 'top_ext_info', 'bot_ext_info')
+
+    def __init__(self, lch, w, bot_mtype, top_mtype, bot_thres, top_thres, top_ext_info, bot_ext_info):
+        # type: (float, int, str, str, str, str, Any, Any) -> None
+        self.lch = lch
+        self.w = w
+        self.bot_mtype = bot_mtype
+        self.top_mtype = top_mtype
+        self.bot_thres = bot_thres
+        self.top_thres = top_thres
+        self.top_ext_info = top_ext_info
+        self.bot_ext_info = bot_ext_info
+
+    def __eq__(self, other):
+        return isinstance(other, LaygoExtParams) and all((getattr(self, name) == getattr(other, name)
+                                                          for name in self.__slots__))
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def to_dict(self):
+        # type: () -> Dict[str, Any]
+        """Returns the AnalogMOSExt parameters dictionary."""
+        return dict(
+            lch=self.lch,
+            w=self.w,
+            bot_mtype=self.bot_mtype,
+            top_mtype=self.top_mtype,
+            bot_thres=self.bot_thres,
+            top_thres=self.top_thres,
+            top_ext_info=self.top_ext_info,
+            bot_ext_info=self.bot_ext_info,
+            is_laygo=True,
+        )
+
+
+class LaygoInstRecord(object):
+    """A build log entry of a laygo row, recording an added primitive or space instance.
+
+    Parameters
+    ----------
+    kind : str
+        the instance kind, either 'primitive' or 'space'.
+    master : TemplateBase
+        the instance master.
+    inst_name : str
+        the instance name.
+    loc : Tuple[int, int]
+        the instance location, in resolution units.
+    orient : str
+        the instance orientation.
+    nx : int
+        number of columns.
+    spx : int
+        column pitch, in resolution units.
+    intv_list : List[Tuple[Tuple[int, int], bool, bool]]
+        list of used column intervals and their left/right end flags.
+    is_fill : bool
+        True if this is a space instance added by fill_space().
+    """
+    __slots__ = ('kind', 'master', 'inst_name', 'loc', 'orient', 'nx', 'spx', 'intv_list', 'is_fill')
+
+    def __init__(self, kind, master, inst_name, loc, orient, nx, spx, intv_list, is_fill=False):
+        # type: (str, TemplateBase, str, Tuple[int, int], str, int, int, List[Tuple[Any, bool, bool]], bool) -> None
+        self.kind = kind
+        self.master = master
+        self.inst_name = inst_name
+        self.loc = loc
+        self.orient = orient
+        self.nx = nx
+        self.spx = spx
+        self.intv_list = intv_list
+        self.is_fill = is_fill
+
+
 class LaygoBaseInfo(object):
     def __init__(self, grid, config, top_layer=None, guard_ring_nf=0, draw_boundaries=False, end_mode=0):
         # update routing grid
@@ -119,6 +260,8 @@ class LaygoBaseInfo(object):
         self.guard_ring_nf = guard_ring_nf
         self.draw_boundaries = draw_boundaries
         self.end_mode = end_mode
+        self._col_edges = None
+        self._col_edges_key = None
 
     @property
     def tech_cls(self):
@@ -166,7 +309,7 @@ class LaygoBaseInfo(object):
         return self._config[item]
 
     def col_to_coord(self, col_idx, ds_type, unit_mode=False):
-        offset = self.left_margin + col_idx * self._col_width
+        offset = self.get_col_edge(col_idx)
         if ds_type == 's':
             ans = offset
         elif ds_type == 'd':
@@ -221,6 +364,162 @@ class LaygoBaseInfo(object):
         else:
             return (col_idx_half - 1) // 2, 'd'
 
+    def get_col_edges(self, num_col, unit_mode=False):
+        # type: (int, bool) -> np.ndarray
+        """Returns the X coordinates of the left edges of columns 0 to num_col, inclusive.
+
+        The column edge table is computed once and extended on demand.  It is recomputed
+        only if the left margin changes.
+
+        Parameters
+        ----------
+        num_col : int
+            number of columns.
+        unit_mode : bool
+            True to return coordinates in resolution units.
+
+        Returns
+        -------
+        col_edges : np.ndarray
+            the column edge X coordinates, as a 1D array of size num_col + 1.
+        """
+        key = (self.guard_ring_nf, self.top_layer, self.end_mode & 4 != 0)
+        if self._col_edges is None or self._col_edges_key != key or self._col_edges.size <= num_col:
+            size = num_col + 1
+            if self._col_edges is not None and self._col_edges_key == key:
+                size = max(size, 2 * self._col_edges.size)
+            self._col_edges = self.left_margin + self._col_width * np.arange(size, dtype=int)
+            self._col_edges_key = key
+
+        ans = self._col_edges[:num_col + 1]
+        if unit_mode:
+            return ans
+        return ans * self.grid.resolution
+
+    def get_col_edge(self, col_idx):
+        # type: (int) -> int
+        """Returns the X coordinate of the left edge of the given column, in resolution units."""
+        if col_idx < 0:
+            return self.left_margin + col_idx * self._col_width
+        return int(self.get_col_edges(col_idx, unit_mode=True)[col_idx])
+
+    def col_to_coord_array(self, col_idx, ds_type, unit_mode=False):
+        # type: (Any, Any, bool) -> np.ndarray
+        """Vectorized version of col_to_coord().
+
+        Parameters
+        ----------
+        col_idx : Any
+            array of column indices.
+        ds_type : Any
+            either 's' or 'd', or an array of 's'/'d' with the same shape as col_idx.
+        unit_mode : bool
+            True to return coordinates in resolution units.
+
+        Returns
+        -------
+        coords : np.ndarray
+            the column coordinates.
+        """
+        col_idx = np.asarray(col_idx, dtype=int)
+        ds_type = np.asarray(ds_type)
+        is_s = ds_type == 's'
+        is_d = ds_type == 'd'
+        if not np.all(is_s | is_d):
+            raise ValueError('Unrecognized ds type: %s' % ds_type[~(is_s | is_d)].flat[0])
+
+        if col_idx.size > 0 and col_idx.min() >= 0:
+            ans = self.get_col_edges(int(col_idx.max()), unit_mode=True)[col_idx]
+        else:
+            ans = self.left_margin + col_idx * self._col_width
+        ans = ans + is_d * (self._col_width // 2)
+        if unit_mode:
+            return ans
+        return ans * self.grid.resolution
+
+    def coord_to_nearest_col_array(self, coord, ds_type=None, mode=0, unit_mode=False):
+        # type: (Any, Any, int, bool) -> Tuple[np.ndarray, np.ndarray]
+        """Vectorized version of coord_to_nearest_col().
+
+        Parameters
+        ----------
+        coord : Any
+            array of coordinates.
+        ds_type : Any
+            the column type to round to.  None to round to either source or drain column.
+        mode : int
+            the rounding mode.  See coord_to_nearest_col().
+        unit_mode : bool
+            True if coordinates are given in resolution units.
+
+        Returns
+        -------
+        col_idx : np.ndarray
+            the column indices.
+        ds_type : np.ndarray
+            the column types, as an array of 's'/'d' strings.
+        """
+        if unit_mode:
+            coord = np.asarray(coord, dtype=int)
+        else:
+            coord = np.rint(np.asarray(coord) / self.grid.resolution).astype(int)
+
+        col_width = self._col_width
+        if ds_type is None or ds_type == 's':
+            offset = self.left_margin
+        else:
+            offset = self.left_margin + col_width
+        if ds_type is None:
+            k = col_width // 2
+        else:
+            k = col_width
+
+        coord = coord - offset
+        if mode == 0:
+            n = np.rint(coord / k).astype(int)
+        elif mode > 0:
+            if mode == 2:
+                coord = coord + (coord % k == 0)
+            n = -(-coord // k)
+        else:
+            if mode == -2:
+                coord = coord - (coord % k == 0)
+            n = coord // k
+
+        return self.coord_to_col_array(n * k + offset, unit_mode=True)
+
+    def coord_to_col_array(self, coord, unit_mode=False):
+        # type: (Any, bool) -> Tuple[np.ndarray, np.ndarray]
+        """Vectorized version of coord_to_col().
+
+        Parameters
+        ----------
+        coord : Any
+            array of coordinates.
+        unit_mode : bool
+            True if coordinates are given in resolution units.
+
+        Returns
+        -------
+        col_idx : np.ndarray
+            the column indices.
+        ds_type : np.ndarray
+            the column types, as an array of 's'/'d' strings.
+        """
+        if unit_mode:
+            coord = np.asarray(coord, dtype=int)
+        else:
+            coord = np.rint(np.asarray(coord) / self.grid.resolution).astype(int)
+
+        k = self._col_width // 2
+        delta = coord - self.left_margin
+        off_pitch = delta % k != 0
+        if np.any(off_pitch):
+            raise ValueError('Coordinate %d is not on pitch.' % coord[off_pitch].flat[0])
+
+        col_idx_half = delta // k
+        return col_idx_half // 2, np.where(col_idx_half % 2 == 0, 's', 'd')
+
 
 class LaygoBase(with_metaclass(abc.ABCMeta, TemplateBase)):
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
@@ -239,13 +538,18 @@ class LaygoBase(with_metaclass(abc.ABCMeta, TemplateBase)):
         self._row_thresholds = None
         self._row_infos = None
         self._row_kwargs = None
-        self._row_y = None
-        self._ext_params = None
+        self._row_y = None  # type: List[LaygoRowY]
+        self._ext_params = None  # type: List[LaygoExtParams]
         self._used_list = None  # type: List[LaygoIntvSet]
+        self._row_logs = None  # type: List[List[LaygoInstRecord]]
+        self._ext_masters = None
+        self._fill_src = None
+        self._ext_src = None
         self._bot_end_master = None
         self._top_end_master = None
         self._has_boundaries = False
         self._ext_edges = None
+        self._edge_masters = {}
 
     @property
     def laygo_info(self):
@@ -347,6 +651,10 @@ class LaygoBase(with_metaclass(abc.ABCMeta, TemplateBase)):
         self._row_thresholds = row_thresholds
         self._row_kwargs = row_kwargs
         self._used_list = [LaygoIntvSet() for _ in range(self._num_rows)]
+        self._row_logs = [[] for _ in range(self._num_rows)]
+        self._ext_masters = [None] * self._num_rows
+        self._fill_src = {}
+        self._ext_src = {}
 
         if draw_boundaries:
             bot_end = (end_mode & 1) != 0
@@ -567,18 +875,10 @@ class LaygoBase(with_metaclass(abc.ABCMeta, TemplateBase)):
             if prev_ext_info is None:
                 ext_params = None
             else:
-                ext_params = dict(
-                    lch=self._laygo_info.lch,
-                    w=prev_ext_h + cur_bot_ext_h,
-                    bot_mtype=row_types[idx - 1],
-                    top_mtype=row_type,
-                    bot_thres=row_thresholds[idx - 1],
-                    top_thres=row_thresholds[idx],
-                    top_ext_info=prev_ext_info,
-                    bot_ext_info=ext_bot_info,
-                    is_laygo=True,
-                )
-            row_y.append((y0, ycur, ycur + blk_height, ytop))
+                ext_params = LaygoExtParams(self._laygo_info.lch, prev_ext_h + cur_bot_ext_h,
+                                            row_types[idx - 1], row_type, row_thresholds[idx - 1],
+                                            row_thresholds[idx], prev_ext_info, ext_bot_info)
+            row_y.append(LaygoRowY(y0, ycur, ycur + blk_height, ytop))
             row_infos.append(mos_info)
             ext_params_list.append(ext_params)
 
@@ -627,7 +927,7 @@ class LaygoBase(with_metaclass(abc.ABCMeta, TemplateBase)):
             guard_ring_nf = self._laygo_info.guard_ring_nf
 
             width = col_width * num_col
-            height = self._row_y[-1][-1]
+            height = self._row_y[-1].ytop
             if draw_boundaries:
                 width += left_margin + right_margin
                 height += self._top_end_master.bound_box.height_unit
@@ -640,12 +940,17 @@ class LaygoBase(with_metaclass(abc.ABCMeta, TemplateBase)):
             right_end = (end_mode & 8) != 0
             xr = left_margin + col_width * num_col + right_margin
             self._ext_edges = []
-            for idx, (bot_info, ext_params) in enumerate(zip(self._row_infos, self._ext_params)):
+            for idx, ext_params in enumerate(self._ext_params):
                 if ext_params is not None:
-                    ext_h = ext_params['w']
+                    ext_h = ext_params.w
                     if ext_h > 0 or self._tech_cls.draw_zero_extension():
-                        yext = self._row_y[idx - 1][2]
-                        ext_master = self.new_template(params=ext_params, temp_cls=AnalogMOSExt)
+                        yext = self._row_y[idx - 1].yblk_top
+                        ext_src = self._ext_src.get(idx, None)
+                        if ext_src is not None and ext_src[0] == ext_params:
+                            ext_master = ext_src[1]
+                        else:
+                            ext_master = self.new_template(params=ext_params.to_dict(), temp_cls=AnalogMOSExt)
+                        self._ext_masters[idx] = ext_master
                         self.add_instance(ext_master, inst_name='XEXT%d' % idx, loc=(left_margin, yext),
                                           nx=num_col, spx=col_width, unit_mode=True)
                         if draw_boundaries:
@@ -670,7 +975,6 @@ class LaygoBase(with_metaclass(abc.ABCMeta, TemplateBase)):
 
         lch = self._laygo_info.lch
         col_width = self._laygo_info.col_width
-        left_margin = self._laygo_info.left_margin
 
         mos_type = self._row_types[row_idx]
         row_orient = self._row_orientations[row_idx]
@@ -698,35 +1002,114 @@ class LaygoBase(with_metaclass(abc.ABCMeta, TemplateBase)):
             params['blk_type'] = blk_type
             master = self.new_template(params=params, temp_cls=LaygoPrimitive)
 
-        intv = self._used_list[row_idx]
         inst_endl, inst_endr = master.get_end_flags()
         if flip:
             inst_endl, inst_endr = inst_endr, inst_endl
+        intv_list = []
         for inst_num in range(nx):
             intv_offset = col_idx + spx * inst_num
-            inst_intv = intv_offset, intv_offset + 1
-            if not intv.add(inst_intv, inst_endl, inst_endr):
-                raise ValueError('Cannot add primitive on row %d, '
-                                 'column [%d, %d).' % (row_idx, inst_intv[0], inst_intv[1]))
+            intv_list.append(((intv_offset, intv_offset + 1), inst_endl, inst_endr))
 
-        x0 = left_margin + col_idx * col_width
+        x0 = self._laygo_info.get_col_edge(col_idx)
         if flip:
             x0 += col_width
 
-        _, ycur, ytop, _ = self._row_y[row_idx]
+        y0 = self._row_y[row_idx].get_inst_y(row_orient)
         if row_orient == 'R0':
-            y0 = self._row_y[row_idx][1]
             orient = 'MY' if flip else 'R0'
         else:
-            y0 = self._row_y[row_idx][2]
             orient = 'R180' if flip else 'MX'
 
         # convert horizontal pitch to resolution units
         spx *= col_width
 
         inst_name = 'XR%dC%d' % (row_idx, col_idx)
-        return self.add_instance(master, inst_name=inst_name, loc=(x0, y0), orient=orient,
-                                 nx=nx, spx=spx, unit_mode=True)
+        record = LaygoInstRecord('primitive', master, inst_name, (x0, y0), orient, nx, spx, intv_list)
+        return self._add_record(row_idx, record)
+
+    def _add_record(self, row_idx, record):
+        # type: (int, LaygoInstRecord) -> Instance
+        """Mark the columns used by the given instance record, then add the instance and log it."""
+        intv = self._used_list[row_idx]
+        for inst_intv, inst_endl, inst_endr in record.intv_list:
+            if not intv.add(inst_intv, inst_endl, inst_endr):
+                raise ValueError('Cannot add %s on row %d, '
+                                 'column [%d, %d).' % (record.kind, row_idx, inst_intv[0], inst_intv[1]))
+
+        self._row_logs[row_idx].append(record)
+        return self.add_instance(record.master, inst_name=record.inst_name, loc=record.loc, orient=record.orient,
+                                 nx=record.nx, spx=record.spx, unit_mode=True)
+
+    def get_row_log(self, row_idx):
+        # type: (int) -> List[LaygoInstRecord]
+        """Returns the list of primitive and space instance records added to the given row."""
+        return self._row_logs[row_idx]
+
+    def _is_same_row(self, template, row_idx):
+        # type: (LaygoBase, int) -> bool
+        """Returns True if the given row has the same specification and placement in the given template."""
+        # noinspection PyProtectedMember
+        return (row_idx < template._num_rows and
+                self._row_types[row_idx] == template._row_types[row_idx] and
+                self._row_orientations[row_idx] == template._row_orientations[row_idx] and
+                self._row_thresholds[row_idx] == template._row_thresholds[row_idx] and
+                self._row_kwargs[row_idx] == template._row_kwargs[row_idx] and
+                self._row_infos[row_idx]['row_name_id'] == template._row_infos[row_idx]['row_name_id'] and
+                self._row_y[row_idx] == template._row_y[row_idx])
+
+    def copy_rows(self, template, row_list):
+        # type: (LaygoBase, Iterable[int]) -> Dict[int, List[Instance]]
+        """Copy the placements of the given rows from another LaygoBase template.
+
+        This method lets a template that differs from another template in only a few rows reuse
+        the placements and masters of the unchanged rows.  Primitives and spaces added explicitly
+        are copied immediately.  Spaces added by fill_space() are reused by fill_space() if the
+        unused intervals of the row are the same in both templates, and extension masters are
+        reused by set_laygo_size() if the extension parameters are the same.
+
+        Both templates must belong to the same template database, and the given rows must have
+        the same row specification and Y coordinates in both templates.
+
+        Parameters
+        ----------
+        template : LaygoBase
+            the LaygoBase template to copy rows from.
+        row_list : Iterable[int]
+            list of row indices to copy.
+
+        Returns
+        -------
+        inst_dict : Dict[int, List[Instance]]
+            dictionary from row index to the list of copied instances, in the order they were added.
+        """
+        if self._row_logs is None:
+            raise ValueError('row types must be set before copying rows.')
+        if self._laygo_size is not None:
+            raise ValueError('Cannot copy rows after laygo_size is set.')
+        src_info = template.laygo_info
+        if src_info.col_width != self._laygo_info.col_width or src_info.left_margin != self._laygo_info.left_margin:
+            raise ValueError('Cannot copy rows from a template with different column placement.')
+
+        # noinspection PyProtectedMember
+        src_logs, src_ext_params, src_ext_masters = template._row_logs, template._ext_params, template._ext_masters
+        inst_dict = {}
+        for row_idx in row_list:
+            if not self._is_same_row(template, row_idx):
+                raise ValueError('Row %d is different in the given template.' % row_idx)
+            inst_list = []
+            fill_list = []
+            for record in src_logs[row_idx]:
+                if record.is_fill:
+                    fill_list.append(record)
+                else:
+                    inst_list.append(self._add_record(row_idx, record))
+            if fill_list:
+                self._fill_src[row_idx] = fill_list
+            if src_ext_masters[row_idx] is not None:
+                self._ext_src[row_idx] = (src_ext_params[row_idx], src_ext_masters[row_idx])
+            inst_dict[row_idx] = inst_list
+
+        return inst_dict
 
     def fill_space(self):
         if self._laygo_size is None:
@@ -734,25 +1117,34 @@ class LaygoBase(with_metaclass(abc.ABCMeta, TemplateBase)):
 
         total_intv = (0, self._laygo_size[0])
         for row_idx, intv in enumerate(self._used_list):
+            space_list = []
             for (start, end), (flag_l, flag_r) in zip(*intv.get_complement(total_intv)):
                 od_flag = 0
                 if flag_l:
                     od_flag |= 1
                 if flag_r:
                     od_flag |= 2
-                self.add_laygo_space(od_flag, num_blk=end - start, loc=(start, row_idx))
+                space_list.append((start, end, od_flag))
+
+            # reuse copied space instances if this row has the same unused intervals
+            fill_list = self._fill_src.get(row_idx, None)
+            if fill_list is not None and len(fill_list) == len(space_list) and \
+                    all((rec.intv_list[0][0] == (start, end) and rec.master.params['adj_od_flag'] == od_flag
+                         for rec, (start, end, od_flag) in zip(fill_list, space_list))):
+                for record in fill_list:
+                    self._add_record(row_idx, record)
+            else:
+                for start, end, od_flag in space_list:
+                    self._add_laygo_space(od_flag, end - start, (start, row_idx), True, {})
 
     def add_laygo_space(self, adj_od_flag, num_blk=1, loc=(0, 0), **kwargs):
+        return self._add_laygo_space(adj_od_flag, num_blk, loc, False, kwargs)
+
+    def _add_laygo_space(self, adj_od_flag, num_blk, loc, is_fill, kwargs):
+        # type: (int, int, Tuple[int, int], bool, Dict[str, Any]) -> Instance
         col_idx, row_idx = loc
         row_info = self._row_infos[row_idx]
-        row_y = self._row_y[row_idx]
         row_orient = self._row_orientations[row_idx]
-        intv = self._used_list[row_idx]
-
-        # update used interval
-        inst_intv = (col_idx, col_idx + num_blk)
-        if not intv.add(inst_intv, False, False):
-            raise ValueError('Cannot add space on row %d, column [%d, %d)' % (row_idx, inst_intv[0], inst_intv[1]))
 
         # make sep_mode flag
         sep_mode = 0
@@ -774,15 +1166,84 @@ class LaygoBase(with_metaclass(abc.ABCMeta, TemplateBase)):
         inst_name = 'XR%dC%d' % (row_idx, col_idx)
         master = self.new_template(params=params, temp_cls=LaygoSpace)
 
-        x0 = self._laygo_info.left_margin + col_idx * self._laygo_info.col_width
-        y0 = row_y[1] if row_orient == 'R0' else row_y[2]
-        self.add_instance(master, inst_name=inst_name, loc=(x0, y0), orient=row_orient, unit_mode=True)
+        x0 = self._laygo_info.get_col_edge(col_idx)
+        y0 = self._row_y[row_idx].get_inst_y(row_orient)
+        intv_list = [((col_idx, col_idx + num_blk), False, False)]
+        record = LaygoInstRecord('space', master, inst_name, (x0, y0), row_orient, 1, 0, intv_list, is_fill=is_fill)
+        return self._add_record(row_idx, record)
+
+    def _get_edge_master(self, name_id, layout_info, is_end):
+        # type: (str, Dict[str, Any], bool) -> AnalogEdge
+        """Returns the edge master with the given parameters, reusing previously created masters.
+
+        Parameters
+        ----------
+        name_id : str
+            the edge layout name ID.
+        layout_info : Dict[str, Any]
+            the edge layout information dictionary.
+        is_end : bool
+            True if there are no blocks abutting the edge.
+
+        Returns
+        -------
+        edge_master : AnalogEdge
+            the edge master.
+        """
+        top_layer = self._laygo_info.top_layer
+        guard_ring_nf = self._laygo_info.guard_ring_nf
+        key = (name_id, is_end, guard_ring_nf, top_layer)
+        edge_master = self._edge_masters.get(key, None)
+        if edge_master is None:
+            edge_params = dict(
+                top_layer=top_layer,
+                is_end=is_end,
+                guard_ring_nf=guard_ring_nf,
+                name_id=name_id,
+                layout_info=layout_info,
+                is_laygo=True,
+            )
+            edge_master = self.new_template(params=edge_params, temp_cls=AnalogEdge)
+            self._edge_masters[key] = edge_master
+        return edge_master
+
+    def _add_edge_instances(self, edge_list):
+        # type: (List[Tuple[int, int, str, AnalogEdge]]) -> List[Instance]
+        """Adds the given edge blocks, arraying consecutive identical edges placed on a uniform pitch.
+
+        Parameters
+        ----------
+        edge_list : List[Tuple[int, int, str, AnalogEdge]]
+            list of (x, y, orient, master) tuples, sorted by increasing Y coordinate.
+
+        Returns
+        -------
+        inst_list : List[Instance]
+            the list of added edge instances.
+        """
+        inst_list = []
+        num_edges = len(edge_list)
+        idx = 0
+        while idx < num_edges:
+            x, y, orient, master = edge_list[idx]
+            ny, spy = 1, 0
+            if idx + 1 < num_edges:
+                xn, yn, orient_n, master_n = edge_list[idx + 1]
+                if xn == x and orient_n == orient and master_n is master and yn > y:
+                    ny, spy = 2, yn - y
+                    while idx + ny < num_edges:
+                        xn, yn, orient_n, master_n = edge_list[idx + ny]
+                        if xn != x or orient_n != orient or master_n is not master or yn - y != ny * spy:
+                            break
+                        ny += 1
+            inst_list.append(self.add_instance(master, orient=orient, loc=(x, y), ny=ny, spy=spy, unit_mode=True))
+            idx += ny
+
+        return inst_list
 
     def draw_boundary_cells(self):
         draw_boundaries = self._laygo_info.draw_boundaries
         end_mode = self._laygo_info.end_mode
-        top_layer = self._laygo_info.top_layer
-        guard_ring_nf = self._laygo_info.guard_ring_nf
         col_width = self._laygo_info.col_width
         left_margin = self._laygo_info.left_margin
         right_margin = self._laygo_info.right_margin
@@ -808,15 +1269,8 @@ class LaygoBase(with_metaclass(abc.ABCMeta, TemplateBase)):
             xr = left_margin + col_width * nx + right_margin
             for orient, y, master in (('R0', 0, self._bot_end_master), ('MX', yt, self._top_end_master)):
                 for x, is_end, flip_lr in ((0, left_end, False), (xr, right_end, True)):
-                    edge_params = dict(
-                        top_layer=top_layer,
-                        is_end=is_end,
-                        guard_ring_nf=guard_ring_nf,
-                        name_id=master.get_layout_basename(),
-                        layout_info=master.get_edge_layout_info(),
-                        is_laygo=True,
-                    )
-                    edge_master = self.new_template(params=edge_params, temp_cls=AnalogEdge)
+                    edge_master = self._get_edge_master(master.get_layout_basename(),
+                                                        master.get_edge_layout_info(), is_end)
                     if flip_lr:
                         eorient = 'MY' if orient == 'R0' else 'R180'
                     else:
@@ -825,33 +1279,26 @@ class LaygoBase(with_metaclass(abc.ABCMeta, TemplateBase)):
 
             # draw extension edges
             for x, y, orient, edge_params in self._ext_edges:
-                edge_master = self.new_template(params=edge_params, temp_cls=AnalogEdge)
+                edge_master = self._get_edge_master(edge_params['name_id'], edge_params['layout_info'],
+                                                    edge_params['is_end'])
                 edge_inst_list.append(self.add_instance(edge_master, orient=orient, loc=(x, y), unit_mode=True))
 
-            # draw row edges
-            for ridx, (orient, ytuple, rinfo) in enumerate(zip(self._row_orientations, self._row_y, self._row_infos)):
+            # draw row edges.  Stacked rows with identical edges are drawn as arrayed instances.
+            left_edges, right_edges = [], []
+            for ridx, (orient, row_y, rinfo) in enumerate(zip(self._row_orientations, self._row_y, self._row_infos)):
                 endl, endr = self.get_end_flags(ridx)
-                _, ycur, ytop, _ = ytuple
-                if orient == 'R0':
-                    y = ycur
-                else:
-                    y = ytop
-                for x, is_end, flip_lr, end_flag in ((0, left_end, False, endl), (xr, right_end, True, endr)):
+                y = row_y.get_inst_y(orient)
+                for x, is_end, flip_lr, end_flag, edge_list in ((0, left_end, False, endl, left_edges),
+                                                                (xr, right_end, True, endr, right_edges)):
                     edge_info = self._tech_cls.get_laygo_edge_info(rinfo, end_flag)
-                    edge_params = dict(
-                        top_layer=top_layer,
-                        is_end=is_end,
-                        guard_ring_nf=guard_ring_nf,
-                        name_id=edge_info['name_id'],
-                        layout_info=edge_info,
-                        is_laygo=True,
-                    )
-                    edge_master = self.new_template(params=edge_params, temp_cls=AnalogEdge)
+                    edge_master = self._get_edge_master(edge_info['name_id'], edge_info, is_end)
                     if flip_lr:
                         eorient = 'MY' if orient == 'R0' else 'R180'
                     else:
                         eorient = orient
-                    edge_inst_list.append(self.add_instance(edge_master, orient=eorient, loc=(x, y), unit_mode=True))
+                    edge_list.append((x, y, eorient, edge_master))
+            edge_inst_list.extend(self._add_edge_instances(left_edges))
+            edge_inst_list.extend(self._add_edge_instances(right_edges))
 
             gr_vss_warrs = []
             gr_vdd_warrs = []
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+########################################################################################################################
+#
+# Copyright (c) 2014, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#   disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#    following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+########################################################################################################################
+
+"""This module builds libraries of LaygoBase cells that share primitive masters."""
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+# noinspection PyUnresolvedReferences,PyCompatibility
+from builtins import *
+
+from typing import Dict, Any, List, Tuple
+
+import time
+import importlib
+import multiprocessing
+
+from bag.layout.routing import RoutingGrid
+from bag.layout.template import TemplateBase, TemplateDB
+
+from ..routing_util import to_hashable
+from .base import LaygoPrimitive, LaygoSubstrate, LaygoEndRow, LaygoSpace
+
+# laygo master classes whose reuse is tracked by LaygoLibraryDB.
+shared_master_classes = (LaygoPrimitive, LaygoSubstrate, LaygoEndRow, LaygoSpace)
+
+
+class LaygoLibraryDB(TemplateDB):
+    """A TemplateDB that records how often shared laygo masters are reused.
+
+    Parameters
+    ----------
+    *args :
+        positional arguments for TemplateDB.
+    **kwargs :
+        keyword arguments for TemplateDB.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(LaygoLibraryDB, self).__init__(*args, **kwargs)
+        self._num_requests = 0
+        self._master_ids = set()
+
+    @property
+    def num_requests(self):
+        # type: () -> int
+        """Total number of shared laygo masters requested."""
+        return self._num_requests
+
+    @property
+    def num_masters(self):
+        # type: () -> int
+        """Number of unique shared laygo masters created."""
+        return len(self._master_ids)
+
+    def new_template(self, *args, **kwargs):
+        master = super(LaygoLibraryDB, self).new_template(*args, **kwargs)
+        if isinstance(master, shared_master_classes):
+            self._num_requests += 1
+            self._master_ids.add(id(master))
+        return master
+
+
+def import_class(class_str):
+    # type: (str) -> type
+    """Returns the class with the given fully qualified name.
+
+    Parameters
+    ----------
+    class_str : str
+        the class name, in the form of 'package.module.ClassName'.
+
+    Returns
+    -------
+    cls : type
+        the class object.
+    """
+    module_name, cls_name = class_str.rsplit('.', 1)
+    return getattr(importlib.import_module(module_name), cls_name)
+
+
+def make_template_db(tech_info, specs):
+    # type: (Any, Dict[str, Any]) -> LaygoLibraryDB
+    """Create a new LaygoLibraryDB from the library specification dictionary.
+
+    Parameters
+    ----------
+    tech_info : Any
+        the TechInfo object.
+    specs : Dict[str, Any]
+        the library specification dictionary.
+
+    Returns
+    -------
+    temp_db : LaygoLibraryDB
+        the template database.
+    """
+    grid_specs = specs['routing_grid']
+    routing_grid = RoutingGrid(tech_info, grid_specs['layers'], grid_specs['spaces'],
+                               grid_specs['widths'], grid_specs['bot_dir'])
+    return LaygoLibraryDB(specs.get('template_libs', 'template_libs.def'), routing_grid, specs['lib_name'],
+                          use_cybagoa=specs.get('use_cybagoa', True))
+
+
+def build_cells(temp_db, cell_specs, config):
+    # type: (LaygoLibraryDB, List[Dict[str, Any]], Dict[str, Any]) -> Tuple[List[TemplateBase], List[Dict[str, Any]]]
+    """Construct the given laygo cells in the given template database.
+
+    Parameters
+    ----------
+    temp_db : LaygoLibraryDB
+        the template database.  All cells share laygo masters through this database.
+    cell_specs : List[Dict[str, Any]]
+        list of cell specification dictionaries.  Each dictionary has entries cell_name, temp_cls
+        (the fully qualified LaygoBase subclass name), and params.
+    config : Dict[str, Any]
+        the laygo configuration dictionary.  Used if a cell's params does not specify config.
+
+    Returns
+    -------
+    temp_list : List[TemplateBase]
+        list of constructed templates.
+    report : List[Dict[str, Any]]
+        list of per-cell build statistics.
+    """
+    temp_list = []
+    report = []
+    for cell_spec in cell_specs:
+        temp_cls = import_class(cell_spec['temp_cls'])
+        params = dict(cell_spec['params'])
+        params.setdefault('config', config)
+
+        req0, master0 = temp_db.num_requests, temp_db.num_masters
+        start = time.time()
+        template = temp_db.new_template(params=params, temp_cls=temp_cls, debug=False)
+        build_time = time.time() - start
+        num_req = temp_db.num_requests - req0
+        num_new = temp_db.num_masters - master0
+
+        temp_list.append(template)
+        report.append(dict(
+            cell_name=cell_spec['cell_name'],
+            build_time=build_time,
+            num_requests=num_req,
+            num_new_masters=num_new,
+            reuse_ratio=1.0 - num_new / num_req if num_req > 0 else 0.0,
+        ))
+
+    return temp_list, report
+
+
+def group_cells(cell_specs, config, num_groups):
+    # type: (List[Dict[str, Any]], Dict[str, Any], int) -> List[List[Dict[str, Any]]]
+    """Split cells into groups for parallel builds, keeping cells that can share masters together.
+
+    Shared laygo masters depend on the laygo configuration and the transistor threshold, so
+    cells with the same configuration and threshold are always put in the same group.  These
+    cell sets are assigned to groups from the largest to the smallest, each to the group with
+    the fewest cells.
+
+    Parameters
+    ----------
+    cell_specs : List[Dict[str, Any]]
+        list of cell specification dictionaries.
+    config : Dict[str, Any]
+        the default laygo configuration dictionary.
+    num_groups : int
+        maximum number of groups.
+
+    Returns
+    -------
+    groups : List[List[Dict[str, Any]]]
+        list of non-empty cell groups.
+    """
+    cell_sets = {}
+    for cell_spec in cell_specs:
+        params = cell_spec['params']
+        key = to_hashable((params.get('config', config), params.get('threshold', None)))
+        cell_sets.setdefault(key, []).append(cell_spec)
+
+    groups = [[] for _ in range(num_groups)]
+    for cell_set in sorted(cell_sets.values(), key=len, reverse=True):
+        min(groups, key=len).extend(cell_set)
+    return [group for group in groups if group]
+
+
+def _build_cells_worker(args):
+    # type: (Tuple[Dict[str, Any], List[Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], int, int]
+    """Worker process function that builds a group of cells in its own template database."""
+    from bag.core import create_tech_info
+
+    specs, cell_specs = args
+    temp_db = make_template_db(create_tech_info(), specs)
+    _, report = build_cells(temp_db, cell_specs, specs['config'])
+    return report, temp_db.num_requests, temp_db.num_masters
+
+
+def generate_library(prj, specs, num_workers=1, instantiate=True):
+    # type: (Any, Dict[str, Any], int, bool) -> List[Dict[str, Any]]
+    """Build a library of LaygoBase cells.
+
+    In serial mode, all cells are built in a single TemplateDB session, so all laygo
+    primitive, substrate, space and end row masters are shared across cells.  If num_workers
+    is greater than 1, cells are grouped by laygo configuration and threshold with group_cells(),
+    and each group is built in its own TemplateDB in a worker process to measure per-cell build
+    times and master reuse.  Templates cannot be sent back from the workers, so if instantiate is
+    True, all cells are then built again in a single TemplateDB in this process and instantiated,
+    and the total master counts are taken from that build.
+
+    Parameters
+    ----------
+    prj : Any
+        the BagProject instance.
+    specs : Dict[str, Any]
+        the library specification dictionary, with entries lib_name, routing_grid, config and cells.
+    num_workers : int
+        number of worker processes.
+    instantiate : bool
+        True to instantiate the layouts of all cells.
+
+    Returns
+    -------
+    report : List[Dict[str, Any]]
+        list of per-cell build statistics.
+    """
+    cell_specs = specs['cells']
+    cell_names = [cell_spec['cell_name'] for cell_spec in cell_specs]
+    if num_workers > 1:
+        groups = group_cells(cell_specs, specs['config'], num_workers)
+        pool = multiprocessing.Pool(processes=len(groups))
+        try:
+            results = pool.map(_build_cells_worker, [(specs, group) for group in groups])
+        finally:
+            pool.close()
+            pool.join()
+        report_dict = {}
+        num_req = num_masters = 0
+        for group_report, group_req, group_masters in results:
+            report_dict.update(((entry['cell_name'], entry) for entry in group_report))
+            num_req += group_req
+            num_masters += group_masters
+        report = [report_dict[name] for name in cell_names]
+
+        if instantiate:
+            temp_db = make_template_db(prj.tech_info, specs)
+            temp_list, _ = build_cells(temp_db, cell_specs, specs['config'])
+            num_req, num_masters = temp_db.num_requests, temp_db.num_masters
+            temp_db.batch_layout(prj, temp_list, cell_names)
+    else:
+        temp_db = make_template_db(prj.tech_info, specs)
+        temp_list, report = build_cells(temp_db, cell_specs, specs['config'])
+        num_req, num_masters = temp_db.num_requests, temp_db.num_masters
+        if instantiate:
+            temp_db.batch_layout(prj, temp_list, cell_names)
+
+    print_report(report, num_req, num_masters)
+    return report
+
+
+def print_report(report, num_requests, num_masters):
+    # type: (List[Dict[str, Any]], int, int) -> None
+    """Print the library build report.
+
+    Parameters
+    ----------
+    report : List[Dict[str, Any]]
+        list of per-cell build statistics.
+    num_requests : int
+        total number of shared laygo masters requested.
+    num_masters : int
+        total number of unique shared laygo masters created.
+    """
+    fmt = '%-30s %10s %10s %10s %8s'
+    print(fmt % ('cell', 'time (s)', 'requests', 'new', 'reuse'))
+    for entry in report:
+        print('%-30s %10.3f %10d %10d %8.3f' % (entry['cell_name'], entry['build_time'], entry['num_requests'],
+                                               entry['num_new_masters'], entry['reuse_ratio']))
+    ratio = 1.0 - num_masters / num_requests if num_requests > 0 else 0.0
+    print('total: %d masters requested, %d created, reuse ratio = %.3f' % (num_requests, num_masters, ratio))
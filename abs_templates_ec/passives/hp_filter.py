@@ -111,16 +111,17 @@ class BiasResistor(ResArrayBase):
 
         for cidx in range(0, nx):
             # connect all resistors in the column
+            bot_list, top_list = self.get_res_ports_array(range(ny), cidx)
             for ridx in range(1, ny):
-                _, a = self.get_res_ports(ridx - 1, cidx)
-                b, _ = self.get_res_ports(ridx, cidx)
+                a = top_list[ridx - 1]
+                b = bot_list[ridx]
                 vlay = a.layer_id + 1
                 vtr = self.grid.coord_to_nearest_track(vlay, a.middle, half_track=True)
                 self.connect_to_tracks([a, b], TrackID(vlay, vtr))
 
             # snake between columns
-            bot_warr, _ = self.get_res_ports(0, cidx)
-            _, top_warr = self.get_res_ports(ny - 1, cidx)
+            bot_warr = bot_list[0]
+            top_warr = top_list[ny - 1]
             if last_port is None:
                 last_port = top_warr, 1
                 port_out = bot_warr
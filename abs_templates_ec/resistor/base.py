@@ -33,7 +33,7 @@ from future.utils import with_metaclass
 
 import abc
 import math
-from typing import Dict, Set, Tuple, Any, List, Optional
+from typing import Dict, Set, Tuple, Any, List, Optional, Union
 
 from bag import float_to_si_string
 from bag.math import lcm
@@ -41,6 +41,48 @@ from bag.util.search import BinaryIterator
 from bag.layout.template import TemplateBase, TemplateDB
 from bag.layout.routing import RoutingGrid
 
+from ..routing_util import to_hashable, get_grid_fingerprint, get_min_track_width
+
+# fill_symmetric() dynamic programming tables, keyed by (n_min, n_max, sp).  Each table entry
+# is a (num_filled, mode, n) tuple, where mode is 0 for no fill, 1 for a single center block
+# of length n, 2 for two end blocks of length n, and 3 for two end blocks of length n plus the
+# solution of the remaining space in the middle.
+_fill_table_cache = {}  # type: Dict[Tuple[int, int, int], List[Tuple[int, int, int]]]
+# get_res_info() results, keyed by resistor technology class, routing grid fingerprint and resistor specs.
+_res_info_cache = {}  # type: Dict[Any, ResInfo]
+# resistor core port track indices recorded by AnalogResCore, keyed by id() of the ResInfo object.
+# the ResInfo object is stored in the entry so its id() is never reused.
+_res_port_cache = {}  # type: Dict[int, Tuple[ResInfo, Tuple[Union[float, int], Union[float, int]]]]
+
+
+class ResInfo(dict):
+    """An immutable resistor layout information dictionary.
+
+    Parameters
+    ----------
+    *args :
+        positional arguments for dict.
+    **kwargs :
+        keyword arguments for dict.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(ResInfo, self).__init__(*args, **kwargs)
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('resistor layout information dictionary is immutable.')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _immutable
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return ResInfo, (dict(self),)
+
 
 class ResTech(with_metaclass(abc.ABCMeta, object)):
     @classmethod
@@ -192,6 +234,31 @@ class ResTech(with_metaclass(abc.ABCMeta, object)):
         """
         pass
 
+    @classmethod
+    def get_port_tracks(cls, layout_info):
+        # type: (Dict[str, Any]) -> Optional[Tuple[Union[float, int], Union[float, int]]]
+        """Returns the bottom/top port track indices of the resistor core drawn by draw_res_core().
+
+        The default implementation returns the port track indices recorded when a resistor core
+        with the same layout information dictionary was drawn.  Override this method to compute
+        resistor array port locations without creating any resistor core masters.
+
+        Parameters
+        ----------
+        layout_info : Dict[str, Any]
+            the resistor layout information dictionary returned by get_res_info().
+
+        Returns
+        -------
+        port_tracks : Optional[Tuple[Union[float, int], Union[float, int]]]
+            the relative track indices of the bottom and top ports on the bottom routing layer.
+            None if no resistor core with the given layout information has been drawn.
+        """
+        entry = _res_port_cache.get(id(layout_info), None)
+        if entry is None or entry[0] is not layout_info:
+            return None
+        return entry[1]
+
     @classmethod
     def fill_symmetric(cls, tot_space, n_min, n_max, sp):
         """Compute 1-D fill pattern that maximizes the filled region and symmetric about the center.
@@ -199,6 +266,9 @@ class ResTech(with_metaclass(abc.ABCMeta, object)):
         Given an empty space and fill parameters, determine location and size of each fill block
         such that we maximize filled region but keep the pattern symmetric about the center.  This method
         is useful for computing fill pattern inside the resistor core.
+
+        The dynamic programming table is cached for each (n_min, n_max, sp) combination and is extended
+        on demand, so repeated calls only reconstruct the fill intervals.
         
         Parameters
         ----------
@@ -221,41 +291,64 @@ class ResTech(with_metaclass(abc.ABCMeta, object)):
         if tot_space <= 0:
             return 0, []
 
-        # dynamic programming
-        soln_vec = [(0, [])] * n_min + [(i, [(0, i)]) for i in range(n_min, n_max + 1)]
-        for i in range(n_max + 1, tot_space + 1):
+        # get the dynamic programming table, extending it if necessary.
+        key = (n_min, n_max, sp)
+        table = _fill_table_cache.get(key, None)
+        if table is None:
+            table = [(0, 0, 0)] * n_min + [(i, 1, i) for i in range(n_min, n_max + 1)]
+            _fill_table_cache[key] = table
+        for i in range(len(table), tot_space + 1):
             # try using one block
             opt_n = n_max if (i - n_max) % 2 == 0 else n_max - 1
-            start = (i - opt_n) // 2
-            opt_combo = [(start, start + opt_n)]
+            opt_entry = (opt_n, 1, opt_n)
             # try using two blocks
             sp_sep = sp if (i - sp) % 2 == 0 else sp + 1
             n2 = min((i - sp_sep) // 2, n_max)
             if n2 >= n_min and n2 * 2 > opt_n:
                 # using two blocks is better than using one block, update maximum
                 opt_n = n2 * 2
-                opt_combo = [(0, n2), (i - n2, i)]
+                opt_entry = (opt_n, 2, n2)
             # try using three blocks
             for n_end in range(n_min, n_max + 1):
                 remainder = i - 2 * (n_end + sp)
                 if remainder >= n_min:
-                    recur_n, recur_combo = soln_vec[remainder]
+                    recur_n = table[remainder][0]
                     if recur_n + 2 * n_end > opt_n:
                         # found new optimum.  update
                         opt_n = recur_n + 2 * n_end
-                        opt_combo = [(0, n_end)]
-                        delta = n_end + sp
-                        for sidx, eidx in recur_combo:
-                            opt_combo.append((sidx + delta, eidx + delta))
-                        opt_combo.append((i - n_end, i))
+                        opt_entry = (opt_n, 3, n_end)
                 else:
                     break
 
             # record best solution.
-            soln_vec.append((opt_n, opt_combo))
+            table.append(opt_entry)
+
+        # reconstruct fill intervals from back pointers
+        num_filled = table[tot_space][0]
+        left_list, right_list = [], []
+        offset = 0
+        cur_space = tot_space
+        while True:
+            _, mode, n = table[cur_space]
+            if mode == 1:
+                # one block in the center
+                start = offset + (cur_space - n) // 2
+                left_list.append((start, start + n))
+                break
+            elif mode == 2 or mode == 3:
+                # one block on each end
+                left_list.append((offset, offset + n))
+                right_list.append((offset + cur_space - n, offset + cur_space))
+                if mode == 2:
+                    break
+                # fill the remaining space in the middle
+                offset += n + sp
+                cur_space -= 2 * (n + sp)
+            else:
+                break
 
-        # return best combination
-        return soln_vec[tot_space]
+        right_list.reverse()
+        return num_filled, left_list + right_list
 
     @classmethod
     def get_core_track_info(cls,  # type: ResTech
@@ -297,7 +390,7 @@ class ResTech(with_metaclass(abc.ABCMeta, object)):
         cur_layer = cls.get_bot_layer()
         for min_num_tr in min_tracks:
             tr_w, tr_sp = grid.get_track_info(cur_layer, unit_mode=True)
-            cur_width = grid.get_min_track_width(cur_layer, bot_w=prev_width, unit_mode=True, **em_specs)
+            cur_width = get_min_track_width(grid, cur_layer, em_specs, bot_w=prev_width, unit_mode=True)
             cur_space = grid.get_num_space_tracks(cur_layer, cur_width)
             track_widths.append(cur_width)
             track_spaces.append(cur_space)
@@ -374,18 +467,24 @@ class ResTech(with_metaclass(abc.ABCMeta, object)):
             return nxblk, nyblk_max
 
         # otherwise, find extension that minimizes area of the core.
-        # this is a simple exhaustive search.
+        # for each core width, the minimum core height is computed directly.
         opt = nxblk, nyblk_max
         opt_area = nxblk * nyblk_max * wblk * hblk
         for nxblk_cur in range(nxblk + 1, nxblk_max + 1):
             wcur = nxblk_cur * wblk
-            for nyblk_cur in range(nyblk, nyblk_max + 1):
-                acur = wcur * nyblk_cur * hblk
-                if acur >= opt_area:
-                    break
-                if ares < acur * density:
-                    opt_area = acur
-                    opt = nxblk_cur, nyblk_cur
+            if wcur * nyblk * hblk >= opt_area:
+                # core area only increases from here on
+                break
+            # find minimum height such that ares < acur * density
+            nyblk_cur = max(nyblk, int(ares / density / wcur / hblk))
+            while nyblk_cur > nyblk and ares < wcur * (nyblk_cur - 1) * hblk * density:
+                nyblk_cur -= 1
+            while not ares < wcur * nyblk_cur * hblk * density:
+                nyblk_cur += 1
+            acur = wcur * nyblk_cur * hblk
+            if nyblk_cur <= nyblk_max and acur < opt_area:
+                opt_area = acur
+                opt = nxblk_cur, nyblk_cur
 
         return opt
 
@@ -432,12 +531,15 @@ class ResTech(with_metaclass(abc.ABCMeta, object)):
 
     @classmethod
     def get_res_info(cls, grid, l, w, res_type, sub_type, threshold, min_tracks, em_specs, ext_dir):
-        # type: (RoutingGrid, int, int, str, str, str, Tuple[int, ...], Dict[str, Any], Optional[str]) -> Dict[str, Any]
+        # type: (RoutingGrid, int, int, str, str, str, Tuple[int, ...], Dict[str, Any], Optional[str]) -> ResInfo
         """Compute the resistor layout information dictionary.
         
         This method compute the width/height of each resistor primitive block and also the
         track width and space on each routing layer, then return the result as a dictionary.
 
+        Results are cached, so templates with the same unit resistor on the same routing grid
+        share the same immutable layout information dictionary.
+
         Parameters
         ----------
         grid : RoutingGrid
@@ -463,9 +565,26 @@ class ResTech(with_metaclass(abc.ABCMeta, object)):
 
         Returns
         -------
-        res_info : Dict[str, Any]
-            the resistor layout information dictionary.
+        res_info : ResInfo
+            the immutable resistor layout information dictionary.
         
+        """
+        bot_layer = cls.get_bot_layer()
+        key = (cls, get_grid_fingerprint(grid, bot_layer - 1, bot_layer + len(min_tracks) - 1), l, w, res_type,
+               sub_type, threshold, to_hashable(min_tracks), to_hashable(em_specs), ext_dir)
+        res_info = _res_info_cache.get(key, None)
+        if res_info is None:
+            res_info = ResInfo(cls.compute_res_info(grid, l, w, res_type, sub_type, threshold, min_tracks,
+                                                    em_specs, ext_dir))
+            _res_info_cache[key] = res_info
+        return res_info
+
+    @classmethod
+    def compute_res_info(cls, grid, l, w, res_type, sub_type, threshold, min_tracks, em_specs, ext_dir):
+        # type: (RoutingGrid, int, int, str, str, str, Tuple[int, ...], Dict[str, Any], Optional[str]) -> Dict[str, Any]
+        """Compute the resistor layout information dictionary without caching.
+
+        See get_res_info() for parameter descriptions.
         """
         # step 1: get track/size parameters
         track_widths, track_spaces, min_size, blk_pitch = cls.get_core_track_info(grid, min_tracks, em_specs)
@@ -512,10 +631,10 @@ class ResTech(with_metaclass(abc.ABCMeta, object)):
             h_core=hcore,
             w_edge=wedge,
             h_edge=hedge,
-            track_widths=track_widths,
-            track_spaces=track_spaces,
-            num_tracks=num_tracks,
-            num_corner_tracks=num_corner_tracks,
+            track_widths=tuple(track_widths),
+            track_spaces=tuple(track_spaces),
+            num_tracks=tuple(num_tracks),
+            num_corner_tracks=tuple(num_corner_tracks),
         )
 
         cls.update_layout_info(res_info)
@@ -677,6 +796,11 @@ class AnalogResCore(TemplateBase):
         self._tech_cls.draw_res_core(self, self._layout_info)
         self.prim_top_layer = self._tech_cls.get_bot_layer()
 
+        # record port tracks, so ResArrayBase.get_array_info() can report them without drawing.
+        bot_idx = self.get_port('bot').get_pins()[0].track_id.base_index
+        top_idx = self.get_port('top').get_pins()[0].track_id.base_index
+        _res_port_cache[id(self._layout_info)] = (self._layout_info, (bot_idx, top_idx))
+
 
 class AnalogResBoundary(TemplateBase):
     """An abstract template for analog resistors array left/right edge.
@@ -34,15 +34,89 @@ from builtins import *
 from future.utils import with_metaclass
 
 import abc
-from typing import Dict, Set, Tuple, Union, Any, Optional
-from itertools import chain
+from typing import Dict, Set, Tuple, Union, Any, Optional, List
 
-from bag.layout.routing import TrackID, WireArray, Port
+import numpy as np
+
+from bag.layout.util import BBox
+from bag.layout.routing import TrackID, WireArray, Port, RoutingGrid
 from bag.layout.template import TemplateBase, TemplateDB
 from bag.layout.core import TechInfo
 
 from .base import ResTech, AnalogResCore, AnalogResBoundary
 from ..analog_core import SubstrateContact
+from ..routing_util import get_min_track_width
+
+# resistor routing grids, keyed by base routing grid fingerprint and resistor grid type.
+_res_grid_cache = {}  # type: Dict[Tuple[Any, ...], RoutingGrid]
+
+
+def make_res_grid(grid, grid_type):
+    # type: (RoutingGrid, str) -> RoutingGrid
+    """Returns a copy of the given RoutingGrid with resistor routing layers.
+
+    Parameters
+    ----------
+    grid : RoutingGrid
+        the base RoutingGrid object.
+    grid_type : str
+        the lower resistor routing grid name.
+
+    Returns
+    -------
+    res_grid : RoutingGrid
+        a new RoutingGrid with resistor routing layers added and block pitch updated.
+    """
+    res_grid = grid.copy()
+    grid_layers = grid.tech_info.tech_params['layout']['analog_res'][grid_type]
+    for lay_id, tr_w, tr_sp, tr_dir, necessary in grid_layers:
+        if necessary or lay_id not in res_grid:
+            res_grid.add_new_layer(lay_id, tr_sp, tr_w, tr_dir, override=True)
+
+    res_grid.update_block_pitch()
+    return res_grid
+
+
+def get_res_grid(grid, grid_type):
+    # type: (RoutingGrid, str) -> RoutingGrid
+    """Returns the RoutingGrid with resistor routing layers.
+
+    This method caches results of make_res_grid(), so all resistor templates drawn on the same
+    base routing grid share the same resistor routing grid.
+
+    The returned RoutingGrid object is shared by every caller, so callers must not modify it
+    (e.g. by adding layers or updating block pitch), as that changes the routing grid of all
+    other resistor templates.  Call copy() on the returned grid or use make_res_grid() if a
+    modified grid is needed.
+
+    Parameters
+    ----------
+    grid : RoutingGrid
+        the base RoutingGrid object.
+    grid_type : str
+        the lower resistor routing grid name.
+
+    Returns
+    -------
+    res_grid : RoutingGrid
+        the RoutingGrid with resistor routing layers added and block pitch updated.
+    """
+    grid_layers = grid.tech_info.tech_params['layout']['analog_res'][grid_type]
+    # the resistor routing grid depends on all base routing layers next to the resistor layers.
+    bot_layer = min((info[0] for info in grid_layers))
+    top_layer = max((info[0] for info in grid_layers))
+    while bot_layer - 1 in grid:
+        bot_layer -= 1
+    while top_layer + 1 in grid:
+        top_layer += 1
+    layer_info = tuple(((lay, grid.get_direction(lay), grid.get_track_info(lay, unit_mode=True))
+                        for lay in range(bot_layer, top_layer + 1) if lay in grid))
+    key = (id(grid.tech_info), grid.resolution, layer_info, grid_type)
+    res_grid = _res_grid_cache.get(key, None)
+    if res_grid is None:
+        res_grid = make_res_grid(grid, grid_type)
+        _res_grid_cache[key] = res_grid
+    return res_grid
 
 
 # noinspection PyAbstractClass
@@ -80,6 +154,8 @@ class ResArrayBase(with_metaclass(abc.ABCMeta, TemplateBase)):
         self._num_tracks = None  # type: Tuple[int, ...]
         self._num_corner_tracks = None  # type: Tuple[int, ...]
         self._w_tracks = None  # type: Tuple[int, ...]
+        # track offset table.  For each routing layer, stores a (use_col, offset, pitch, track_pitch) tuple.
+        self._offset_table = None  # type: Tuple[Tuple[bool, int, int, int], ...]
         self._hm_layer = self._tech_cls.get_bot_layer()
         self._well_width = None
 
@@ -88,6 +164,112 @@ class ResArrayBase(with_metaclass(abc.ABCMeta, TemplateBase)):
         # type: (TechInfo) -> int
         return tech_info.tech_params['layout']['res_tech_class'].get_bot_layer()
 
+    @classmethod
+    def get_array_info(cls,  # type: ResArrayBase
+                       grid,  # type: RoutingGrid
+                       l,  # type: float
+                       w,  # type: float
+                       sub_type,  # type: str
+                       threshold,  # type: str
+                       nx=1,  # type: int
+                       ny=1,  # type: int
+                       min_tracks=(1, 1, 1, 1),  # type: Tuple[int, ...]
+                       res_type='reference',  # type: str
+                       em_specs=None,  # type: Optional[Dict[str, Any]]
+                       grid_type='standard',  # type: str
+                       ext_dir='',  # type: str
+                       ):
+        # type: (...) -> Dict[str, Any]
+        """Estimate the resistor array footprint and routing tracks without creating any masters.
+
+        The returned values are the same as those computed by draw_array() with the same parameters,
+        so this method can be used to floorplan resistor arrays quickly.
+
+        Parameters
+        ----------
+        grid : RoutingGrid
+            the RoutingGrid of the resistor array template.
+        l : float
+            unit resistor length, in meters.
+        w : float
+            unit resistor width, in meters.
+        sub_type : str
+            the substrate type.  Either 'ptap' or 'ntap'.
+        threshold : str
+            the substrate threshold flavor.
+        nx : int
+            number of resistors in a row.
+        ny : int
+            number of resistors in a column.
+        min_tracks : Tuple[int, ...]
+            minimum number of tracks per layer in the resistor unit cell.
+        res_type : str
+            the resistor type.
+        em_specs : Union[None, Dict[str, Any]]
+            resistor EM specifications dictionary.
+        grid_type : str
+            the lower resistor routing grid name.
+        ext_dir : str
+            resistor core extension direction.
+
+        Returns
+        -------
+        array_info : Dict[str, Any]
+            the resistor array information dictionary, with the following entries:
+
+            array_box : BBox
+                the array bounding box.
+            top_layer : int
+                the top resistor routing layer ID.
+            core_offset : Tuple[int, int]
+                location of the lower-left resistor core, in resolution units.
+            core_pitch : Tuple[int, int]
+                the resistor core pitch, in resolution units.
+            edge_size : Tuple[int, int]
+                width of left/right edge and height of top/bottom edge, in resolution units.
+            num_tracks : Tuple[int, ...]
+                the number of tracks per resistor block on each routing layer.
+            num_corner_tracks : Tuple[int, ...]
+                the number of tracks in the corner block on each routing layer.
+            track_widths : Tuple[int, ...]
+                the track width on each routing layer, in number of tracks.
+            bot_port_idx : Optional[Union[float, int]]
+                the relative track index of the bottom resistor port.  None if the resistor
+                technology class cannot compute it and no such resistor core has been drawn.
+            top_port_idx : Optional[Union[float, int]]
+                the relative track index of the top resistor port.  None if the resistor
+                technology class cannot compute it and no such resistor core has been drawn.
+        """
+        res_grid = get_res_grid(grid, grid_type)
+        tech_cls = grid.tech_info.tech_params['layout']['res_tech_class']  # type: ResTech
+
+        res = res_grid.resolution
+        lay_unit = res_grid.layout_unit
+        l_unit = int(round(l / lay_unit / res))
+        w_unit = int(round(w / lay_unit / res))
+        res_info = tech_cls.get_res_info(res_grid, l_unit, w_unit, res_type, sub_type, threshold,
+                                         min_tracks, em_specs, ext_dir)
+        w_edge, h_edge = res_info['w_edge'], res_info['h_edge']
+        w_core, h_core = res_info['w_core'], res_info['h_core']
+        port_tracks = tech_cls.get_port_tracks(res_info)
+        if port_tracks is None:
+            bot_port_idx = top_port_idx = None
+        else:
+            bot_port_idx, top_port_idx = port_tracks
+
+        return dict(
+            array_box=BBox(0, 0, 2 * w_edge + nx * w_core, 2 * h_edge + ny * h_core, res, unit_mode=True),
+            top_layer=tech_cls.get_bot_layer() + len(min_tracks) - 1,
+            core_offset=(w_edge, h_edge),
+            core_pitch=(w_core, h_core),
+            edge_size=(w_edge, h_edge),
+            num_tracks=tuple(res_info['num_tracks']),
+            num_corner_tracks=tuple(res_info['num_corner_tracks']),
+            track_widths=tuple(res_info['track_widths']),
+            bot_port_idx=bot_port_idx,
+            top_port_idx=top_port_idx,
+        )
+
     @property
     def num_tracks(self):
         # type: () -> Tuple[int, ...]
@@ -150,13 +332,51 @@ class ResArrayBase(with_metaclass(abc.ABCMeta, TemplateBase)):
         top_warr : WireArray
             the top port as WireArray.
         """
+        bot_list, top_list = self.get_res_ports_array(row_idx, col_idx)
+        return bot_list[0], top_list[0]
+
+    def get_res_ports_array(self, row_idx, col_idx):
+        # type: (Any, Any) -> Tuple[List[WireArray], List[WireArray]]
+        """Returns the ports of the given resistors.
+
+        row_idx and col_idx are broadcasted against each other, so for example the ports of
+        a whole column can be obtained with get_res_ports_array(range(ny), col_idx).
+
+        Parameters
+        ----------
+        row_idx : Any
+            the resistor row index, or an array of row indices.  0 is the bottom row.
+        col_idx : Any
+            the resistor column index, or an array of column indices.  0 is the left-most column.
+
+        Returns
+        -------
+        bot_list : List[WireArray]
+            the bottom ports as a flat list of WireArrays.
+        top_list : List[WireArray]
+            the top ports as a flat list of WireArrays.
+        """
+        row_idx, col_idx = np.broadcast_arrays(np.atleast_1d(row_idx), np.atleast_1d(col_idx))
+        dx_arr = self._core_offset[0] + self._core_pitch[0] * col_idx.ravel()
+        dy_arr = self._core_offset[1] + self._core_pitch[1] * row_idx.ravel()
+        return (self._get_port_wires(self._bot_port.get_pins()[0], dx_arr, dy_arr),
+                self._get_port_wires(self._top_port.get_pins()[0], dx_arr, dy_arr))
+
+    def _get_port_wires(self, warr, dx_arr, dy_arr):
+        # type: (WireArray, np.ndarray, np.ndarray) -> List[WireArray]
+        """Shift the given resistor core port by the given core locations, in resolution units."""
         res = self.grid.resolution
-        dx = self._core_offset[0] + self._core_pitch[0] * col_idx
-        dy = self._core_offset[1] + self._core_pitch[1] * row_idx
-        loc = dx * res, dy * res
-        bot_port = self._bot_port.transform(self.grid, loc=loc)
-        top_port = self._top_port.transform(self.grid, loc=loc)
-        return bot_port.get_pins()[0], top_port.get_pins()[0]
+        tid = warr.track_id
+        layer_id = tid.layer_id
+        tr_pitch = self.grid.get_track_pitch(layer_id, unit_mode=True)
+        if self.grid.get_direction(layer_id) == 'x':
+            tr_arr, wire_arr = dy_arr, dx_arr
+        else:
+            tr_arr, wire_arr = dx_arr, dy_arr
+        tr_arr = tid.base_index + tr_arr / tr_pitch
+        return [WireArray(TrackID(layer_id, tr_idx, width=tid.width, num=tid.num, pitch=tid.pitch),
+                          warr.lower + delta * res, warr.upper + delta * res)
+                for tr_idx, delta in zip(tr_arr.tolist(), wire_arr.tolist())]
 
     def get_track_offsets(self, row_idx, col_idx):
         # type: (int, int) -> Tuple[float, ...]
@@ -174,16 +394,31 @@ class ResArrayBase(with_metaclass(abc.ABCMeta, TemplateBase)):
         offsets : Tuple[float, ...]
             track index offset on each routing layer.
         """
-        dx = self._core_offset[0] + self._core_pitch[0] * col_idx
-        dy = self._core_offset[1] + self._core_pitch[1] * row_idx
-        bot_layer = self.bot_layer_id
-        offsets = []
-        for lay in range(bot_layer, bot_layer + len(self._num_tracks)):
-            dim = dx if self.grid.get_direction(lay) == 'y' else dy
-            pitch = self.grid.get_track_pitch(lay, unit_mode=True)
-            offsets.append(dim / pitch)
+        return tuple(((offset + pitch * (col_idx if use_col else row_idx)) / tr_pitch
+                      for use_col, offset, pitch, tr_pitch in self._offset_table))
+
+    def get_track_offsets_array(self, row_idx, col_idx):
+        # type: (Any, Any) -> Tuple[np.ndarray, ...]
+        """Compute track offsets on each routing layer for the given resistor blocks.
 
-        return tuple(offsets)
+        This is the vectorized version of get_track_offsets().  row_idx and col_idx are
+        broadcasted against each other.
+
+        Parameters
+        ----------
+        row_idx : Any
+            the row index, or an array of row indices.  0 is the bottom row.
+        col_idx : Any
+            the column index, or an array of column indices.  0 is the left-most column.
+
+        Returns
+        -------
+        offsets : Tuple[np.ndarray, ...]
+            track index offset arrays on each routing layer.
+        """
+        row_idx, col_idx = np.broadcast_arrays(np.asarray(row_idx), np.asarray(col_idx))
+        return tuple(((offset + pitch * (col_idx if use_col else row_idx)) / tr_pitch
+                      for use_col, offset, pitch, tr_pitch in self._offset_table))
 
     def get_h_track_index(self, row_idx, tr_idx):
         # type: (int, Union[float, int]) -> float
@@ -201,12 +436,63 @@ class ResArrayBase(with_metaclass(abc.ABCMeta, TemplateBase)):
         abs_idx : float
             the absolute track index in this template.
         """
-        delta = self._core_offset[1] + self._core_pitch[1] * row_idx
-        targ_layer = self.bot_layer_id + len(self._num_tracks) - 1
-        if self.grid.get_direction(targ_layer) == 'y':
-            targ_layer -= 1
+        use_col, offset, pitch, tr_pitch = self._offset_table[-1]
+        if use_col:
+            _, offset, pitch, tr_pitch = self._offset_table[-2]
+
+        return (offset + pitch * row_idx) / tr_pitch + tr_idx
+
+    def _add_via_array(self, bot_layer, bot_tr, top_tr, num_bot=1, bot_pitch=0, num_top=1, top_pitch=0):
+        # type: (int, Union[float, int], Union[float, int], int, Union[float, int], int, Union[float, int]) -> None
+        """Add an array of vias at the intersections of the given bottom and top tracks.
 
-        return delta / self.grid.get_track_pitch(targ_layer, unit_mode=True) + tr_idx
+        Vias are added between bottom tracks bot_tr + i * bot_pitch for i in range(num_bot),
+        and top tracks top_tr + j * top_pitch for j in range(num_top).  A single via array is
+        drawn only if all bottom tracks and all top tracks map to the same layer names,
+        otherwise each via is drawn with add_via_on_grid().
+
+        Parameters
+        ----------
+        bot_layer : int
+            the bottom layer ID.
+        bot_tr : Union[float, int]
+            the first bottom track index.
+        top_tr : Union[float, int]
+            the first top track index.
+        num_bot : int
+            number of bottom tracks.
+        bot_pitch : Union[float, int]
+            pitch between bottom tracks, in number of tracks.
+        num_top : int
+            number of top tracks.
+        top_pitch : Union[float, int]
+            pitch between top tracks, in number of tracks.
+        """
+        grid = self.grid
+        top_layer = bot_layer + 1
+        bot_names = [grid.get_layer_name(bot_layer, bot_tr + idx * bot_pitch) for idx in range(num_bot)]
+        top_names = [grid.get_layer_name(top_layer, top_tr + idx * top_pitch) for idx in range(num_top)]
+        bot_name, top_name = bot_names[0], top_names[0]
+        if (not isinstance(bot_name, str) or not isinstance(top_name, str) or
+                any((name != bot_name for name in bot_names)) or any((name != top_name for name in top_names))):
+            # track layer names change along the array (e.g. colored layers), draw vias one by one.
+            for bot_idx in range(num_bot):
+                for top_idx in range(num_top):
+                    self.add_via_on_grid(bot_layer, bot_tr + bot_idx * bot_pitch, top_tr + top_idx * top_pitch)
+            return
+
+        bl, bu = grid.get_wire_bounds(bot_layer, bot_tr, unit_mode=True)
+        tl, tu = grid.get_wire_bounds(top_layer, top_tr, unit_mode=True)
+        bot_sp = int(round(bot_pitch * grid.get_track_pitch(bot_layer, unit_mode=True)))
+        top_sp = int(round(top_pitch * grid.get_track_pitch(top_layer, unit_mode=True)))
+        bot_dir = grid.get_direction(bot_layer)
+        if bot_dir == 'x':
+            bbox = BBox(tl, bl, tu, bu, grid.resolution, unit_mode=True)
+            nx, spx, ny, spy = num_top, top_sp, num_bot, bot_sp
+        else:
+            bbox = BBox(bl, tl, bu, tu, grid.resolution, unit_mode=True)
+            nx, spx, ny, spy = num_bot, bot_sp, num_top, top_sp
+        self.add_via(bbox, bot_name, top_name, bot_dir, nx=nx, ny=ny, spx=spx, spy=spy, unit_mode=True)
 
     def draw_array(self,  # type: ResArrayBase
                    l,  # type: float
@@ -225,7 +511,7 @@ class ResArrayBase(with_metaclass(abc.ABCMeta, TemplateBase)):
         # type: (...) -> None
         """Draws the resistor array.
 
-        This method updates the RoutingGrid with resistor routing layers, then add
+        This method switches to the RoutingGrid with resistor routing layers, then add
         resistor instances to this template.
 
         Parameters
@@ -255,13 +541,8 @@ class ResArrayBase(with_metaclass(abc.ABCMeta, TemplateBase)):
         well_end_mode : int
             integer flag that controls whether to extend well layer to top/bottom.
         """
-        # modify resistor layer routing grid.
-        grid_layers = self.grid.tech_info.tech_params['layout']['analog_res'][grid_type]
-        for lay_id, tr_w, tr_sp, tr_dir, necessary in grid_layers:
-            if necessary or lay_id not in self.grid:
-                self.grid.add_new_layer(lay_id, tr_sp, tr_w, tr_dir, override=True)
-
-        self.grid.update_block_pitch()
+        # use resistor layer routing grid.
+        self.grid = get_res_grid(self.grid, grid_type)
 
         # find location of the lower-left resistor core
         res = self.grid.resolution
@@ -277,6 +558,14 @@ class ResArrayBase(with_metaclass(abc.ABCMeta, TemplateBase)):
         self._num_tracks = tuple(res_info['num_tracks'])
         self._num_corner_tracks = tuple(res_info['num_corner_tracks'])
         self._w_tracks = tuple(res_info['track_widths'])
+        offset_table = []
+        for lay in range(self._hm_layer, self._hm_layer + len(self._num_tracks)):
+            tr_pitch = self.grid.get_track_pitch(lay, unit_mode=True)
+            if self.grid.get_direction(lay) == 'y':
+                offset_table.append((True, w_edge, w_core, tr_pitch))
+            else:
+                offset_table.append((False, h_edge, h_core, tr_pitch))
+        self._offset_table = tuple(offset_table)
 
         # make template masters
         core_params = dict(
@@ -301,16 +590,12 @@ class ResArrayBase(with_metaclass(abc.ABCMeta, TemplateBase)):
         bcorner_params = core_master.get_boundary_params('corner', end_mode=well_end_mode % 2 != 0)
         bcorner_master = self.new_template(params=bcorner_params, temp_cls=AnalogResBoundary)
 
-        # place core
-        for row in range(ny):
-            for col in range(nx):
-                cur_name = 'XCORE%d' % (col + nx * row)
-                cur_loc = (w_edge + col * w_core, h_edge + row * h_core)
-                cur_master = self.new_template(params=core_params, temp_cls=AnalogResCore)
-                self.add_instance(cur_master, inst_name=cur_name, loc=cur_loc, unit_mode=True)
-                if row == 0 and col == 0:
-                    self._bot_port = cur_master.get_port('bot')
-                    self._top_port = cur_master.get_port('top')
+        # place core.  All cores share the same master, so add them as a single arrayed instance.
+        # use get_res_ports() to get the ports of an individual resistor.
+        self.add_instance(core_master, inst_name='XCORE', loc=(w_edge, h_edge), nx=nx, ny=ny,
+                          spx=w_core, spy=h_core, unit_mode=True)
+        self._bot_port = core_master.get_port('bot')
+        self._top_port = core_master.get_port('top')
 
         # place boundaries
         # bottom-left corner
@@ -481,7 +766,7 @@ class TerminationCore(ResArrayBase):
 
         # connect to y layer
         bot_w = self.grid.get_track_width(xm_layer, xm_width)
-        ym_width = self.grid.get_min_track_width(ym_layer, bot_w=bot_w, **em_specs)
+        ym_width = get_min_track_width(self.grid, ym_layer, em_specs, bot_w=bot_w)
         y_pitch = self.num_tracks[3]
         yc_id = self.grid.coord_to_nearest_track(ym_layer, xc_warr.middle, half_track=True)
         y_tid = TrackID(ym_layer, yc_id, width=ym_width)
@@ -720,14 +1005,12 @@ class ResLadderCore(ResArrayBase):
         # connect main ladder
         for row_idx in range(ndum, ny + ndum):
             rmod = row_idx - ndum
-            for col_idx in range(ndum, nx + ndum):
-                if (col_idx == ndum and rmod % 2 == 1) or (col_idx == nx - 1 + ndum and rmod % 2 == 0):
-                    mode = 1 if row_idx == ny + ndum - 1 else 0
-                    self._connect_tb(row_idx, col_idx, ndum, tp_idx, hcon_idx_list,
-                                     vcon_idx_list, xm_bot_idx, mode=mode)
-                if col_idx != nx - 1 + ndum:
-                    self._connect_lr(row_idx, col_idx, nx, ndum, tp_idx, bp_idx, hcon_idx_list,
-                                     vcon_idx_list, xm_bot_idx)
+            mode = 1 if row_idx == ny + ndum - 1 else 0
+            col_idx = ndum if rmod % 2 == 1 else nx - 1 + ndum
+            self._connect_tb(row_idx, col_idx, ndum, tp_idx, hcon_idx_list,
+                             vcon_idx_list, xm_bot_idx, mode=mode)
+            self._connect_lr(row_idx, nx, ndum, tp_idx, bp_idx, hcon_idx_list,
+                             vcon_idx_list, xm_bot_idx)
 
         # connect to ground
         self._connect_tb(ndum - 1, ndum, ndum, tp_idx, hcon_idx_list,
@@ -737,14 +1020,18 @@ class ResLadderCore(ResArrayBase):
         self._connect_power(ny, ndum, hcon_idx_list, vcon_idx_list, xm_bot_idx, num_xm_sup)
 
         # connect horizontal dummies
-        for row_idx in range(ny + 2 * ndum):
-            if row_idx < ndum or row_idx >= ny + ndum:
-                col_iter = range(nx + 2 * ndum)
-            else:
-                col_iter = chain(range(ndum), range(nx + ndum, nx + 2 * ndum))
-            for col_idx in col_iter:
-                conn_tb = col_idx < ndum or col_idx >= nx + ndum
-                self._connect_dummy(row_idx, col_idx, conn_tb, tp_idx, bp_idx, hcon_idx_list, vcon_idx_list)
+        if ndum > 0:
+            for row_idx in range(ny + 2 * ndum):
+                if row_idx < ndum or row_idx >= ny + ndum:
+                    # dummy row
+                    self._connect_dummy(row_idx, 0, ndum, True, tp_idx, bp_idx, hcon_idx_list, vcon_idx_list)
+                    self._connect_dummy(row_idx, ndum, nx, False, tp_idx, bp_idx, hcon_idx_list, vcon_idx_list)
+                    self._connect_dummy(row_idx, nx + ndum, ndum, True, tp_idx, bp_idx,
+                                        hcon_idx_list, vcon_idx_list)
+                else:
+                    self._connect_dummy(row_idx, 0, ndum, True, tp_idx, bp_idx, hcon_idx_list, vcon_idx_list)
+                    self._connect_dummy(row_idx, nx + ndum, ndum, True, tp_idx, bp_idx,
+                                        hcon_idx_list, vcon_idx_list)
 
     def _connect_power(self, ny, ndum, hcon_idx_list, vcon_idx_list, xm_bot_idx, num_xm_sup):
         hm_off, vm_off, xm_off, _ = self.get_track_offsets(ny + ndum, ndum)
@@ -784,45 +1071,48 @@ class ResLadderCore(ResArrayBase):
             for xm_idx in xm_idx_list:
                 self.add_via_on_grid(vm_layer, vm_idx, xm_idx)
 
-    def _connect_dummy(self, row_idx, col_idx, conn_tb, tp_idx, bp_idx, hcon_idx_list, vcon_idx_list):
+    def _connect_dummy(self, row_idx, col_idx, num_col, conn_tb, tp_idx, bp_idx, hcon_idx_list, vcon_idx_list):
+        # connect num_col adjacent dummies in the given row with via arrays.
         hm_off, vm_off, _, _ = self.get_track_offsets(row_idx, col_idx)
+        vm_pitch = self.get_track_offsets(row_idx, col_idx + 1)[1] - vm_off
         hm_layer = self.bot_layer_id
-        self.add_via_on_grid(hm_layer, hm_off + tp_idx, vm_off + vcon_idx_list[3])
-        self.add_via_on_grid(hm_layer, hm_off + tp_idx, vm_off + vcon_idx_list[-4])
-        self.add_via_on_grid(hm_layer, hm_off + hcon_idx_list[1], vm_off + vcon_idx_list[3])
-        self.add_via_on_grid(hm_layer, hm_off + hcon_idx_list[1], vm_off + vcon_idx_list[-4])
-        self.add_via_on_grid(hm_layer, hm_off + bp_idx, vm_off + vcon_idx_list[3])
-        self.add_via_on_grid(hm_layer, hm_off + bp_idx, vm_off + vcon_idx_list[-4])
+        vm_list = [vcon_idx_list[3], vcon_idx_list[-4]]
+        for hm_idx in (tp_idx, hcon_idx_list[1], bp_idx):
+            for vm_idx in vm_list:
+                self._add_via_array(hm_layer, hm_off + hm_idx, vm_off + vm_idx,
+                                    num_top=num_col, top_pitch=vm_pitch)
         if conn_tb:
-            self.add_via_on_grid(hm_layer, hm_off + tp_idx, vm_off + vcon_idx_list[1])
-            self.add_via_on_grid(hm_layer, hm_off + bp_idx, vm_off + vcon_idx_list[1])
+            for hm_idx in (tp_idx, bp_idx):
+                self._add_via_array(hm_layer, hm_off + hm_idx, vm_off + vcon_idx_list[1],
+                                    num_top=num_col, top_pitch=vm_pitch)
 
-    def _connect_lr(self, row_idx, col_idx, nx, ndum, tp_idx, bp_idx, hcon_idx_list,
+    def _connect_lr(self, row_idx, nx, ndum, tp_idx, bp_idx, hcon_idx_list,
                     vcon_idx_list, xm_bot_idx):
-        hm_off, vm_off, xm_off, _ = self.get_track_offsets(row_idx, col_idx)
-        _, vm_next, _, _ = self.get_track_offsets(row_idx, col_idx + 1)
+        # connect adjacent resistors in the given row.  Resistors with the same column parity
+        # have the same connection pattern, so they are connected with via arrays.
+        hm_off, vm_off0, xm_off, _ = self.get_track_offsets(row_idx, ndum)
+        vm_pitch = self.get_track_offsets(row_idx, ndum + 1)[1] - vm_off0
         hm_layer = self.bot_layer_id
-        col_real = col_idx - ndum
         row_real = row_idx - ndum
-        if col_real % 2 == 0:
-            port = bp_idx
-            conn = hcon_idx_list[1]
-        else:
-            port = tp_idx
-            conn = hcon_idx_list[0]
-        self.add_via_on_grid(hm_layer, hm_off + port, vm_off + vcon_idx_list[-4])
-        self.add_via_on_grid(hm_layer, hm_off + conn, vm_off + vcon_idx_list[-4])
-        self.add_via_on_grid(hm_layer, hm_off + conn, vm_off + vcon_idx_list[-1])
-        self.add_via_on_grid(hm_layer, hm_off + conn, vm_next + vcon_idx_list[3])
-        self.add_via_on_grid(hm_layer, hm_off + port, vm_next + vcon_idx_list[3])
+        for col_real, port, conn in ((0, bp_idx, hcon_idx_list[1]), (1, tp_idx, hcon_idx_list[0])):
+            num_col = len(range(col_real, nx - 1, 2))
+            if num_col > 0:
+                vm_off = vm_off0 + col_real * vm_pitch
+                vm_next = vm_off + vm_pitch
+                for hm_idx, vm_idx in ((port, vm_off + vcon_idx_list[-4]), (conn, vm_off + vcon_idx_list[-4]),
+                                       (conn, vm_off + vcon_idx_list[-1]), (conn, vm_next + vcon_idx_list[3]),
+                                       (port, vm_next + vcon_idx_list[3])):
+                    self._add_via_array(hm_layer, hm_off + hm_idx, vm_idx, num_top=num_col, top_pitch=2 * vm_pitch)
 
         # connect to output port
         vm_layer = hm_layer + 1
-        if row_real % 2 == 0:
-            xm_idx = xm_bot_idx + col_real + 1
-        else:
-            xm_idx = xm_bot_idx + (nx - 1 - col_real)
-        self.add_via_on_grid(vm_layer, vm_off + vcon_idx_list[-1], xm_off + xm_idx)
+        for col_real in range(nx - 1):
+            vm_off = vm_off0 + col_real * vm_pitch
+            if row_real % 2 == 0:
+                xm_idx = xm_bot_idx + col_real + 1
+            else:
+                xm_idx = xm_bot_idx + (nx - 1 - col_real)
+            self.add_via_on_grid(vm_layer, vm_off + vcon_idx_list[-1], xm_off + xm_idx)
 
     def _connect_tb(self, row_idx, col_idx, ndum, tp_idx, hcon_idx_list,
                     vcon_idx_list, xm_bot_idx, mode=0):
@@ -894,58 +1184,60 @@ class ResLadderCore(ResArrayBase):
         vm_off = self.get_track_offsets(0, nx + 2 * ndum - 1)[1]
         xm_upper = grid.get_wire_bounds(vm_layer, vm_off + vm_tidx[-1], unit_mode=True)[1]
 
-        # expand range by +/- 1 to draw metal pattern on dummies too
-        for row_idx in range(ny + 2 * ndum):
-            for col_idx in range(nx + 2 * ndum):
-                hm_off, vm_off, xm_off, _ = self.get_track_offsets(row_idx, col_idx)
-
-                # extend port tracks on hm layer
-                hm_lower, _ = grid.get_wire_bounds(vm_layer, vm_off + vm_tidx[1], unit_mode=True)
-                _, hm_upper = grid.get_wire_bounds(vm_layer, vm_off + vm_tidx[-2], unit_mode=True)
-                self.add_wires(hm_layer, hm_off + bp_idx, hm_lower - hm_ext, hm_upper + hm_ext,
-                               num=2, pitch=tp_idx - bp_idx, unit_mode=True)
-
-                # draw hm layer bridge
-                hm_lower, _ = grid.get_wire_bounds(vm_layer, vm_off + vm_tidx[0], unit_mode=True)
-                _, hm_upper = grid.get_wire_bounds(vm_layer, vm_off + vm_tidx[3], unit_mode=True)
-                pitch = tcon_idx - bcon_idx
-                self.add_wires(hm_layer, hm_off + bcon_idx, hm_lower - hm_ext, hm_upper + hm_ext,
-                               num=2, pitch=pitch, unit_mode=True)
-                hm_lower, _ = grid.get_wire_bounds(vm_layer, vm_off + vm_tidx[-4], unit_mode=True)
-                _, hm_upper = grid.get_wire_bounds(vm_layer, vm_off + vm_tidx[-1], unit_mode=True)
-                self.add_wires(hm_layer, hm_off + bcon_idx, hm_lower - hm_ext, hm_upper + hm_ext,
-                               num=2, pitch=pitch, unit_mode=True)
-
-                # draw vm layer bridges
-                vm_lower = min(grid.get_wire_bounds(hm_layer, hm_off + min(bp_idx, bcon_idx),
-                                                    unit_mode=True)[0] - vm_ext,
-                               grid.get_wire_bounds(xm_layer, xm_off + xm_bot_idx,
-                                                    unit_mode=True)[0] - vmx_ext)
-                vm_upper = max(grid.get_wire_bounds(hm_layer, hm_off + max(tp_idx, tcon_idx),
-                                                    unit_mode=True)[1] + vm_ext,
-                               grid.get_wire_bounds(xm_layer, xm_off + xm_bot_idx + nx - 1,
-                                                    unit_mode=True)[1] + vmx_ext)
-                self.add_wires(vm_layer, vm_off + vm_tidx[0], vm_lower, vm_upper,
-                               num=2, pitch=3, unit_mode=True)
-                self.add_wires(vm_layer, vm_off + vm_tidx[-4], vm_lower, vm_upper,
-                               num=2, pitch=3, unit_mode=True)
-
-                vm_y1 = max(grid.get_wire_bounds(hm_layer, hm_off + max(bp_idx, bcon_idx),
-                                                 unit_mode=True)[1] + vm_ext,
-                            grid.get_wire_bounds(xm_layer, xm_off + xm_bot_idx,
-                                                 unit_mode=True)[1] + vmx_ext)
-                vm_y2 = min(grid.get_wire_bounds(hm_layer, hm_off + min(tp_idx, tcon_idx),
-                                                 unit_mode=True)[0] - vm_ext,
-                            grid.get_wire_bounds(xm_layer, xm_off + xm_bot_idx + nx - 1,
-                                                 unit_mode=True)[0] - vmx_ext)
-                self.add_wires(vm_layer, vm_off + vm_tidx[1], vm_y2 - blk_h, vm_y1,
-                               num=2, pitch=1, unit_mode=True)
-                self.add_wires(vm_layer, vm_off + vm_tidx[1], vm_y2, vm_y1 + blk_h,
-                               num=2, pitch=1, unit_mode=True)
-                self.add_wires(vm_layer, vm_off + vm_tidx[-3], vm_y2 - blk_h, vm_y1,
-                               num=2, pitch=1, unit_mode=True)
-                self.add_wires(vm_layer, vm_off + vm_tidx[-3], vm_y2, vm_y1 + blk_h,
-                               num=2, pitch=1, unit_mode=True)
+        # expand range by +/- 1 to draw metal pattern on dummies too.
+        # the metal pattern is periodic, so draw all rows of a column/all columns of a row as wire arrays.
+        num_row = ny + 2 * ndum
+        num_col = nx + 2 * ndum
+        hm_off0, vm_off0, _, _ = self.get_track_offsets(0, 0)
+        hm_row_pitch = self.get_track_offsets(1, 0)[0] - hm_off0
+        vm_col_pitch = self.get_track_offsets(0, 1)[1] - vm_off0
+        for col_idx in range(num_col):
+            vm_off = self.get_track_offsets(0, col_idx)[1]
+
+            # extend port tracks on hm layer
+            hm_lower, _ = grid.get_wire_bounds(vm_layer, vm_off + vm_tidx[1], unit_mode=True)
+            _, hm_upper = grid.get_wire_bounds(vm_layer, vm_off + vm_tidx[-2], unit_mode=True)
+            for hm_idx in (bp_idx, tp_idx):
+                self.add_wires(hm_layer, hm_off0 + hm_idx, hm_lower - hm_ext, hm_upper + hm_ext,
+                               num=num_row, pitch=hm_row_pitch, unit_mode=True)
+
+            # draw hm layer bridge
+            for vm_idx1, vm_idx2 in ((vm_tidx[0], vm_tidx[3]), (vm_tidx[-4], vm_tidx[-1])):
+                hm_lower, _ = grid.get_wire_bounds(vm_layer, vm_off + vm_idx1, unit_mode=True)
+                _, hm_upper = grid.get_wire_bounds(vm_layer, vm_off + vm_idx2, unit_mode=True)
+                for hm_idx in (bcon_idx, tcon_idx):
+                    self.add_wires(hm_layer, hm_off0 + hm_idx, hm_lower - hm_ext, hm_upper + hm_ext,
+                                   num=num_row, pitch=hm_row_pitch, unit_mode=True)
+
+        for row_idx in range(num_row):
+            hm_off, _, xm_off, _ = self.get_track_offsets(row_idx, 0)
+
+            # draw vm layer bridges
+            vm_lower = min(grid.get_wire_bounds(hm_layer, hm_off + min(bp_idx, bcon_idx),
+                                                unit_mode=True)[0] - vm_ext,
+                           grid.get_wire_bounds(xm_layer, xm_off + xm_bot_idx,
+                                                unit_mode=True)[0] - vmx_ext)
+            vm_upper = max(grid.get_wire_bounds(hm_layer, hm_off + max(tp_idx, tcon_idx),
+                                                unit_mode=True)[1] + vm_ext,
+                           grid.get_wire_bounds(xm_layer, xm_off + xm_bot_idx + nx - 1,
+                                                unit_mode=True)[1] + vmx_ext)
+            for vm_idx in (vm_tidx[0], vm_tidx[0] + 3, vm_tidx[-4], vm_tidx[-4] + 3):
+                self.add_wires(vm_layer, vm_off0 + vm_idx, vm_lower, vm_upper,
+                               num=num_col, pitch=vm_col_pitch, unit_mode=True)
+
+            vm_y1 = max(grid.get_wire_bounds(hm_layer, hm_off + max(bp_idx, bcon_idx),
+                                             unit_mode=True)[1] + vm_ext,
+                        grid.get_wire_bounds(xm_layer, xm_off + xm_bot_idx,
+                                             unit_mode=True)[1] + vmx_ext)
+            vm_y2 = min(grid.get_wire_bounds(hm_layer, hm_off + min(tp_idx, tcon_idx),
+                                             unit_mode=True)[0] - vm_ext,
+                        grid.get_wire_bounds(xm_layer, xm_off + xm_bot_idx + nx - 1,
+                                             unit_mode=True)[0] - vmx_ext)
+            for vm_idx in (vm_tidx[1], vm_tidx[1] + 1, vm_tidx[-3], vm_tidx[-3] + 1):
+                self.add_wires(vm_layer, vm_off0 + vm_idx, vm_y2 - blk_h, vm_y1,
+                               num=num_col, pitch=vm_col_pitch, unit_mode=True)
+                self.add_wires(vm_layer, vm_off0 + vm_idx, vm_y2, vm_y1 + blk_h,
+                               num=num_col, pitch=vm_col_pitch, unit_mode=True)
 
         # draw and export output ports
         for row in range(ny + 2 * ndum):
@@ -0,0 +1,596 @@
+# -*- coding: utf-8 -*-
+########################################################################################################################
+#
+# Copyright (c) 2014, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#   disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#    following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+########################################################################################################################
+
+
+"""This module sweeps resistor array shapes and unit resistor arrangements for matched resistor sets.
+
+Each target resistance is made of unit resistors in series.  Array shapes are scored by area and
+routing track usage without drawing, using ResArrayBase.get_array_info(), then the best candidates
+are built as ResPatternArray templates.
+"""
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+# noinspection PyUnresolvedReferences,PyCompatibility
+from builtins import *
+
+from typing import Dict, Set, Tuple, Any, List, Optional
+
+import time
+import multiprocessing
+
+from bag.layout.routing import RoutingGrid, TrackID, WireArray
+from bag.layout.template import TemplateDB
+
+from .core import ResArrayBase
+
+
+class ResPatternArray(ResArrayBase):
+    """A resistor array with unit resistors assigned to resistor groups.
+
+    Unit resistors in group k are connected in series, in row order from the bottom row, going
+    left to right on even rows and right to left on odd rows.  The top port of each unit resistor
+    is connected to the bottom port of the next one with an L shaped route: a horizontal wire on
+    the third routing layer in the row of the first resistor, and vertical wires on the second
+    routing layer in the columns of both resistors.  Tracks are allocated per resistor row and
+    column, so min_tracks must leave enough tracks for the routes.
+
+    The ends of group k are exported as r<k>_bot and r<k>_top.  Unused resistors and dummies are
+    exported as dum_bot and dum_top.
+
+    Parameters
+    ----------
+    temp_db : TemplateDB
+            the template database.
+    lib_name : str
+        the layout library name.
+    params : Dict[str, Any]
+        the parameter values.
+    used_names : Set[str]
+        a set of already used cell names.
+    **kwargs :
+        dictionary of optional parameters.  See documentation of
+        :class:`bag.layout.template.TemplateBase` for details.
+    """
+
+    def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
+        # type: (TemplateDB, str, Dict[str, Any], Set[str], **Any) -> None
+        super(ResPatternArray, self).__init__(temp_db, lib_name, params, used_names, **kwargs)
+
+    @classmethod
+    def get_default_param_values(cls):
+        # type: () -> Dict[str, Any]
+        """Returns a dictionary containing default parameter values.
+
+        Override this method to define default parameter values.  As good practice,
+        you should avoid defining default values for technology-dependent parameters
+        (such as channel length, transistor width, etc.), but only define default
+        values for technology-independent parameters (such as number of tracks).
+
+        Returns
+        -------
+        default_params : Dict[str, Any]
+            dictionary of default parameter values.
+        """
+        return dict(
+            ndum=1,
+            min_tracks=(1, 1, 1, 1),
+            res_type='reference',
+            em_specs={},
+            grid_type='standard',
+            ext_dir='',
+            show_pins=True,
+        )
+
+    @classmethod
+    def get_params_info(cls):
+        # type: () -> Dict[str, str]
+        """Returns a dictionary containing parameter descriptions.
+
+        Override this method to return a dictionary from parameter names to descriptions.
+
+        Returns
+        -------
+        param_info : Dict[str, str]
+            dictionary from parameter name to description.
+        """
+        return dict(
+            l='unit resistor length, in meters.',
+            w='unit resistor width, in meters.',
+            sub_type='the substrate type.',
+            threshold='the substrate threshold flavor.',
+            pattern='resistor group index of each unit resistor, as a tuple of rows.  -1 for unused.',
+            ndum='number of dummy resistors on each side.',
+            min_tracks='minimum number of tracks per layer in the resistor unit cell.',
+            res_type='the resistor type.',
+            em_specs='resistor EM specifications.',
+            grid_type='the lower resistor routing grid name.',
+            ext_dir='resistor core extension direction.',
+            show_pins='True to show pins.',
+        )
+
+    def draw_layout(self):
+        # type: () -> None
+        pattern = self.params['pattern']
+        ndum = self.params['ndum']
+        show_pins = self.params['show_pins']
+
+        ny = len(pattern)
+        nx = len(pattern[0])
+        self.draw_array(self.params['l'], self.params['w'], self.params['sub_type'], self.params['threshold'],
+                        nx=nx + 2 * ndum, ny=ny + 2 * ndum, min_tracks=self.params['min_tracks'],
+                        res_type=self.params['res_type'], em_specs=self.params['em_specs'],
+                        grid_type=self.params['grid_type'], ext_dir=self.params['ext_dir'])
+
+        # get ports of all resistors at once
+        nrow, ncol = ny + 2 * ndum, nx + 2 * ndum
+        row_idx = [ridx for ridx in range(nrow) for _ in range(ncol)]
+        col_idx = list(range(ncol)) * nrow
+        bot_list, top_list = self.get_res_ports_array(row_idx, col_idx)
+        group_units = {}
+        for ridx, cidx, bot_warr, top_warr in zip(row_idx, col_idx, bot_list, top_list):
+            pr, pc = ridx - ndum, cidx - ndum
+            if 0 <= pr < ny and 0 <= pc < nx and pattern[pr][pc] >= 0:
+                # serpentine order, so consecutive resistors in a group are close to each other.
+                order = (ridx, cidx if ridx % 2 == 0 else -cidx)
+                group_units.setdefault(pattern[pr][pc], []).append((order, ridx, cidx, bot_warr, top_warr))
+            else:
+                self.add_pin('dum_bot', bot_warr, show=show_pins)
+                self.add_pin('dum_top', top_warr, show=show_pins)
+
+        # connect each group in series
+        used_tracks = {}
+        for grp in sorted(group_units.keys()):
+            unit_list = sorted(group_units[grp], key=lambda info: info[0])
+            for (_, r0, c0, _, top_warr), (_, r1, c1, bot_warr, _) in zip(unit_list[:-1], unit_list[1:]):
+                self._connect_series(used_tracks, r0, c0, top_warr, r1, c1, bot_warr)
+            self.add_pin('r%d_bot' % grp, unit_list[0][3], show=show_pins)
+            self.add_pin('r%d_top' % grp, unit_list[-1][4], show=show_pins)
+
+    def _alloc_track(self, used_tracks, layer_idx, line_idx, lower, upper):
+        # type: (Dict[Tuple[int, int], List[List[Tuple[int, int]]]], int, int, int, int) -> TrackID
+        """Allocate a track in the given resistor row/column over the given range of resistor blocks.
+
+        Parameters
+        ----------
+        used_tracks : Dict[Tuple[int, int], List[List[Tuple[int, int]]]]
+            dictionary from (layer index, row/column index) to the occupied block ranges of each track.
+        layer_idx : int
+            the routing layer index.  1 for vertical tracks, 2 for horizontal tracks.
+        line_idx : int
+            the column index for vertical tracks, the row index for horizontal tracks.
+        lower : int
+            the first block index spanned by the wire.
+        upper : int
+            the last block index spanned by the wire.
+
+        Returns
+        -------
+        tid : TrackID
+            the allocated TrackID.
+        """
+        layer_id = self.bot_layer_id + layer_idx
+        width = self.w_tracks[layer_idx]
+        num_sp = self.grid.get_num_space_tracks(layer_id, width)
+        step = width + num_sp
+        num_slots = (self.num_tracks[layer_idx] - num_sp) // step
+        slot_list = used_tracks.setdefault((layer_idx, line_idx), [[] for _ in range(num_slots)])
+        for slot, intv_list in enumerate(slot_list):
+            if all((upper < lo or hi < lower for lo, hi in intv_list)):
+                intv_list.append((lower, upper))
+                if layer_idx == 1:
+                    offset = self.get_track_offsets(0, line_idx)[layer_idx]
+                else:
+                    offset = self.get_track_offsets(line_idx, 0)[layer_idx]
+                return TrackID(layer_id, offset + slot * step + (width - 1) / 2, width=width)
+
+        raise ValueError('Not enough tracks on layer %d in %s %d to connect resistors in series.  '
+                         'Increase min_tracks.' % (layer_id, 'column' if layer_idx == 1 else 'row', line_idx))
+
+    def _connect_series(self, used_tracks, r0, c0, top_warr, r1, c1, bot_warr):
+        # type: (Dict[Tuple[int, int], List[List[Tuple[int, int]]]], int, int, WireArray, int, int, WireArray) -> None
+        """Connect the top port of resistor (r0, c0) to the bottom port of resistor (r1, c1)."""
+        if c0 == c1:
+            tid = self._alloc_track(used_tracks, 1, c0, min(r0, r1), max(r0, r1))
+            self.connect_to_tracks([top_warr, bot_warr], tid)
+            return
+
+        vtid0 = self._alloc_track(used_tracks, 1, c0, r0, r0)
+        vtid1 = self._alloc_track(used_tracks, 1, c1, min(r0, r1), max(r0, r1))
+        htid = self._alloc_track(used_tracks, 2, r0, min(c0, c1), max(c0, c1))
+        vwarr0 = self.connect_to_tracks(top_warr, vtid0, min_len_mode=0)
+        vwarr1 = self.connect_to_tracks(bot_warr, vtid1, min_len_mode=0)
+        self.connect_to_tracks([vwarr0, vwarr1], htid)
+
+def get_unit_counts(targets, r_unit, max_err=0.01):
+    # type: (List[float], float, float) -> List[int]
+    """Returns the number of series unit resistors needed for each target resistance.
+
+    Parameters
+    ----------
+    targets : List[float]
+        list of target resistances, in ohms.
+    r_unit : float
+        the unit resistance, in ohms.
+    max_err : float
+        maximum relative resistance error.
+
+    Returns
+    -------
+    counts : List[int]
+        number of unit resistors of each target resistance.
+    """
+    counts = []
+    for targ in targets:
+        num = max(1, int(round(targ / r_unit)))
+        if abs(num * r_unit - targ) > max_err * targ:
+            raise ValueError('Cannot realize %.4g ohms with %.4g ohm unit resistors.' % (targ, r_unit))
+        counts.append(num)
+    return counts
+
+
+def get_pattern(nx, ny, counts, common_centroid=True):
+    # type: (int, int, List[int], bool) -> Optional[Tuple[Tuple[int, ...], ...]]
+    """Assign unit resistors in a nx-by-ny array to resistor groups.
+
+    In common centroid mode, unit resistors are assigned in point symmetric pairs, from the
+    center of the array outwards, to the group with the largest fraction of unassigned units.
+    Otherwise, unit resistors are assigned in row major order.
+
+    Parameters
+    ----------
+    nx : int
+        number of columns.
+    ny : int
+        number of rows.
+    counts : List[int]
+        number of unit resistors in each group.
+    common_centroid : bool
+        True to make all groups share the array center as centroid.
+
+    Returns
+    -------
+    pattern : Optional[Tuple[Tuple[int, ...], ...]]
+        the group index of each unit resistor, as a tuple of rows.  -1 for unused resistors.
+        None if the groups do not fit in the array.
+    """
+    num_tot = sum(counts)
+    if num_tot > nx * ny:
+        return None
+
+    pattern = [[-1] * nx for _ in range(ny)]
+    if not common_centroid:
+        idx = 0
+        for grp, num in enumerate(counts):
+            for _ in range(num):
+                pattern[idx // nx][idx % nx] = grp
+                idx += 1
+        return tuple((tuple(row) for row in pattern))
+
+    # an odd group needs the center resistor, which only exists if both dimensions are odd.
+    odd_groups = [grp for grp, num in enumerate(counts) if num % 2 == 1]
+    if len(odd_groups) > 1 or (odd_groups and (nx % 2 == 0 or ny % 2 == 0)):
+        return None
+    if odd_groups:
+        pattern[ny // 2][nx // 2] = odd_groups[0]
+
+    # list point symmetric pairs, closest to the center first.
+    xc, yc = (nx - 1) / 2, (ny - 1) / 2
+    pairs = [(ridx, cidx) for ridx in range(ny) for cidx in range(nx)
+             if (ridx, cidx) < (ny - 1 - ridx, nx - 1 - cidx)]
+    pairs.sort(key=lambda loc: ((loc[0] - yc) ** 2 + (loc[1] - xc) ** 2, loc))
+
+    remaining = [num // 2 for num in counts]
+    for ridx, cidx in pairs:
+        grp = max(range(len(counts)), key=lambda gidx: (remaining[gidx] / max(counts[gidx], 1), -gidx))
+        if remaining[grp] == 0:
+            break
+        remaining[grp] -= 1
+        pattern[ridx][cidx] = pattern[ny - 1 - ridx][nx - 1 - cidx] = grp
+
+    return tuple((tuple(row) for row in pattern))
+
+
+def get_pattern_stats(pattern, num_groups):
+    # type: (Tuple[Tuple[int, ...], ...], int) -> Tuple[float, int, int, int]
+    """Compute matching and routing statistics of the given pattern.
+
+    Parameters
+    ----------
+    pattern : Tuple[Tuple[int, ...], ...]
+        the resistor pattern.
+    num_groups : int
+        number of resistor groups.
+
+    Returns
+    -------
+    centroid_err : float
+        maximum distance between a group centroid and the array center, in number of resistors.
+    track_use : int
+        total number of distinct groups over all rows and columns.  Each one needs its own routing track.
+    max_row_groups : int
+        maximum number of distinct groups in a row.
+    max_col_groups : int
+        maximum number of distinct groups in a column.
+    """
+    ny = len(pattern)
+    nx = len(pattern[0])
+    xc, yc = (nx - 1) / 2, (ny - 1) / 2
+    sums = [[0, 0, 0] for _ in range(num_groups)]
+    for ridx, row in enumerate(pattern):
+        for cidx, grp in enumerate(row):
+            if grp >= 0:
+                sums[grp][0] += cidx
+                sums[grp][1] += ridx
+                sums[grp][2] += 1
+
+    centroid_err = max((abs(sx / num - xc) + abs(sy / num - yc) for sx, sy, num in sums if num > 0))
+    row_groups = [len(set(row) - {-1}) for row in pattern]
+    col_groups = [len(set((row[cidx] for row in pattern)) - {-1}) for cidx in range(nx)]
+    return centroid_err, sum(row_groups) + sum(col_groups), max(row_groups), max(col_groups)
+
+
+def enumerate_candidates(grid, specs):
+    # type: (RoutingGrid, Dict[str, Any]) -> List[Dict[str, Any]]
+    """Enumerate and score resistor array candidates.
+
+    Parameters
+    ----------
+    grid : RoutingGrid
+        the base RoutingGrid object.
+    specs : Dict[str, Any]
+        the sweep specification dictionary.  See generate_candidates() for details.
+
+    Returns
+    -------
+    cand_list : List[Dict[str, Any]]
+        list of candidates, sorted by increasing score.
+    """
+    res_params = specs['res_params']
+    counts = get_unit_counts(specs['targets'], specs['r_unit'], max_err=specs.get('max_err', 0.01))
+    common_centroid = specs.get('common_centroid', True)
+    max_centroid_err = specs.get('max_centroid_err', 0.0)
+    max_aspect = specs.get('max_aspect', 4.0)
+    ndum_list = specs.get('ndum_list', [1])
+    max_units = specs.get('max_units', 2 * sum(counts))
+    area_weight = specs.get('area_weight', 1.0)
+    track_weight = specs.get('track_weight', 1.0)
+
+    num_tot = sum(counts)
+    cand_list = []
+    for ny in range(1, max_units + 1):
+        for nx in range(-(-num_tot // ny), max_units // ny + 1):
+            if max(nx, ny) > max_aspect * min(nx, ny):
+                continue
+            pattern = get_pattern(nx, ny, counts, common_centroid=common_centroid)
+            if pattern is None:
+                continue
+            centroid_err, track_use, max_row_groups, max_col_groups = get_pattern_stats(pattern, len(counts))
+            if common_centroid and centroid_err > max_centroid_err + 1e-9:
+                continue
+            for ndum in ndum_list:
+                array_info = ResArrayBase.get_array_info(grid, nx=nx + 2 * ndum, ny=ny + 2 * ndum,
+                                                         **res_params)
+                # series connections use horizontal tracks on the third layer in each row and
+                # vertical tracks on the second layer in each column.
+                num_tracks = array_info['num_tracks']
+                if max_row_groups > num_tracks[2] or max_col_groups > num_tracks[1]:
+                    continue
+                box = array_info['array_box']
+                cand_list.append(dict(
+                    nx=nx,
+                    ny=ny,
+                    ndum=ndum,
+                    pattern=pattern,
+                    area=box.width * box.height,
+                    width=box.width,
+                    height=box.height,
+                    centroid_err=centroid_err,
+                    track_use=track_use,
+                ))
+
+    if cand_list:
+        # normalize area and track usage by the best values.
+        min_area = min((cand['area'] for cand in cand_list))
+        min_track = max(1, min((cand['track_use'] for cand in cand_list)))
+        for cand in cand_list:
+            cand['score'] = area_weight * cand['area'] / min_area + track_weight * cand['track_use'] / min_track
+        cand_list.sort(key=lambda cand: (cand['score'], cand['centroid_err'], cand['ny'], cand['nx']))
+    return cand_list
+
+
+def make_template_db(tech_info, specs):
+    # type: (Any, Dict[str, Any]) -> TemplateDB
+    """Create a new TemplateDB from the sweep specification dictionary.
+
+    Parameters
+    ----------
+    tech_info : Any
+        the TechInfo object.
+    specs : Dict[str, Any]
+        the sweep specification dictionary.
+
+    Returns
+    -------
+    temp_db : TemplateDB
+        the template database.
+    """
+    grid_specs = specs['routing_grid']
+    routing_grid = RoutingGrid(tech_info, grid_specs['layers'], grid_specs['spaces'],
+                               grid_specs['widths'], grid_specs['bot_dir'])
+    return TemplateDB(specs.get('template_libs', 'template_libs.def'), routing_grid, specs['lib_name'],
+                      use_cybagoa=specs.get('use_cybagoa', True))
+
+
+def build_candidates(temp_db, specs, cand_list):
+    # type: (TemplateDB, Dict[str, Any], List[Dict[str, Any]]) -> List[Any]
+    """Build the given candidates in the given template database.
+
+    Parameters
+    ----------
+    temp_db : TemplateDB
+        the template database.
+    specs : Dict[str, Any]
+        the sweep specification dictionary.
+    cand_list : List[Dict[str, Any]]
+        list of candidates to build.  The build time is recorded in each candidate.
+
+    Returns
+    -------
+    temp_list : List[Any]
+        list of ResPatternArray templates.
+    """
+    temp_list = []
+    for cand in cand_list:
+        params = dict(specs['res_params'])
+        params['pattern'] = cand['pattern']
+        params['ndum'] = cand['ndum']
+        start = time.time()
+        temp_list.append(temp_db.new_template(params=params, temp_cls=ResPatternArray, debug=False))
+        cand['build_time'] = time.time() - start
+    return temp_list
+
+
+def _build_candidates_worker(args):
+    # type: (Tuple[Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]
+    """Worker process function that builds a group of candidates in its own template database."""
+    from bag.core import create_tech_info
+
+    specs, cand_list = args
+    temp_db = make_template_db(create_tech_info(), specs)
+    build_candidates(temp_db, specs, cand_list)
+    return cand_list
+
+
+def generate_candidates(prj, specs, num_workers=1, instantiate=True):
+    # type: (Any, Dict[str, Any], int, bool) -> List[Dict[str, Any]]
+    """Enumerate resistor array candidates for a matched resistor set, then build the best ones.
+
+    The sweep specification dictionary has the following entries:
+
+    lib_name : str
+        the layout library name.
+    routing_grid : Dict[str, Any]
+        routing grid specification, with entries layers, spaces, widths and bot_dir.
+    res_params : Dict[str, Any]
+        unit resistor parameters passed to ResArrayBase.get_array_info(), with entries l, w,
+        sub_type, threshold, and optionally min_tracks, res_type, em_specs, grid_type and ext_dir.
+    targets : List[float]
+        list of target resistances, in ohms.
+    r_unit : float
+        the unit resistance, in ohms.
+    max_err : float
+        maximum relative resistance error.  Defaults to 0.01.
+    common_centroid : bool
+        True to place all resistors with common centroid.  Defaults to True.
+    max_centroid_err : float
+        maximum centroid error, in number of resistors.  Defaults to 0.
+    max_aspect : float
+        maximum array aspect ratio.  Defaults to 4.
+    max_units : int
+        maximum number of unit resistors in the array, excluding dummies.  Defaults to twice the
+        number of unit resistors needed.
+    ndum_list : List[int]
+        list of number of dummies on each side to sweep.  Defaults to [1].
+    area_weight : float
+        weight of the normalized area in the score.  Defaults to 1.
+    track_weight : float
+        weight of the normalized routing track usage in the score.  Defaults to 1.
+    num_build : int
+        number of best candidates to build.  Defaults to 5.
+
+    In serial mode, all candidates are built in a single TemplateDB session.  If num_workers is
+    greater than 1, candidates are built in worker processes only to measure build times, as
+    templates cannot be sent back from the workers.  If instantiate is True, the candidates are
+    then built again from their parameters in this process and instantiated.
+
+    Parameters
+    ----------
+    prj : Any
+        the BagProject instance.
+    specs : Dict[str, Any]
+        the sweep specification dictionary.
+    num_workers : int
+        number of worker processes.
+    instantiate : bool
+        True to instantiate the layouts of the built candidates.
+
+    Returns
+    -------
+    report : List[Dict[str, Any]]
+        list of built candidates, sorted by rank.
+    """
+    temp_db = make_template_db(prj.tech_info, specs)
+    cand_list = enumerate_candidates(temp_db.grid, specs)
+    best_list = cand_list[:specs.get('num_build', 5)]
+    if not best_list:
+        raise ValueError('No resistor array satisfies the given specifications.')
+
+    for rank, cand in enumerate(best_list):
+        cand['rank'] = rank
+        cand['cell_name'] = '%s_%d' % (specs.get('cell_prefix', 'RES_ARRAY'), rank)
+
+    if num_workers > 1:
+        groups = [best_list[idx::num_workers] for idx in range(num_workers)]
+        pool = multiprocessing.Pool(processes=num_workers)
+        try:
+            results = pool.map(_build_candidates_worker, [(specs, group) for group in groups if group])
+        finally:
+            pool.close()
+            pool.join()
+        report = sorted((cand for group in results for cand in group), key=lambda cand: cand['rank'])
+        if instantiate:
+            # build times are measured in the workers, do not overwrite them.
+            temp_list = build_candidates(temp_db, specs, [dict(cand) for cand in report])
+            temp_db.batch_layout(prj, temp_list, [cand['cell_name'] for cand in report])
+    else:
+        temp_list = build_candidates(temp_db, specs, best_list)
+        if instantiate:
+            temp_db.batch_layout(prj, temp_list, [cand['cell_name'] for cand in best_list])
+        report = best_list
+
+    print_report(report, len(cand_list))
+    return report
+
+
+def print_report(report, num_cand):
+    # type: (List[Dict[str, Any]], int) -> None
+    """Print the ranked candidate report.
+
+    Parameters
+    ----------
+    report : List[Dict[str, Any]]
+        list of built candidates, sorted by rank.
+    num_cand : int
+        total number of candidates enumerated.
+    """
+    print('%d candidates enumerated, %d built.' % (num_cand, len(report)))
+    fmt = '%-20s %4s %4s %4s %10s %10s %8s %8s %8s %10s'
+    print(fmt % ('cell', 'nx', 'ny', 'ndum', 'width', 'height', 'tracks', 'cent_err', 'score', 'time (s)'))
+    for cand in report:
+        print('%-20s %4d %4d %4d %10.3f %10.3f %8d %8.3f %8.3f %10.3f' %
+              (cand['cell_name'], cand['nx'], cand['ny'], cand['ndum'], cand['width'], cand['height'],
+               cand['track_use'], cand['centroid_err'], cand['score'], cand.get('build_time', 0.0)))
+        for row in reversed(cand['pattern']):
+            print('    ' + ' '.join(('.' if grp < 0 else str(grp) for grp in row)))
@@ -0,0 +1,470 @@
+# -*- coding: utf-8 -*-
+########################################################################################################################
+#
+# Copyright (c) 2014, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#   disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#    following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+########################################################################################################################
+
+"""This module defines routing utility functions shared by layout generators."""
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+# noinspection PyUnresolvedReferences,PyCompatibility
+from builtins import *
+
+import bisect
+from typing import Dict, Tuple, Any, Union, List, Optional, Iterable, Set
+
+from bag.layout.routing import RoutingGrid, WireArray, Port
+from bag.layout.objects import Instance
+
+# get_min_track_width() results, keyed by routing grid fingerprint, layer, EM specs and bottom/top wire widths.
+_track_width_cache = {}  # type: Dict[Any, int]
+
+
+def to_hashable(obj):
+    # type: (Any) -> Any
+    """Convert the given dictionary/list specification object to a hashable object.
+
+    Parameters
+    ----------
+    obj : Any
+        the object to convert.
+
+    Returns
+    -------
+    key : Any
+        a hashable object that compares equal for equal specifications.
+    """
+    if isinstance(obj, dict):
+        return tuple(sorted(((key, to_hashable(val)) for key, val in obj.items())))
+    if isinstance(obj, (list, tuple)):
+        return tuple((to_hashable(val) for val in obj))
+    return obj
+
+
+def get_grid_fingerprint(grid, bot_layer, top_layer):
+    # type: (RoutingGrid, int, int) -> Tuple[Any, ...]
+    """Returns a hashable fingerprint of the given routing layers.
+
+    Two routing grids with the same fingerprint have the same track width, space, direction
+    and block pitch on the given layers.
+
+    Parameters
+    ----------
+    grid : RoutingGrid
+        the RoutingGrid object.
+    bot_layer : int
+        the bottom layer ID.
+    top_layer : int
+        the top layer ID.
+
+    Returns
+    -------
+    fingerprint : Tuple[Any, ...]
+        the routing grid fingerprint.
+    """
+    layer_info = tuple(((lay, grid.get_direction(lay), grid.get_track_info(lay, unit_mode=True))
+                        for lay in range(bot_layer, top_layer + 1) if lay in grid))
+    return id(grid.tech_info), grid.resolution, layer_info, grid.get_block_size(top_layer, unit_mode=True)
+
+
+def get_min_track_width(grid,  # type: RoutingGrid
+                        layer_id,  # type: int
+                        em_specs=None,  # type: Dict[str, Any]
+                        bot_w=-1,  # type: Union[float, int]
+                        top_w=-1,  # type: Union[float, int]
+                        via_up=False,  # type: bool
+                        unit_mode=False,  # type: bool
+                        ):
+    # type: (...) -> int
+    """Returns the minimum track width on the given layer that satisfies the EM specifications.
+
+    Results are cached, so layout generators that route many wires with the same EM specifications
+    on the same routing grid compute each track width only once.
+
+    Parameters
+    ----------
+    grid : RoutingGrid
+        the RoutingGrid object.
+    layer_id : int
+        the routing layer ID.
+    em_specs : Dict[str, Any]
+        the EM specification dictionary, passed to RoutingGrid.get_min_track_width().
+    bot_w : Union[float, int]
+        width of the wire on the layer below.  Negative to ignore.
+    top_w : Union[float, int]
+        width of the wire on the layer above.  Negative to ignore.
+    via_up : bool
+        True to also make sure a via to the layer above can be drawn on a track with the
+        returned width.
+    unit_mode : bool
+        True if bot_w and top_w are given in resolution units.
+
+    Returns
+    -------
+    width : int
+        the minimum track width, in number of tracks.
+    """
+    em_specs = em_specs or {}
+    top_layer = layer_id + 1 if via_up else layer_id
+    key = (get_grid_fingerprint(grid, layer_id, top_layer), layer_id, to_hashable(em_specs),
+           bot_w, top_w, via_up, unit_mode)
+    width = _track_width_cache.get(key, None)
+    if width is None:
+        width = grid.get_min_track_width(layer_id, bot_w=bot_w, top_w=top_w, unit_mode=unit_mode, **em_specs)
+        if via_up:
+            # RoutingGrid reports illegal via widths with ValueError, so increase width until a via
+            # can be drawn.  This only runs once per cache entry.
+            while True:
+                try:
+                    grid.get_via_extensions(layer_id, width, 1)
+                    break
+                except ValueError:
+                    width += 1
+        _track_width_cache[key] = width
+    return width
+
+
+class _IntervalIndex(object):
+    """A sorted list of disjoint half-open intervals, with O(log n) overlap queries."""
+
+    def __init__(self):
+        # type: () -> None
+        self._starts = []  # type: List[int]
+        self._stops = []  # type: List[int]
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._starts)
+
+    def overlaps(self, lower, upper):
+        # type: (int, int) -> bool
+        """Returns True if [lower, upper) overlaps any interval in this index."""
+        idx = bisect.bisect_left(self._starts, upper) - 1
+        return idx >= 0 and self._stops[idx] > lower
+
+    def add(self, lower, upper):
+        # type: (int, int) -> None
+        """Add the interval [lower, upper), merging with overlapping or abutting intervals."""
+        idx0 = bisect.bisect_left(self._stops, lower)
+        idx1 = bisect.bisect_right(self._starts, upper)
+        if idx0 < idx1:
+            lower = min(lower, self._starts[idx0])
+            upper = max(upper, self._stops[idx1 - 1])
+        self._starts[idx0:idx1] = [lower]
+        self._stops[idx0:idx1] = [upper]
+
+    def get_total_length(self, lower, upper):
+        # type: (int, int) -> int
+        """Returns the total length of intervals in this index inside [lower, upper)."""
+        idx0 = bisect.bisect_right(self._stops, lower)
+        idx1 = bisect.bisect_left(self._starts, upper)
+        return sum((min(stop, upper) - max(start, lower)
+                    for start, stop in zip(self._starts[idx0:idx1], self._stops[idx0:idx1])))
+
+
+class TrackAllocator(object):
+    """Assigns routing tracks on a single layer, keeping track of occupied track segments.
+
+    Each half-track has an interval index of occupied coordinate ranges, so checking whether
+    a wire can be drawn takes O(w * log n) time, where w is the wire width in number of tracks
+    and n is the number of wire segments on those tracks.  Wires added to this allocator
+    honor the track spacing rules of the routing grid with respect to each other.
+
+    All coordinates are in resolution units.
+
+    Parameters
+    ----------
+    grid : RoutingGrid
+        the RoutingGrid object.
+    layer_id : int
+        the routing layer ID.
+    """
+
+    def __init__(self, grid, layer_id):
+        # type: (RoutingGrid, int) -> None
+        self._grid = grid
+        self._layer_id = layer_id
+        # occupied wire segments, and wire segments plus spacing, keyed by half-track index.
+        self._used = {}  # type: Dict[int, _IntervalIndex]
+        self._keepout = {}  # type: Dict[int, _IntervalIndex]
+        self._num_space = {}  # type: Dict[int, int]
+
+    @property
+    def layer_id(self):
+        # type: () -> int
+        """Returns the routing layer ID."""
+        return self._layer_id
+
+    def _get_num_space(self, width):
+        # type: (int) -> int
+        num_space = self._num_space.get(width, None)
+        if num_space is None:
+            num_space = self._grid.get_num_space_tracks(self._layer_id, width_ntr=width)
+            self._num_space[width] = num_space
+        return num_space
+
+    @staticmethod
+    def _get_htr_range(track_idx, width, num_space):
+        # type: (Union[float, int], int, int) -> Tuple[int, int]
+        """Returns the half-track index range covered by the given wire and its spacing."""
+        htr = int(round(2 * track_idx))
+        return htr - (width - 1) - 2 * num_space, htr + (width - 1) + 2 * num_space + 1
+
+    @staticmethod
+    def _any_overlap(table, htr_start, htr_stop, lower, upper):
+        # type: (Dict[int, _IntervalIndex], int, int, int, int) -> bool
+        for htr in range(htr_start, htr_stop):
+            index = table.get(htr, None)
+            if index is not None and index.overlaps(lower, upper):
+                return True
+        return False
+
+    def is_free(self, track_idx, lower, upper, width=1):
+        # type: (Union[float, int], int, int, int) -> bool
+        """Returns True if a wire can be drawn on the given track without violating spacing.
+
+        Parameters
+        ----------
+        track_idx : Union[float, int]
+            the track index.
+        lower : int
+            the wire lower coordinate.
+        upper : int
+            the wire upper coordinate.
+        width : int
+            the wire width, in number of tracks.
+
+        Returns
+        -------
+        is_free : bool
+            True if the wire can be drawn.
+        """
+        start, stop = self._get_htr_range(track_idx, width, 0)
+        if self._any_overlap(self._keepout, start, stop, lower, upper):
+            return False
+        start, stop = self._get_htr_range(track_idx, width, self._get_num_space(width))
+        return not self._any_overlap(self._used, start, stop, lower, upper)
+
+    def reserve(self, track_idx, lower, upper, width=1):
+        # type: (Union[float, int], int, int, int) -> None
+        """Mark the given wire as occupied.
+
+        Parameters
+        ----------
+        track_idx : Union[float, int]
+            the track index.
+        lower : int
+            the wire lower coordinate.
+        upper : int
+            the wire upper coordinate.
+        width : int
+            the wire width, in number of tracks.
+        """
+        start, stop = self._get_htr_range(track_idx, width, 0)
+        for htr in range(start, stop):
+            self._used.setdefault(htr, _IntervalIndex()).add(lower, upper)
+        start, stop = self._get_htr_range(track_idx, width, self._get_num_space(width))
+        for htr in range(start, stop):
+            self._keepout.setdefault(htr, _IntervalIndex()).add(lower, upper)
+
+    def reserve_wires(self, warr_list):
+        # type: (Iterable[WireArray]) -> None
+        """Mark all wires in the given WireArrays on this layer as occupied.
+
+        Parameters
+        ----------
+        warr_list : Iterable[WireArray]
+            the WireArrays to add.  WireArrays on other layers are ignored.
+        """
+        res = self._grid.resolution
+        for warr in warr_list:
+            tid = warr.track_id
+            if tid.layer_id == self._layer_id:
+                lower = int(round(warr.lower / res))
+                upper = int(round(warr.upper / res))
+                for track_idx in tid:
+                    self.reserve(track_idx, lower, upper, width=tid.width)
+
+    def get_available_tracks(self, track_list, lower, upper, width=1):
+        # type: (Iterable[Union[float, int]], int, int, int) -> List[Union[float, int]]
+        """Returns all tracks in the given list that a wire can be drawn on.
+
+        Unlike allocate(), the returned tracks are not reserved, and may be too close to each other.
+
+        Parameters
+        ----------
+        track_list : Iterable[Union[float, int]]
+            the candidate track indices.
+        lower : int
+            the wire lower coordinate.
+        upper : int
+            the wire upper coordinate.
+        width : int
+            the wire width, in number of tracks.
+
+        Returns
+        -------
+        avail_list : List[Union[float, int]]
+            the available track indices.
+        """
+        return [track_idx for track_idx in track_list if self.is_free(track_idx, lower, upper, width=width)]
+
+    def allocate(self, track_list, lower, upper, width=1):
+        # type: (Iterable[Union[float, int]], int, int, int) -> Optional[Union[float, int]]
+        """Reserve the first available track in the given list.
+
+        Parameters
+        ----------
+        track_list : Iterable[Union[float, int]]
+            the candidate track indices, in order of preference.
+        lower : int
+            the wire lower coordinate.
+        upper : int
+            the wire upper coordinate.
+        width : int
+            the wire width, in number of tracks.
+
+        Returns
+        -------
+        track_idx : Optional[Union[float, int]]
+            the allocated track index, or None if no candidate tracks are available.
+        """
+        for track_idx in track_list:
+            if self.is_free(track_idx, lower, upper, width=width):
+                self.reserve(track_idx, lower, upper, width=width)
+                return track_idx
+        return None
+
+    def get_utilization(self, tr_lower, tr_upper, lower, upper):
+        # type: (int, int, int, int) -> float
+        """Returns the fraction of the given routing area that is occupied by wires.
+
+        Parameters
+        ----------
+        tr_lower : int
+            the lower track index, inclusive.
+        tr_upper : int
+            the upper track index, inclusive.
+        lower : int
+            the lower coordinate.
+        upper : int
+            the upper coordinate.
+
+        Returns
+        -------
+        utilization : float
+            the ratio of occupied track length to total track length.
+        """
+        if tr_upper < tr_lower or upper <= lower:
+            return 0.0
+        used_len = 0
+        for tr_idx in range(tr_lower, tr_upper + 1):
+            index = self._used.get(2 * tr_idx, None)
+            if index is not None:
+                used_len += index.get_total_length(lower, upper)
+        return used_len / ((tr_upper - tr_lower + 1) * (upper - lower))
+
+
+class PortIndex(object):
+    """A lazily built lookup table of the ports and pins of an instance.
+
+    Instance.get_port() and Instance.get_all_port_pins() transform the master port every time
+    they are called.  This class caches the transformed ports and pins, so routing code that
+    looks up the same ports repeatedly pays a dictionary lookup instead.  Port names are also
+    indexed by prefix.
+
+    The cached ports are only valid as long as the instance does not move, so create the index
+    after the instance is placed.
+
+    Parameters
+    ----------
+    inst : Instance
+        the instance to index.
+    """
+
+    def __init__(self, inst):
+        # type: (Instance) -> None
+        self._inst = inst
+        self._names = None  # type: Optional[List[str]]
+        self._name_set = None  # type: Optional[Set[str]]
+        self._ports = {}  # type: Dict[str, Port]
+        self._pins = {}  # type: Dict[str, WireArray]
+        self._all_pins = {}  # type: Dict[str, List[WireArray]]
+
+    @property
+    def inst(self):
+        # type: () -> Instance
+        """Returns the indexed instance."""
+        return self._inst
+
+    def _build_names(self):
+        # type: () -> None
+        if self._names is None:
+            self._names = sorted(self._inst.port_names_iter())
+            self._name_set = set(self._names)
+
+    def port_names_iter(self):
+        # type: () -> Iterable[str]
+        """Iterates over port names in sorted order."""
+        self._build_names()
+        return iter(self._names)
+
+    def has_port(self, name):
+        # type: (str) -> bool
+        """Returns True if the instance has the given port."""
+        self._build_names()
+        return name in self._name_set
+
+    def get_names_with_prefix(self, prefix):
+        # type: (str) -> List[str]
+        """Returns all port names that start with the given prefix, in sorted order."""
+        self._build_names()
+        idx0 = bisect.bisect_left(self._names, prefix)
+        idx1 = idx0
+        num_names = len(self._names)
+        while idx1 < num_names and self._names[idx1].startswith(prefix):
+            idx1 += 1
+        return self._names[idx0:idx1]
+
+    def get_port(self, name):
+        # type: (str) -> Port
+        """Returns the transformed port with the given name."""
+        port = self._ports.get(name, None)
+        if port is None:
+            port = self._ports[name] = self._inst.get_port(name)
+        return port
+
+    def get_pin(self, name):
+        # type: (str) -> WireArray
+        """Returns the first pin of the given port, same as get_port(name).get_pins()[0]."""
+        pin = self._pins.get(name, None)
+        if pin is None:
+            pin = self._pins[name] = self.get_port(name).get_pins()[0]
+        return pin
+
+    def get_all_port_pins(self, name):
+        # type: (str) -> List[WireArray]
+        """Returns all pins of the given port, same as Instance.get_all_port_pins()."""
+        pins = self._all_pins.get(name, None)
+        if pins is None:
+            pins = self._all_pins[name] = self._inst.get_all_port_pins(name)
+        return list(pins)
@@ -32,14 +32,105 @@ from builtins import *
 from future.utils import with_metaclass
 
 import abc
-from typing import Dict, Any, List, Optional, Tuple, Union
+import inspect
+import functools
+from typing import Dict, Any, List, Optional, Tuple, Union, Callable
 
-from bag.layout.routing import WireArray, RoutingGrid
+from bag.layout.routing import WireArray, RoutingGrid, TrackID
 
 from ..analog_core import AnalogBase, AnalogBaseInfo
+from ..routing_util import to_hashable
 
 wtype = Union[float, int]
 
+# SerdesRXBaseInfo layout information, keyed by method name, minimum separation fingers and
+# method arguments.
+_serdes_info_cache = {}  # type: Dict[Tuple[Any, ...], SerdesInfo]
+# number of SerdesRXBaseInfo layout information requests, and number of requests served from cache.
+_serdes_info_stats = dict(calls=0, hits=0)
+
+
+class SerdesInfo(dict):
+    """An immutable serdes layout information dictionary.
+
+    Parameters
+    ----------
+    *args :
+        positional arguments for dict.
+    **kwargs :
+        keyword arguments for dict.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(SerdesInfo, self).__init__(*args, **kwargs)
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('serdes layout information dictionary is immutable.')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _immutable
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return SerdesInfo, (dict(self),)
+
+
+def _freeze(obj):
+    # type: (Any) -> Any
+    """Convert all dictionaries and lists in the given object to SerdesInfo and tuples."""
+    if isinstance(obj, dict):
+        return SerdesInfo(((key, _freeze(val)) for key, val in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple((_freeze(val) for val in obj))
+    return obj
+
+
+def _cache_info(fun):
+    # type: (Callable[..., Dict[str, Any]]) -> Callable[..., SerdesInfo]
+    """Decorator that caches SerdesRXBaseInfo layout information methods.
+
+    The layout information only depends on the method arguments and the minimum number of
+    separation fingers, so results are shared by all SerdesRXBaseInfo instances.
+    """
+    @functools.wraps(fun)
+    def wrapper(self, *args, **kwargs):
+        call_args = inspect.getcallargs(fun, self, *args, **kwargs)
+        del call_args['self']
+        key = (fun.__name__, self.min_fg_sep, to_hashable(call_args))
+        _serdes_info_stats['calls'] += 1
+        info = _serdes_info_cache.get(key, None)
+        if info is None:
+            info = _freeze(fun(self, *args, **kwargs))
+            _serdes_info_cache[key] = info
+        else:
+            _serdes_info_stats['hits'] += 1
+        return info
+
+    return wrapper
+
+
+def get_info_cache_stats():
+    # type: () -> Dict[str, int]
+    """Returns SerdesRXBaseInfo layout information cache statistics.
+
+    Returns
+    -------
+    stats : Dict[str, int]
+        a dictionary with entries calls, the total number of layout information requests, and
+        hits, the number of redundant requests served from cache.
+    """
+    return dict(_serdes_info_stats)
+
+
+def reset_info_cache_stats():
+    # type: () -> None
+    """Reset SerdesRXBaseInfo layout information cache statistics."""
+    _serdes_info_stats['calls'] = _serdes_info_stats['hits'] = 0
+
 
 class SerdesRXBaseInfo(AnalogBaseInfo):
     """A class that calculates informations to assist in SerdesRXBase layout calculations.
@@ -68,6 +159,7 @@ class SerdesRXBaseInfo(AnalogBaseInfo):
         super(SerdesRXBaseInfo, self).__init__(grid, lch, guard_ring_nf,
                                                top_layer=top_layer, end_mode=end_mode, min_fg_sep=min_fg_sep)
 
+    @_cache_info
     def get_gm_info(self, fg_params, flip_sd=False):
         # type: (Dict[str, int]) -> Dict[str, Any]
         """Return Gm layout information dictionary.
@@ -99,7 +191,7 @@ class SerdesRXBaseInfo(AnalogBaseInfo):
 
         Returns
         -------
-        info : Dict[str, Any]
+        info : SerdesInfo
             the Gm stage layout information dictionary.
         """
         fg_min = fg_params.get('min', 0)
@@ -151,6 +243,7 @@ class SerdesRXBaseInfo(AnalogBaseInfo):
 
         return results
 
+    @_cache_info
     def get_diffamp_info(self, fg_params, flip_sd=False):
         # type: (Dict[str, int]) -> Dict[str, Any]
         """Return DiffAmp layout information dictionary.
@@ -186,7 +279,7 @@ class SerdesRXBaseInfo(AnalogBaseInfo):
 
         Returns
         -------
-        info : Dict[str, Any]
+        info : SerdesInfo
             the DiffAmp stage layout information dictionary.
         """
         fg_min = fg_params.get('min', 0)
@@ -214,6 +307,7 @@ class SerdesRXBaseInfo(AnalogBaseInfo):
 
         return results
 
+    @_cache_info
     def get_sampler_info(self, fg_params):
         # type: (Dict[str, int]) -> Dict[str, Any]
         """Return sampler layout information dictionary.
@@ -231,7 +325,7 @@ class SerdesRXBaseInfo(AnalogBaseInfo):
 
         Returns
         -------
-        info : Dict[str, Any]
+        info : SerdesInfo
             the DiffAmp stage layout information dictionary.
         """
         fg_min = fg_params.get('min', 0)
@@ -250,6 +344,7 @@ class SerdesRXBaseInfo(AnalogBaseInfo):
 
         return results
 
+    @_cache_info
     def get_summer_info(self, fg_load, gm_fg_list, gm_sep_list=None, flip_sd_list=None):
         # type: (int, List[Dict[str, int]], Optional[List[int]], Optional[List[bool]]) -> Dict[str, Any]
         """Return GmSummer layout information dictionary.
@@ -269,7 +364,7 @@ class SerdesRXBaseInfo(AnalogBaseInfo):
 
         Returns
         -------
-        info : Dict[str, Any]
+        info : SerdesInfo
             the GmSummer stage layout information dictionary.
         """
         if flip_sd_list is None:
@@ -324,6 +419,7 @@ class SerdesRXBaseInfo(AnalogBaseInfo):
         )
         return results
 
+    @_cache_info
     def get_summer_offset_info(self, fg_load, fg_offset, gm_fg_list, gm_sep_list=None, flip_sd_list=None):
         # type: (int, int, List[Dict[str, int]], Optional[List[int]], Optional[List[bool]]) -> Dict[str, Any]
         """Return GmSummerOffset layout information dictionary.
@@ -345,7 +441,7 @@ class SerdesRXBaseInfo(AnalogBaseInfo):
 
         Returns
         -------
-        info : Dict[str, Any]
+        info : SerdesInfo
             the GmSummer stage layout information dictionary.
         """
         if flip_sd_list is None:
@@ -411,6 +507,43 @@ class SerdesRXBaseInfo(AnalogBaseInfo):
 
 
 # noinspection PyAbstractClass
+class GmConnBatch(object):
+    """Connections shared by all Gm stages of a summer, recorded so they can be drawn together.
+
+    Substrate connections, shared horizontal tracks and differential outputs of every Gm stage
+    are accumulated here, then drawn with a single connection call per net by
+    SerdesRXBase.connect_gm_batch().
+    """
+
+    def __init__(self):
+        self.sub_warrs = {'ptap': [], 'ntap': []}  # type: Dict[str, List[WireArray]]
+        self.track_warrs = {}  # type: Dict[str, Tuple[TrackID, List[WireArray]]]
+        self.outp_warrs = []  # type: List[WireArray]
+        self.outn_warrs = []  # type: List[WireArray]
+
+    def add_track_warrs(self, name, tr_id, warr_list):
+        # type: (str, TrackID, List[WireArray]) -> None
+        """Record wires to connect to the given shared horizontal track.
+
+        Parameters
+        ----------
+        name : str
+            the net name.
+        tr_id : TrackID
+            the track to connect to.
+        warr_list : List[WireArray]
+            the wires to connect.
+        """
+        if name in self.track_warrs:
+            cur_tid, cur_list = self.track_warrs[name]
+            if (cur_tid.layer_id, cur_tid.base_index, cur_tid.width) != (tr_id.layer_id, tr_id.base_index,
+                                                                        tr_id.width):
+                raise ValueError('%s wire are on different tracks.' % name)
+            cur_list.extend(warr_list)
+        else:
+            self.track_warrs[name] = (tr_id, list(warr_list))
+
+
 class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
     """Subclass of AmplifierBase that draws serdes circuits.
 
@@ -432,10 +565,15 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
         :class:`bag.layout.template.TemplateBase` for details.
     """
 
+    # True to connect nets shared by all Gm stages of a summer with GmConnBatch.  If False, each
+    # Gm stage is connected separately and the wires are merged afterwards.
+    batch_gm_conn = True
+
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
         super(SerdesRXBase, self).__init__(temp_db, lib_name, params, used_names, **kwargs)
         self._nrow_idx = None
         self._serdes_info = None  # type: SerdesRXBaseInfo
+        self._tid_cache = {}  # type: Dict[Tuple[str, int, str, float, int], TrackID]
 
     @property
     def layout_info(self):
@@ -445,6 +583,15 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
         """Returns the index of the given nmos row type."""
         return self._nrow_idx.get(name, -1)
 
+    def _get_track_id(self, mos_type, row_idx, tr_type, tr_idx, width=1):
+        # type: (str, int, str, float, int) -> TrackID
+        """Returns make_track_id() results, cached until the rows are redrawn."""
+        key = (mos_type, row_idx, tr_type, tr_idx, width)
+        tr_id = self._tid_cache.get(key, None)
+        if tr_id is None:
+            tr_id = self._tid_cache[key] = self.make_track_id(mos_type, row_idx, tr_type, tr_idx, width=width)
+        return tr_id
+
     def _get_gm_input_track_index(self, gate_locs, track_width, diff_space):
         in_ntr = self.get_num_tracks('nch', self._nrow_idx['in'], 'g')
         inp_tr = in_ntr - (track_width + 1) / 2
@@ -470,6 +617,7 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
                 gate_locs=None,  # type: Optional[Dict[str, int]]
                 flip_sd=False,  # type: bool
                 tail_decap=False,  # type: bool
+                conn_batch=None,  # type: Optional[GmConnBatch]
                 ):
         # type: (...) -> Tuple[int, Dict[str, List[WireArray]]]
         """Draw a differential gm stage.
@@ -512,6 +660,9 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
             of number of fingers and source/drain directions may not be possible.
         tail_decap : bool
             True to draw mos decap for tail gate bias.
+        conn_batch : Optional[GmConnBatch]
+            If given, VSS and vddt connections are recorded in this object instead of drawn,
+            and vddt is not returned.
 
         Returns
         -------
@@ -766,7 +917,10 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
         for conn_name, conn_list in conn.items():
             warr_list = [mos_dict[mos][sd] for mos, sd in conn_list]
             if conn_name == 'VSS':
-                self.connect_to_substrate('ptap', warr_list)
+                if conn_batch is None:
+                    self.connect_to_substrate('ptap', warr_list)
+                else:
+                    conn_batch.sub_warrs['ptap'].extend(warr_list)
             else:
                 if conn_list[0][1] == 'g':
                     tr_width = hm_width
@@ -774,9 +928,12 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
                     tr_width = hm_cur_width
 
                 mos_type, ridx, tr_type, tr_idx = track[conn_name]
-                tr_id = self.make_track_id(mos_type, ridx, tr_type, tr_idx, width=tr_width)
-                sig_warr = self.connect_to_tracks(warr_list, tr_id)
-                port_dict[conn_name] = [sig_warr, ]
+                tr_id = self._get_track_id(mos_type, ridx, tr_type, tr_idx, width=tr_width)
+                if conn_batch is not None and conn_name == 'vddt':
+                    conn_batch.add_track_warrs(conn_name, tr_id, warr_list)
+                else:
+                    sig_warr = self.connect_to_tracks(warr_list, tr_id)
+                    port_dict[conn_name] = [sig_warr, ]
 
         return fg_gm_tot, port_dict
 
@@ -890,6 +1047,7 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
                      flip_sd=False,  # type: bool
                      tail_decap=False,  # type: bool
                      load_decap=False,  # type: bool
+                     conn_batch=None,  # type: Optional[GmConnBatch]
                      ):
         # type: (...) -> Tuple[int, Dict[str, List[WireArray]]]
         """Draw a differential amplifier/dynamic latch.
@@ -942,6 +1100,9 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
             True to use tail dummy transistors as tail decaps.
         load_decap : bool
             True to use load dummy transistors as load decaps.
+        conn_batch : Optional[GmConnBatch]
+            If given, supply, vddt and output connections are recorded in this object instead
+            of drawn, and vddt/outp/outn are not returned.
         Returns
         -------
         fg_amp : int
@@ -975,7 +1136,7 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
         gm_params['min'] = max(gm_params.get('min', fg_min), fg_min)
         fg_amp_tot, port_dict = self.draw_gm(col_idx, gm_params, hm_width=hm_width, hm_cur_width=hm_cur_width,
                                              diff_space=diff_space, gate_locs=gate_locs, flip_sd=flip_sd,
-                                             tail_decap=tail_decap)
+                                             tail_decap=tail_decap, conn_batch=conn_batch)
 
         outp_warrs = port_dict['outp']
         outn_warrs = port_dict['outn']
@@ -1004,8 +1165,8 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
                 else:
                     opg_tr = pgtop_tr
                     ong_tr = pgbot_tr
-                optr_id = self.make_track_id('pch', 0, 'g', gate_locs.get('bias_offp', opg_tr), width=hm_width)
-                ontr_id = self.make_track_id('pch', 0, 'g', gate_locs.get('bias_offn', ong_tr), width=hm_width)
+                optr_id = self._get_track_id('pch', 0, 'g', gate_locs.get('bias_offp', opg_tr), width=hm_width)
+                ontr_id = self._get_track_id('pch', 0, 'g', gate_locs.get('bias_offn', ong_tr), width=hm_width)
                 pwarr = self.connect_to_tracks([loadp['g']], optr_id)
                 nwarr = self.connect_to_tracks([loadn['g']], ontr_id)
                 if sign < 0:
@@ -1016,12 +1177,15 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
                     port_dict['bias_offn'] = [nwarr, ]
             else:
                 # connect load gate bias
-                tr_id = self.make_track_id('pch', 0, 'g', gate_locs.get('bias_load', pgbot_tr), width=hm_width)
+                tr_id = self._get_track_id('pch', 0, 'g', gate_locs.get('bias_load', pgbot_tr), width=hm_width)
                 warr = self.connect_to_tracks([loadp['g'], loadn['g']], tr_id)
                 port_dict['bias_load'] = [warr, ]
 
             # connect VDD
-            self.connect_to_substrate('ntap', [loadp[sup_type], loadn[sup_type]])
+            if conn_batch is None:
+                self.connect_to_substrate('ntap', [loadp[sup_type], loadn[sup_type]])
+            else:
+                conn_batch.sub_warrs['ntap'].extend((loadp[sup_type], loadn[sup_type]))
 
             # collect pmos outputs
             outp_warrs.append(loadp[out_type])
@@ -1029,24 +1193,72 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
         elif load_decap:
             # use all load dummies as decaps
             load_decap = self.draw_mos_decap('pch', 0, col_idx, fg_amp_tot, 0, export_gate=True)
-            tr_id = self.make_track_id('pch', 0, 'g', gate_locs.get('bias_load', (hm_width - 1) / 2), width=hm_width)
+            tr_id = self._get_track_id('pch', 0, 'g', gate_locs.get('bias_load', (hm_width - 1) / 2), width=hm_width)
             warr = self.connect_to_tracks(load_decap['g'], tr_id)
             port_dict['bias_load'] = [warr, ]
 
-        # connect differential outputs
-        ptr_idx, ntr_idx = self._get_diffamp_output_track_index(hm_cur_width, diff_space)
         if sign < 0:
             # flip positive/negative wires.
-            p_tr, n_tr = self.connect_differential_tracks(outn_warrs, outp_warrs, self.mos_conn_layer + 1,
-                                                          ptr_idx, ntr_idx, width=hm_cur_width)
-        else:
-            p_tr, n_tr = self.connect_differential_tracks(outp_warrs, outn_warrs, self.mos_conn_layer + 1,
-                                                          ptr_idx, ntr_idx, width=hm_cur_width)
+            outp_warrs, outn_warrs = outn_warrs, outp_warrs
+
+        if conn_batch is not None:
+            # outputs are shared by all Gm stages, connect them later
+            conn_batch.outp_warrs.extend(outp_warrs)
+            conn_batch.outn_warrs.extend(outn_warrs)
+            del port_dict['outp']
+            del port_dict['outn']
+            return fg_amp_tot, port_dict
+
+        # connect differential outputs
+        ptr_idx, ntr_idx = self._get_diffamp_output_track_index(hm_cur_width, diff_space)
+        p_tr, n_tr = self.connect_differential_tracks(outp_warrs, outn_warrs, self.mos_conn_layer + 1,
+                                                      ptr_idx, ntr_idx, width=hm_cur_width)
         port_dict['outp'] = [p_tr, ]
         port_dict['outn'] = [n_tr, ]
 
         return fg_amp_tot, port_dict
 
+    def connect_gm_batch(self, conn_batch, hm_cur_width=1, diff_space=1):
+        # type: (GmConnBatch, int, int) -> Dict[Tuple[str, int], List[WireArray]]
+        """Draw all connections recorded in the given GmConnBatch.
+
+        Each net is connected with a single call over all Gm stages.  The resulting wires span
+        the same extent as connecting each Gm stage separately then merging the wires.
+
+        Parameters
+        ----------
+        conn_batch : GmConnBatch
+            the recorded connections.
+        hm_cur_width : int
+            width of horizontal current-carrying tracks.
+        diff_space : int
+            number of tracks to reserve as space between differential wires.
+
+        Returns
+        -------
+        port_dict : Dict[Tuple[str, int], List[WireArray]]
+            a dictionary from connection name/index pair to the horizontal track associated
+            with the connection.  The index is always -1.
+        """
+        port_dict = {}
+        for sub_type in ('ptap', 'ntap'):
+            warr_list = conn_batch.sub_warrs[sub_type]
+            if warr_list:
+                self.connect_to_substrate(sub_type, warr_list)
+
+        for name, (tr_id, warr_list) in conn_batch.track_warrs.items():
+            port_dict[(name, -1)] = [self.connect_to_tracks(warr_list, tr_id), ]
+
+        if conn_batch.outp_warrs:
+            ptr_idx, ntr_idx = self._get_diffamp_output_track_index(hm_cur_width, diff_space)
+            p_tr, n_tr = self.connect_differential_tracks(conn_batch.outp_warrs, conn_batch.outn_warrs,
+                                                          self.mos_conn_layer + 1, ptr_idx, ntr_idx,
+                                                          width=hm_cur_width)
+            port_dict[('outp', -1)] = [p_tr, ]
+            port_dict[('outn', -1)] = [n_tr, ]
+
+        return port_dict
+
     def draw_gm_summer(self,  # type: SerdesRXBase
                        col_idx,  # type: int
                        fg_load,  # type: int
@@ -1136,7 +1348,11 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
         # print('summer col: %d' % col_idx)
         # print('summer gm offsets: %s' % repr(gm_offsets))
         # draw each Gm stage and load.
-        conn_dict = {'vddt': [], 'bias_load': [], 'outp': [], 'outn': [], 'bias_load_decap': []}
+        # supplies, vddt and outputs of all Gm stages are connected together after the loop.
+        conn_batch = GmConnBatch() if self.batch_gm_conn else None
+        conn_dict = {'bias_load': [], 'bias_load_decap': []}
+        if conn_batch is None:
+            conn_dict.update(vddt=[], outp=[], outn=[])
         port_dict = {}
         for idx, (cur_fg_load, gm_off, gm_fg_dict, sgn, flip_sd, tail_decap, load_decap) in \
                 enumerate(zip(fg_load_list, gm_offsets, gm_fg_list, sgn_list,
@@ -1146,7 +1362,8 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
             _, cur_ports = self.draw_diffamp(col_idx + gm_off, cur_amp_params, hm_width=hm_width,
                                              hm_cur_width=hm_cur_width, diff_space=diff_space,
                                              gate_locs=gate_locs, sign=sgn, flip_sd=flip_sd,
-                                             tail_decap=tail_decap, load_decap=load_decap)
+                                             tail_decap=tail_decap, load_decap=load_decap,
+                                             conn_batch=conn_batch)
 
             # register port
             for name, warr_list in cur_ports.items():
@@ -1167,6 +1384,8 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
                     raise ValueError('%s wire are on different tracks.' % name)
                 port_dict[(name, -1)] = conn_list
 
+        if conn_batch is not None:
+            port_dict.update(self.connect_gm_batch(conn_batch, hm_cur_width=hm_cur_width, diff_space=diff_space))
         return summer_info['fg_tot'], port_dict
 
     def draw_gm_summer_offset(self,  # type: SerdesRXBase
@@ -1237,7 +1456,11 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
         # print('summer col: %d' % col_idx)
         # print('summer gm offsets: %s' % repr(gm_offsets))
         # draw each Gm stage and load.
-        conn_dict = {'vddt': [], 'bias_load': [], 'outp': [], 'outn': [], 'bias_offp': [], 'bias_offn': []}
+        # supplies, vddt and outputs of all Gm stages are connected together after the loop.
+        conn_batch = GmConnBatch() if self.batch_gm_conn else None
+        conn_dict = {'bias_load': [], 'bias_offp': [], 'bias_offn': []}
+        if conn_batch is None:
+            conn_dict.update(vddt=[], outp=[], outn=[])
         port_dict = {}
         for idx, (cur_fg_load, cur_fg_offset, gm_off, gm_fg_dict, sgn) in enumerate(zip(fg_load_list, fg_offset_list,
                                                                                         gm_offsets, gm_fg_list,
@@ -1247,7 +1470,7 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
             cur_amp_params['offset'] = cur_fg_offset
             _, cur_ports = self.draw_diffamp(col_idx + gm_off, cur_amp_params, hm_width=hm_width,
                                              hm_cur_width=hm_cur_width, diff_space=diff_space,
-                                             gate_locs=gate_locs, sign=sgn)
+                                             gate_locs=gate_locs, sign=sgn, conn_batch=conn_batch)
             # register port
             for name, warr_list in cur_ports.items():
                 if name in conn_dict:
@@ -1264,6 +1487,8 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
                     raise ValueError('%s wire are on different tracks.' % name)
                 port_dict[(name, -1)] = conn_list
 
+        if conn_batch is not None:
+            port_dict.update(self.connect_gm_batch(conn_batch, hm_cur_width=hm_cur_width, diff_space=diff_space))
         return summer_info['fg_tot'], port_dict
 
     def draw_rows(self, lch, fg_tot, ptap_w, ntap_w, w_dict, th_dict, **kwargs):
@@ -1324,6 +1549,7 @@ class SerdesRXBase(with_metaclass(abc.ABCMeta, AnalogBase)):
 
         # figure out row indices for each nmos row type,
         # and build nw_list/nth_list
+        self._tid_cache = {}
         self._nrow_idx = {}
         nw_list = []
         nth_list = []
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+########################################################################################################################
+#
+# Copyright (c) 2014, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#   disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#    following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+########################################################################################################################
+"""This module defines ColumnFloorplan, a finger column allocator for SerdesRXBase templates.
+"""
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+# noinspection PyUnresolvedReferences,PyCompatibility
+from builtins import *
+
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from .base import SerdesRXBaseInfo
+
+# maximum number of fixed-point iterations when sizing circuits that share columns.
+max_size_iter = 20
+
+
+def get_gm_sizer(layout_info, fg_params, name='Gm stage'):
+    # type: (SerdesRXBaseInfo, Dict[str, int], str) -> Callable[[int], int]
+    """Returns a function that computes the width of a Gm stage given its minimum number of fingers.
+
+    Parameters
+    ----------
+    layout_info : SerdesRXBaseInfo
+        the SerdesRXBaseInfo object.
+    fg_params : Dict[str, int]
+        the Gm stage number of fingers dictionary.
+    name : str
+        the circuit name, used in error messages.
+
+    Returns
+    -------
+    sizer : Callable[[int], int]
+        a function from minimum number of fingers to total number of fingers.
+    """
+    def sizer(fg_min):
+        new_params = fg_params.copy()
+        new_params['min'] = fg_min
+        return layout_info.get_gm_info(new_params)['fg_tot']
+
+    sizer.name = name
+    return sizer
+
+
+def get_diffamp_sizer(layout_info, fg_params, name='DiffAmp'):
+    # type: (SerdesRXBaseInfo, Dict[str, int], str) -> Callable[[int], int]
+    """Returns a function that computes the width of a DiffAmp given its minimum number of fingers.
+
+    Parameters
+    ----------
+    layout_info : SerdesRXBaseInfo
+        the SerdesRXBaseInfo object.
+    fg_params : Dict[str, int]
+        the DiffAmp number of fingers dictionary.
+    name : str
+        the circuit name, used in error messages.
+
+    Returns
+    -------
+    sizer : Callable[[int], int]
+        a function from minimum number of fingers to total number of fingers.
+    """
+    def sizer(fg_min):
+        new_params = fg_params.copy()
+        new_params['min'] = fg_min
+        return layout_info.get_diffamp_info(new_params)['fg_tot']
+
+    sizer.name = name
+    return sizer
+
+
+def get_sampler_sizer(layout_info, fg_params, name='sampler'):
+    # type: (SerdesRXBaseInfo, Dict[str, int], str) -> Callable[[int], int]
+    """Returns a function that computes the width of a sampler given its minimum number of fingers.
+
+    Parameters
+    ----------
+    layout_info : SerdesRXBaseInfo
+        the SerdesRXBaseInfo object.
+    fg_params : Dict[str, int]
+        the sampler number of fingers dictionary.
+    name : str
+        the circuit name, used in error messages.
+
+    Returns
+    -------
+    sizer : Callable[[int], int]
+        a function from minimum number of fingers to total number of fingers.
+    """
+    def sizer(fg_min):
+        new_params = fg_params.copy()
+        new_params['min'] = fg_min
+        return layout_info.get_sampler_info(new_params)['fg_tot']
+
+    sizer.name = name
+    return sizer
+
+
+class ColumnFloorplan(object):
+    """Allocates transistor finger columns to blocks placed from left to right.
+
+    Each block has a minimum number of fingers, a minimum number of vertical routing tracks
+    it must span, and a list of sizer functions.  A sizer function maps the minimum number of
+    fingers of a circuit to its actual number of fingers.  Circuits sharing the same columns,
+    such as circuits in the top and bottom halves that must be aligned, are sized together, so
+    the block width is the smallest width that all circuits can be sized to.
+
+    Parameters
+    ----------
+    layout_info : SerdesRXBaseInfo
+        the SerdesRXBaseInfo object.
+    route_layer : int
+        the vertical routing layer ID.
+    start_col : int
+        the starting column index.
+    """
+
+    def __init__(self, layout_info, route_layer, start_col=0):
+        # type: (SerdesRXBaseInfo, int, int) -> None
+        self._layout_info = layout_info
+        self._route_layer = route_layer
+        self._cur_col = start_col
+
+    @property
+    def cur_col(self):
+        # type: () -> int
+        """Returns the next free column index."""
+        return self._cur_col
+
+    def tracks_to_fingers(self, num_tracks):
+        # type: (int) -> int
+        """Returns the number of fingers needed to span the given number of routing tracks at the current column.
+
+        Parameters
+        ----------
+        num_tracks : int
+            number of routing tracks.
+
+        Returns
+        -------
+        num_fg : int
+            the number of fingers.
+        """
+        return self._layout_info.num_tracks_to_fingers(self._route_layer, num_tracks, self._cur_col)
+
+    def get_width(self, fg_min=0, num_tracks=0, sizers=None):
+        # type: (int, int, Optional[List[Callable[[int], int]]]) -> int
+        """Compute the width of a block placed at the current column.
+
+        Parameters
+        ----------
+        fg_min : int
+            minimum number of fingers.
+        num_tracks : int
+            minimum number of routing tracks the block must span.
+        sizers : Optional[List[Callable[[int], int]]]
+            list of sizer functions of circuits in this block.
+
+        Returns
+        -------
+        num_fg : int
+            the smallest number of fingers that satisfies all constraints.  All sizer functions
+            return this value given this value as the minimum number of fingers.
+
+        Raises
+        ------
+        ValueError
+            if the circuits cannot be sized to a common width.  This happens when the circuits
+            pad their widths to incompatible multiples.
+        """
+        num_fg = fg_min
+        if num_tracks > 0:
+            num_fg = max(num_fg, self.tracks_to_fingers(num_tracks))
+        if sizers:
+            for _ in range(max_size_iter):
+                new_fg = max((sizer(num_fg) for sizer in sizers))
+                if new_fg == num_fg:
+                    return num_fg
+                num_fg = new_fg
+
+            width_str = ', '.join(('%s = %d' % (getattr(sizer, 'name', 'circuit'), sizer(num_fg))
+                                   for sizer in sizers))
+            raise ValueError('Cannot size circuits to a common width at column %d.  '
+                             'Widths at minimum %d fingers: %s' % (self._cur_col, num_fg, width_str))
+        return num_fg
+
+    def add_block(self, fg_min=0, num_tracks=0, sizers=None):
+        # type: (int, int, Optional[List[Callable[[int], int]]]) -> Tuple[int, int]
+        """Place a block at the current column.
+
+        Parameters
+        ----------
+        fg_min : int
+            minimum number of fingers.
+        num_tracks : int
+            minimum number of routing tracks the block must span.
+        sizers : Optional[List[Callable[[int], int]]]
+            list of sizer functions of circuits in this block.
+
+        Returns
+        -------
+        col_intv : Tuple[int, int]
+            the block column interval.
+        """
+        num_fg = self.get_width(fg_min=fg_min, num_tracks=num_tracks, sizers=sizers)
+        col_intv = (self._cur_col, self._cur_col + num_fg)
+        self._cur_col += num_fg
+        return col_intv
+
+    def add_channel(self, num_tracks):
+        # type: (int) -> Tuple[int, int]
+        """Reserve a routing channel at the current column.
+
+        Parameters
+        ----------
+        num_tracks : int
+            number of routing tracks in the channel.
+
+        Returns
+        -------
+        col_intv : Tuple[int, int]
+            the routing channel column interval.
+        """
+        return self.add_block(num_tracks=num_tracks)
+
+    def add_space(self, num_fg):
+        # type: (int) -> None
+        """Skip the given number of columns.
+
+        Parameters
+        ----------
+        num_fg : int
+            number of fingers to skip.
+        """
+        self._cur_col += num_fg
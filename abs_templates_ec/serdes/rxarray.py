@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+########################################################################################################################
+#
+# Copyright (c) 2014, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#   disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#    following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+########################################################################################################################
+
+"""This module defines a multi-lane RX frontend array."""
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+# noinspection PyUnresolvedReferences,PyCompatibility
+from builtins import *
+
+from typing import Dict, Any, Set
+
+from bag.layout.template import TemplateBase, TemplateDB
+from bag.layout.routing import TrackID
+from bag.layout.util import BBox
+
+from ..analog_core import AnalogBase
+from .rxtop import RXFrontendCore
+
+
+class RXFrontendArray(TemplateBase):
+    """An array of RX frontend lanes.
+
+    The frontend master is built once and placed as a single vertical instance array.
+    Bias nets shared by all lanes are routed on vertical buses in the bias channel on the
+    left edge of each lane, and top level supplies and clocks are merged across lanes.
+    All other ports are exported per lane.
+
+    Parameters
+    ----------
+    temp_db : TemplateDB
+            the template database.
+    lib_name : str
+        the layout library name.
+    params : Dict[str, Any]
+        the parameter values.
+    used_names : Set[str]
+        a set of already used cell names.
+    **kwargs
+        dictionary of optional parameters.  See documentation of
+        :class:`bag.layout.template.TemplateBase` for details.
+    """
+
+    shared_bias_names = ('bias_nmos_analog', 'bias_nmos_digital', 'bias_nmos_summer',
+                         'bias_pmos_analog', 'bias_pmos_digital', 'bias_pmos_summer', )
+    shared_top_names = ('VDD', 'VSS', 'clkp', 'clkn')
+
+    def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
+        # type: (TemplateDB, str, Dict[str, Any], Set[str], **Any) -> None
+        super(RXFrontendArray, self).__init__(temp_db, lib_name, params, used_names, **kwargs)
+
+    @classmethod
+    def get_default_param_values(cls):
+        # type: () -> Dict[str, Any]
+        """Returns a dictionary containing default parameter values.
+
+        Override this method to define default parameter values.  As good practice,
+        you should avoid defining default values for technology-dependent parameters
+        (such as channel length, transistor width, etc.), but only define default
+        values for technology-independent parameters (such as number of tracks).
+
+        Returns
+        -------
+        default_params : Dict[str, Any]
+            dictionary of default parameter values.
+        """
+        return dict(
+            lane_prefix='lane%d_',
+            bus_margin=1,
+            show_pins=True,
+        )
+
+    @classmethod
+    def get_params_info(cls):
+        # type: () -> Dict[str, str]
+        """Returns a dictionary containing parameter descriptions.
+
+        Override this method to return a dictionary from parameter names to descriptions.
+
+        Returns
+        -------
+        param_info : Dict[str, str]
+            dictionary from parameter name to description.
+        """
+        return dict(
+            frontend_params='RXFrontendCore parameters.',
+            num_lanes='number of lanes.',
+            lane_prefix='lane net name prefix format string.  Formatted with the lane index.',
+            bus_margin='number of tracks to save as margins in the bias channel.',
+            show_pins='True to draw pin layouts.',
+        )
+
+    def draw_layout(self):
+        # type: () -> None
+        frontend_params = self.params['frontend_params'].copy()
+        num_lanes = self.params['num_lanes']
+        lane_prefix = self.params['lane_prefix']
+        bus_margin = self.params['bus_margin']
+        show_pins = self.params['show_pins']
+
+        if num_lanes < 1:
+            raise ValueError('num_lanes = %d must be positive.' % num_lanes)
+
+        frontend_params['show_pins'] = False
+        lane_master = self.new_template(params=frontend_params, temp_cls=RXFrontendCore)
+        lane_w, lane_h = self.grid.get_size_dimension(lane_master.size, unit_mode=True)
+
+        lane_inst = self.add_instance(lane_master, 'XLANE', loc=(0, 0), ny=num_lanes, spy=lane_h, unit_mode=True)
+
+        # compute size
+        yt = lane_h * num_lanes
+        self.array_box = BBox(0, 0, lane_master.array_box.right_unit, yt, self.grid.resolution, unit_mode=True)
+        self.size = self.grid.get_size_tuple(lane_master.size[0], lane_w, yt, round_up=True, unit_mode=True)
+
+        self._connect_shared_bias(lane_inst, lane_master, yt, bus_margin)
+        self._connect_top_wires(lane_inst, lane_master.sup_layer, yt)
+
+        # export per-lane ports
+        shared_names = set(self.shared_bias_names)
+        shared_names.update(self.shared_top_names)
+        for port_name in lane_master.port_names_iter():
+            if port_name not in shared_names:
+                for idx in range(num_lanes):
+                    self.reexport(lane_inst.get_port(port_name, row=idx),
+                                  net_name=(lane_prefix % idx) + port_name, show=show_pins)
+
+    def _connect_shared_bias(self, lane_inst, lane_master, yt, bus_margin):
+        show_pins = self.params['show_pins']
+
+        vbus_layer = AnalogBase.get_mos_conn_layer(self.grid.tech_info) + 2
+        num_tracks = lane_master.bias_width // self.grid.get_track_pitch(vbus_layer, unit_mode=True)
+        tr_pitch = 1 + self.grid.get_num_space_tracks(vbus_layer, width_ntr=1)
+        last_track = bus_margin + (len(self.shared_bias_names) - 1) * tr_pitch
+        if last_track + bus_margin >= num_tracks:
+            raise ValueError('Bias channel has %d tracks, cannot fit %d shared bias buses.' %
+                             (num_tracks, len(self.shared_bias_names)))
+
+        # each bias net is one vertical bus spanning all lanes, connected to every lane in a single call
+        for idx, name in enumerate(self.shared_bias_names):
+            tid = TrackID(vbus_layer, bus_margin + idx * tr_pitch)
+            warr = self.connect_to_tracks(lane_inst.get_all_port_pins(name), tid,
+                                          track_lower=0, track_upper=yt, unit_mode=True)
+            self.add_pin(name, warr, show=show_pins)
+
+    def _connect_top_wires(self, lane_inst, sup_layer, yt):
+        show_pins = self.params['show_pins']
+
+        # lane straps stop short of the lane edges, so extend them over the full array height.
+        # straps of all lanes are on the same tracks, so this merges them into single wires.
+        for name in self.shared_top_names:
+            warr_list = self.connect_wires(lane_inst.get_all_port_pins(name, layer=sup_layer),
+                                           lower=0, upper=yt, unit_mode=True)
+            self.add_pin(name, warr_list, show=show_pins, label=name + ':')
+            # lane pins on other layers are not connected by the straps, export them as must connect pins
+            other_list = [warr for warr in lane_inst.get_all_port_pins(name) if warr.layer_id != sup_layer]
+            if other_list:
+                self.add_pin(name, other_list, show=show_pins, label=name + ':')
@@ -29,41 +29,13 @@ from builtins import *
 
 from typing import Dict, Any, Set, Tuple
 
-from bag.layout.template import TemplateBase, TemplateDB
+from bag.layout.template import TemplateDB
 from bag.layout.objects import Instance
-from bag.layout.routing import TrackID
+from bag.layout.routing import TrackID, RoutingGrid
 
 from .base import SerdesRXBase, SerdesRXBaseInfo
-
-
-def connect_to_xm(template, warr_p, warr_n, col_intv, layout_info, sig_widths, sig_spaces, xm_mid_tr):
-    """Connect differential ports to xm layer.
-
-    Returns a list of [even_p, even_n, odd_p, odd_n] WireArrays on xm layer.
-    """
-    vm_width, xm_width = sig_widths
-    vm_space, xm_space = sig_spaces
-    hm_layer_id = layout_info.mconn_port_layer + 1
-    vm_layer_id = hm_layer_id + 1
-    xm_layer_id = vm_layer_id + 1
-
-    # get vm tracks
-    p_tr = layout_info.get_center_tracks(vm_layer_id, 2, col_intv, width=vm_width, space=vm_space)
-    n_tr = p_tr + vm_width + vm_space
-    # step 1B: connect to vm and xm layer
-    vmp, vmn = template.connect_differential_tracks(warr_p, warr_n, vm_layer_id, p_tr, n_tr, width=vm_width)
-    if xm_mid_tr is None:
-        xm_mid_tr = template.grid.coord_to_nearest_track(xm_layer_id, vmp.middle, half_track=True, mode=0)
-    nx_tr = xm_mid_tr - (xm_width + xm_space) / 2
-    px_tr = nx_tr + xm_width + xm_space
-    return template.connect_differential_tracks(vmp, vmn, xm_layer_id, px_tr, nx_tr, width=xm_width)
-
-
-def get_bias_tracks(layout_info, layer_id, col_intv, sig_width, sig_space, clk_width, sig_clk_space):
-    sig_left = layout_info.get_center_tracks(layer_id, 2, col_intv, width=sig_width, space=sig_space)
-    left_tr = sig_left - (sig_width + clk_width) / 2 - sig_clk_space
-    right_tr = sig_left + (sig_width + sig_space) + (sig_width + clk_width) / 2 + sig_clk_space
-    return left_tr, right_tr
+from .floorplan import ColumnFloorplan, get_diffamp_sizer, get_sampler_sizer
+from .rxengine import connect_to_xm, get_bias_tracks, check_bias_wires, RXHalfBase, RXCoreBase
 
 
 class RXHalfTop(SerdesRXBase):
@@ -89,6 +61,7 @@ class RXHalfTop(SerdesRXBase):
         super(RXHalfTop, self).__init__(temp_db, lib_name, params, used_names, **kwargs)
         self.sch_intsum_params = None
         self.sch_summer_params = None
+        self.bias_utilization = None
 
     @classmethod
     def get_default_param_values(cls):
@@ -540,6 +513,8 @@ class RXHalfTop(SerdesRXBase):
 
         clkn_nmos_sw_tr_id = TrackID(xm_layer, clkn_nmos_sw_tr_xm, width=clk_width_xm)
         clkn_nmos_sw_list = []
+        # bias wires placed next to signal tracks, checked for spacing at the end.
+        bias_wires = []
 
         if datapath_parity == 0:
             clkp, clkn = 'clkp', 'clkn'
@@ -598,15 +573,19 @@ class RXHalfTop(SerdesRXBase):
         rtr_id = TrackID(vm_layer, rtr_vm, width=clk_width_vm)
         warr = self.connect_to_tracks(warr, ltr_id, track_lower=0)
         self.add_pin('ibias_nmos_intsum', warr, show=show_pins)
+        bias_wires.append(('ibias_nmos_intsum', warr))
         # pmos intsum, M5 track 2, and clock buffer output
         # also connect intsum nmos switch to this vertical track.
-        pmos_intsum_list.append(self.connect_to_tracks(intsum_ports[('bias_load', -1)], rtr_id))
+        warr = self.connect_to_tracks(intsum_ports[('bias_load', -1)], rtr_id)
+        pmos_intsum_list.append(warr)
+        bias_wires.append((clkp + '_pmos_intsum', warr))
         pmos_intsum_list.append(buf_ports['out'])
         xtr_id = TrackID(xm_layer, clkp_pmos_intsum_tr_xm, width=clk_width_xm)
         warr = self.connect_to_tracks(pmos_intsum_list, xtr_id, min_len_mode=0)
         self.add_pin(clkp + '_pmos_intsum', warr, show=show_pins)
         intsum_sw_warr = self.connect_to_tracks(intsum_sw_warr, rtr_id)
         clkn_nmos_sw_list.append(intsum_sw_warr)
+        bias_wires.append((clkn + '_nmos_switch', intsum_sw_warr))
 
         # connect offset biases/sign control
         intsum_start = intsum_col + intsum_info['gm_offsets'][2]
@@ -619,8 +598,10 @@ class RXHalfTop(SerdesRXBase):
         warr = self.connect_to_tracks(intsum_ports[('bias_casc', 1)] + intsum_ports[('bias_load_decap', -1)],
                                       ltr_id, track_lower=0)
         self.add_pin('bias_ffe', warr, show=show_pins)
+        bias_wires.append(('bias_ffe', warr))
         warr = self.connect_to_tracks(intsum_ports[('bias_tail', 2)], rtr_id, track_lower=0)
         self.add_pin('ibias_offset', warr, show=show_pins)
+        bias_wires.append(('ibias_offset', warr))
         p_tr = layout_info.get_center_tracks(vm_layer, 2, col_intv, width=sig_width_vm, space=sig_space_vm)
         n_tr = p_tr + sig_width_vm + sig_space_vm
         ptr_id = TrackID(vm_layer, p_tr, width=sig_width_vm)
@@ -629,6 +610,8 @@ class RXHalfTop(SerdesRXBase):
         nwarr = self.connect_to_tracks(intsum_ports[('inn', 2)], ntr_id, track_lower=0)
         self.add_pin('offp', pwarr, show=show_pins)
         self.add_pin('offn', nwarr, show=show_pins)
+        bias_wires.append(('offp', pwarr))
+        bias_wires.append(('offn', nwarr))
 
         # connect intsum dfe tap biases
         num_dfe = nmax - 3
@@ -656,10 +639,12 @@ class RXHalfTop(SerdesRXBase):
             bias_tr_id = TrackID(vm_layer, bias_tr_vm, width=clk_width_vm)
             warr = self.connect_to_tracks(intsum_ports[('bias_tail', gm_idx)], bias_tr_id, track_lower=0)
             self.add_pin('ibias_dfe<%d>' % (dfe_idx - 1), warr, show=show_pins)
+            bias_wires.append(('ibias_dfe<%d>' % (dfe_idx - 1), warr))
             # tail switch
             sw_tr_id = TrackID(vm_layer, sw_tr_vm, width=clk_width_vm)
             warr = self.connect_to_tracks(intsum_ports[('sw', gm_idx)], sw_tr_id)
             clkn_nmos_sw_list.append(warr)
+            bias_wires.append((clkn + '_nmos_switch', warr))
 
         # connect summer main tap biases
         summer_col, summer_info = block_info['summer']
@@ -720,6 +705,8 @@ class RXHalfTop(SerdesRXBase):
         warr = self.connect_to_tracks(acn, ntr_id, track_lower=0)
         self.add_pin('bias_dlevn', warr, show=show_pins)
 
+        self.bias_utilization = check_bias_wires(self.grid, vm_layer, bias_wires)
+
 
 class RXHalfBottom(SerdesRXBase):
     """The bottom half of one data path of DDR burst mode RX core.
@@ -743,6 +730,7 @@ class RXHalfBottom(SerdesRXBase):
         # type: (TemplateDB, str, Dict[str, Any], Set[str], **Any) -> None
         super(RXHalfBottom, self).__init__(temp_db, lib_name, params, used_names, **kwargs)
         self.in_xm_track = None
+        self.bias_utilization = None
 
     @classmethod
     def get_default_param_values(cls):
@@ -997,6 +985,8 @@ class RXHalfBottom(SerdesRXBase):
         clkp_nmos_sw_tr_id = TrackID(xm_layer, clkp_nmos_sw_tr_xm, width=clk_width_xm)
         clkn_nmos_sw_tr_id = TrackID(xm_layer, clkn_nmos_sw_tr_xm, width=clk_width_xm)
         clkp_nmos_sw_list, clkn_nmos_sw_list = [], []
+        # bias wires placed next to signal tracks, checked for spacing at the end.
+        bias_wires = []
         clkp_nmos_dig_tr_id = TrackID(xm_layer, clkp_nmos_dig_tr_xm, width=clk_width_xm)
         clkn_nmos_dig_tr_id = TrackID(xm_layer, clkn_nmos_dig_tr_xm, width=clk_width_xm)
         clkp_nmos_dig_list, clkn_nmos_dig_list = [], []
@@ -1024,6 +1014,7 @@ class RXHalfBottom(SerdesRXBase):
         warr = self.connect_to_tracks(integ_ports['bias_tail'], TrackID(vm_layer, nint_idx, width=clk_width_vm),
                                       min_len_mode=1)
         self.add_pin('ibias_nmos_integ', warr, show=show_pins)
+        bias_wires.append(('ibias_nmos_integ', warr))
         # pmos_integ.  export on M5
         pmos_integ_tid = TrackID(vm_layer, integ_pmos_vm_tid, width=clk_width_vm)
         warr = self.connect_to_tracks(integ_ports['bias_load'], pmos_integ_tid)
@@ -1031,6 +1022,7 @@ class RXHalfBottom(SerdesRXBase):
         # nmos_switch
         warr = self.connect_to_tracks(integ_ports['sw'], mtr_id)
         clkn_nmos_sw_list.append(warr)
+        bias_wires.append((clkn + '_nmos_switch', warr))
 
         # connect sampler clock to nmos_switch of integrator
         samp_col, samp_info = block_info['samp']
@@ -1105,9 +1097,11 @@ class RXHalfBottom(SerdesRXBase):
         warr = self.connect_to_tracks(clkn_pmos_dig_list, clkn_pmos_dig_tr_id)
         self.add_pin(clkn + '_pmos_digital', warr, show=show_pins)
 
+        self.bias_utilization = check_bias_wires(self.grid, vm_layer, bias_wires)
+
 
-class RXHalf(TemplateBase):
-    """one data path of DDR burst mode RX core.
+class RXHalf(RXHalfBase):
+    """one data path of DDR burst mode RX core with integrator/sampler analog latches.
 
     Parameters
     ----------
@@ -1127,387 +1121,86 @@ class RXHalf(TemplateBase):
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
         # type: (TemplateDB, str, Dict[str, Any], Set[str], **Any) -> None
         super(RXHalf, self).__init__(temp_db, lib_name, params, used_names, **kwargs)
-        self._fg_tot = 0
-        self._col_idx_dict = None
-        self.in_xm_track = None
-        self.sch_params = None
 
     @classmethod
-    def get_default_param_values(cls):
-        # type: () -> Dict[str, Any]
-        """Returns a dictionary containing default parameter values.
-
-        Override this method to define default parameter values.  As good practice,
-        you should avoid defining default values for technology-dependent parameters
-        (such as channel length, transistor width, etc.), but only define default
-        values for technology-independent parameters (such as number of tracks).
-
-        Returns
-        -------
-        default_params : Dict[str, Any]
-            dictionary of default parameter values.
-        """
-        return dict(
-            th_dict={},
-            gds_space=1,
-            diff_space=1,
-            min_fg_sep=0,
-            nduml=4,
-            ndumr=4,
-            hm_width=1,
-            hm_cur_width=-1,
-            sig_widths=[1, 1],
-            sig_spaces=[1, 1],
-            clk_widths=[1, 1, 1],
-            clk_spaces=[1, 1, 1],
-            sig_clk_spaces=[1, 1],
-            guard_ring_nf=0,
-            show_pins=False,
-            datapath_parity=0,
-        )
-
-    @classmethod
-    def get_params_info(cls):
-        # type: () -> Dict[str, str]
-        """Returns a dictionary containing parameter descriptions.
-
-        Override this method to return a dictionary from parameter names to descriptions.
-
-        Returns
-        -------
-        param_info : Dict[str, str]
-            dictionary from parameter name to description.
-        """
-        return dict(
-            lch='channel length, in meters.',
-            ptap_w='NMOS substrate width, in meters/number of fins.',
-            ntap_w='PMOS substrate width, in meters/number of fins.',
-            w_dict='NMOS/PMOS width dictionary.',
-            th_dict='NMOS/PMOS threshold flavor dictionary.',
-            alat_params_list='Analog latch parameters',
-            intsum_params='Integrator summer parameters.',
-            summer_params='DFE tap-1 summer parameters.',
-            dlat_params_list='Digital latch parameters.',
-            buf_params='integrator clock buffer parameters.',
-            min_fg_sep='Minimum separation between transistors.',
-            nduml='number of dummy fingers on the left.',
-            ndumr='number of dummy fingers on the right.',
-            nac_off='number of off transistors for dlev AC coupling',
-            gds_space='number of tracks reserved as space between gate and drain/source tracks.',
-            diff_space='number of tracks reserved as space between differential tracks.',
-            hm_width='width of horizontal track wires.',
-            hm_cur_width='width of horizontal current track wires. If negative, defaults to hm_width.',
-            sig_widths='signal wire widths on each layer above hm layer.',
-            sig_spaces='signal wire spacing on each layer above hm layer.',
-            clk_widths='clk wire widths on each layer above hm layer.',
-            clk_spaces='clk wire spacing on each layer above hm layer.',
-            sig_clk_spaces='spacing between signal and clk on each layer above hm layer.',
-            guard_ring_nf='Width of the guard ring, in number of fingers.  0 to disable guard ring.',
-            show_pins='True to draw layout pins.',
-            datapath_parity='Parity of the DDR datapath.  Either 0 or 1.',
-        )
-
-    @property
-    def num_fingers(self):
-        # type: () -> int
-        return self._fg_tot
-
-    def get_column_index_table(self):
-        return self._col_idx_dict
-
-    def draw_layout(self):
+    def make_layout_info(cls, grid, params):
+        # type: (RoutingGrid, Dict[str, Any]) -> SerdesRXBaseInfo
         end_mode = 15  # top/bottom end_mode does not matter for SerdesRXBaseInfo
-
-        lch = self.params['lch']
-        guard_ring_nf = self.params['guard_ring_nf']
-        min_fg_sep = self.params['min_fg_sep']
-        mos_conn_layer = SerdesRXBase.get_mos_conn_layer(self.grid.tech_info)
+        mos_conn_layer = SerdesRXBase.get_mos_conn_layer(grid.tech_info)
         top_layer = mos_conn_layer + 3
-        layout_info = SerdesRXBaseInfo(self.grid, lch, guard_ring_nf, top_layer=top_layer,
-                                       end_mode=end_mode, min_fg_sep=min_fg_sep)
-
-        bot_inst, top_inst, col_idx_dict = self.place(layout_info)
-        self.connect(layout_info, bot_inst, top_inst, col_idx_dict)
-        self.draw_xm_supplies(bot_inst, top_inst)
-        self._col_idx_dict = col_idx_dict
+        return SerdesRXBaseInfo(grid, params['lch'], params['guard_ring_nf'], top_layer=top_layer,
+                                end_mode=end_mode, min_fg_sep=params['min_fg_sep'])
 
-    def draw_xm_supplies(self, bot_inst, top_inst):
-        show_pins = self.params['show_pins']
-        # draw xm VDD wire
-        bot_vdd = bot_inst.get_all_port_pins('VDD')[0]
-        top_vdd = top_inst.get_all_port_pins('VDD')[0]
-        hm_layer = bot_vdd.layer_id
-        lower = self.grid.get_wire_bounds(hm_layer, bot_vdd.track_id.base_index, bot_vdd.track_id.width,
-                                          unit_mode=True)[0]
-        upper = self.grid.get_wire_bounds(hm_layer, top_vdd.track_id.base_index, top_vdd.track_id.width,
-                                          unit_mode=True)[1]
-        xm_layer = hm_layer + 2
-        xtr_bot = self.grid.find_next_track(xm_layer, lower, half_track=False, mode=1, unit_mode=True)
-        xtr_top = self.grid.find_next_track(xm_layer, upper, half_track=False, mode=-1, unit_mode=True)
-        xnum_tr = xtr_top - xtr_bot + 1
-        xmid_tr = (xtr_top + xtr_bot) / 2
-        bot_vdd_box = bot_vdd.get_bbox_array(self.grid).base
-        xm_lower = bot_vdd_box.left_unit
-        xm_upper = bot_vdd_box.right_unit
-        warr = self.add_wires(xm_layer, xmid_tr, lower=xm_lower, upper=xm_upper, width=xnum_tr, unit_mode=True)
-        self.add_pin('VDDX', warr, show=show_pins)
-        # draw xm bottom VSS wire
-        bot_vss = bot_inst.get_all_port_pins('VSS')[0]
-        top_vss = top_inst.get_all_port_pins('VSS')[0]
-        upper = self.grid.get_wire_bounds(hm_layer, bot_vss.track_id.base_index, bot_vss.track_id.width,
-                                          unit_mode=True)[1]
-        xtr_top = self.grid.find_next_track(xm_layer, upper, half_track=False, mode=-1, unit_mode=True)
-        xmid_tr = xtr_top - (xnum_tr - 1) / 2
-        warr = self.add_wires(xm_layer, xmid_tr, lower=xm_lower, upper=xm_upper, width=xnum_tr, unit_mode=True)
-        self.add_pin('VSSX', warr, show=show_pins)
-        # draw xm top VSS wire
-        lower = self.grid.get_wire_bounds(hm_layer, top_vss.track_id.base_index, top_vss.track_id.width,
-                                          unit_mode=True)[0]
-        xtr_bot = self.grid.find_next_track(xm_layer, lower, half_track=False, mode=1, unit_mode=True)
-        xtr_top = self.grid.get_num_tracks(self.size, xm_layer) - 1
-        xnum_tr = xtr_top - xtr_bot + 1
-        xmid_tr = (xtr_top + xtr_bot) / 2
-        warr = self.add_wires(xm_layer, xmid_tr, lower=xm_lower, upper=xm_upper, width=xnum_tr, unit_mode=True)
-        self.add_pin('VSSX', warr, show=show_pins)
+    @classmethod
+    def round_up_fg_tot(cls, layout_info, fg_min):
+        # type: (SerdesRXBaseInfo, int) -> int
+        return layout_info.round_up_fg_tot(fg_min)
 
-    def place(self, layout_info):
-        # type: (SerdesRXBaseInfo) -> Tuple[Instance, Instance, Dict[str, Any]]
-        alat_params_list = self.params['alat_params_list']
-        buf_params = self.params['buf_params']
-        intsum_params = self.params['intsum_params']
-        summer_params = self.params['summer_params']
-        dlat_params_list = self.params['dlat_params_list']
-        nduml = self.params['nduml']
-        ndumr = self.params['ndumr']
-        nac_off = self.params['nac_off']
-        sig_width_vm = self.params['sig_widths'][0]
-        sig_space_vm = self.params['sig_spaces'][0]
-        clk_width_vm = self.params['clk_widths'][0]
-        clk_space_vm = self.params['clk_spaces'][0]
-        sig_clk_space_vm = self.params['sig_clk_spaces'][0]
-        # create AnalogBaseInfo object
-        vm_layer_id = layout_info.mconn_port_layer + 2
+    @classmethod
+    def plan_frontend(cls, layout_info, params, floorplan, plan):
+        # type: (SerdesRXBaseInfo, Dict[str, Any], ColumnFloorplan, Dict[str, Any]) -> None
+        alat_params_list = params['alat_params_list']
+        sig_width_vm = params['sig_widths'][0]
+        sig_space_vm = params['sig_spaces'][0]
+        clk_width_vm = params['clk_widths'][0]
+        sig_clk_space_vm = params['sig_clk_spaces'][0]
         dtr_pitch = sig_width_vm + sig_space_vm
         diff_clk_route_tracks = 2 * sig_width_vm + 2 * clk_width_vm + sig_space_vm + 3 * sig_clk_space_vm
+        col_idx_dict = plan['col_idx_dict']
 
-        # compute block locations
-        col_idx_dict = {}
         # step -1: place clock buffers
-        cur_col = nduml
-        new_buf_params = buf_params.copy()
-        new_buf_params['col_idx0'] = cur_col
-        fg_clk_route = layout_info.num_tracks_to_fingers(vm_layer_id, clk_width_vm + clk_space_vm, cur_col)
-        fg0 = max(fg_clk_route, buf_params['fg0'])
-        cur_col += fg0 + fg_clk_route
-        new_buf_params['col_idx1'] = cur_col
-        # find minimum number of integrator frontend fingers and integrator frontend pmos vm track index.
-        fg1 = max(fg_clk_route, buf_params['fg1'])
-        integ_pmos_vm_tid = layout_info.get_center_tracks(vm_layer_id, 1, (cur_col, cur_col + fg1),
-                                                          width=clk_width_vm, space=clk_space_vm)
-        integ_fg_min = cur_col + fg1 - nduml
+        new_buf_params, integ_pmos_vm_tid, integ_fg_min = cls.plan_clock_buffer(layout_info, params)
+
         # step 0: place analog latches 0
-        cur_col = nduml
-        alat0_col_idx = cur_col
-        # print('integ_col: %d' % cur_col)
-        # step 0A: find minimum number of fingers
         alat0_params = {'integ_params': alat_params_list[0]['integ_params'].copy(),
                         'samp_params': alat_params_list[0]['samp_params'].copy()}
         alat1_params = {'integ_params': alat_params_list[1]['integ_params'].copy(),
                         'samp_params': alat_params_list[1]['samp_params'].copy()}
         integ0_params = alat0_params['integ_params']
         integ0_params['integ_pmos_vm_tid'] = integ_pmos_vm_tid
-        integ_fg_min = max(layout_info.num_tracks_to_fingers(vm_layer_id, diff_clk_route_tracks, cur_col),
-                           integ_fg_min)
-        integ0_params['min'] = integ_fg_min
-        integ_info = layout_info.get_diffamp_info(integ0_params)
-        integ0_params['col_idx'] = alat0_col_idx
-        integ0_fg_tot = integ_info['fg_tot']
-        col_idx_dict['alat0'] = (cur_col, cur_col + integ0_fg_tot)
-        cur_col += integ0_fg_tot
+        integ0_params['col_idx'] = floorplan.cur_col
+        integ0_params['min'] = floorplan.get_width(fg_min=integ_fg_min, num_tracks=diff_clk_route_tracks)
+        col_idx_dict['alat0'] = floorplan.add_block(fg_min=integ0_params['min'],
+                                                    sizers=[get_diffamp_sizer(layout_info, integ0_params)])
         # TODO: HACK: add fingers to leave spacing between pmos bias wires
-        cur_col += 6
+        floorplan.add_space(6)
 
-        # step 1: place analog latches 1 and sampler of analog latch 0
-        alat1_col_idx = cur_col
+        # step 1: place analog latches 1 and sampler of analog latch 0.  Both have the same width.
         samp0_params = alat0_params['samp_params']
-        samp0_info = layout_info.get_sampler_info(samp0_params)
-        # step 1A: find minimum number of fingers
-        alat1_fg_min = layout_info.num_tracks_to_fingers(vm_layer_id, 4 * dtr_pitch, cur_col)
-        # step 1B: make both analog latches have the same width
         integ1_params = alat1_params['integ_params']
-        integ1_params['min'] = alat1_fg_min
-        integ1_info = layout_info.get_diffamp_info(integ1_params)
-        alat1_fg_min = max(integ1_info['fg_tot'], samp0_info['fg_tot'])
-        integ1_params['min'] = alat1_fg_min
-        samp0_params['min'] = alat1_fg_min
-        samp0_params['col_idx'] = alat1_col_idx
-        integ1_params['col_idx'] = alat1_col_idx
-        col_idx_dict['alat1'] = (cur_col, cur_col + alat1_fg_min)
-        cur_col += alat1_fg_min
-        # step 1C: reserve sampler space between analog latch and integrator
-        route_alat_intsum_fg = layout_info.num_tracks_to_fingers(vm_layer_id, 2 * dtr_pitch, cur_col)
+        sizers = [get_diffamp_sizer(layout_info, integ1_params, name='alat1 integrator'),
+                  get_sampler_sizer(layout_info, samp0_params, name='alat0 sampler')]
+        alat1_col_intv = floorplan.add_block(num_tracks=4 * dtr_pitch, sizers=sizers)
+        for blk_params in (integ1_params, samp0_params):
+            blk_params['min'] = alat1_col_intv[1] - alat1_col_intv[0]
+            blk_params['col_idx'] = alat1_col_intv[0]
+        col_idx_dict['alat1'] = alat1_col_intv
+        # reserve sampler space between analog latch and integrator
         samp1_params = alat1_params['samp_params']
-        samp1_info = layout_info.get_sampler_info(samp1_params)
-        route_alat_intsum_fg = max(samp1_info['fg_tot'], route_alat_intsum_fg)
-        samp1_params['min'] = route_alat_intsum_fg
-        col_idx_dict['samp1'] = (cur_col, cur_col + route_alat_intsum_fg)
-        samp1_params['col_idx'] = cur_col
-        # print('alat_route_col: %d' % cur_col)
-        cur_col += route_alat_intsum_fg
-
-        # step 2: place intsum and most digital latches
+        samp1_col_intv = floorplan.add_block(num_tracks=2 * dtr_pitch,
+                                             sizers=[get_sampler_sizer(layout_info, samp1_params)])
+        samp1_params['min'] = samp1_col_intv[1] - samp1_col_intv[0]
+        samp1_params['col_idx'] = samp1_col_intv[0]
+        col_idx_dict['samp1'] = samp1_col_intv
         # TODO: HACK: add fingers to leave spacing between samp1 and intsum
-        cur_col += 6
-
-        # assumption: we assume the load/offset fingers < total gm fingers,
-        # so we can use gm_info to determine sizing.
-        intsum_col_idx = cur_col
-        # print('intsum_main_col: %d' % cur_col)
-        col_idx_dict['intsum'] = []
-        col_idx_dict['dlat'] = [(0, 0)] * len(dlat_params_list)
-        intsum_gm_fg_list = intsum_params['gm_fg_list']
-        intsum_gm_sep_list = [layout_info.min_fg_sep] * (len(intsum_gm_fg_list) - 1)
-        # step 2A: place main tap.  No requirements.
-        intsum_main_info = layout_info.get_gm_info(intsum_gm_fg_list[0])
-        new_intsum_gm_fg_list = [intsum_gm_fg_list[0]]
-        cur_col += intsum_main_info['fg_tot']
-        col_idx_dict['intsum'].append((intsum_col_idx, cur_col))
-        cur_col += intsum_gm_sep_list[0]
-        # print('cur_col: %d' % cur_col)
-        # step 2B: place precursor tap.  must fit one differential track + 2 clk route track
-        # print('intsum_pre_col: %d' % cur_col)
-        intsum_pre_col_idx = cur_col
-        intsum_pre_fg_params = intsum_gm_fg_list[1].copy()
-        intsum_pre_fg_min = layout_info.num_tracks_to_fingers(vm_layer_id, diff_clk_route_tracks, cur_col)
-        intsum_pre_fg_params['min'] = intsum_pre_fg_min
-        intsum_pre_info = layout_info.get_gm_info(intsum_pre_fg_params)
-        new_intsum_gm_fg_list.append(intsum_pre_fg_params)
-        cur_col += intsum_pre_info['fg_tot']
-        col_idx_dict['intsum'].append((intsum_pre_col_idx, cur_col))
-        cur_col += intsum_gm_sep_list[1]
-        # step 2B + 0.5: place offset cancellation.   Must fit 3 bias tracks
-        intsum_off_col_idx = cur_col
-        intsum_off_fg_params = intsum_gm_fg_list[2].copy()
-        intsum_off_fg_min = layout_info.num_tracks_to_fingers(vm_layer_id, diff_clk_route_tracks, cur_col)
-        intsum_off_fg_params['min'] = intsum_off_fg_min
-        intsum_off_info = layout_info.get_gm_info(intsum_off_fg_params)
-        new_intsum_gm_fg_list.append(intsum_off_fg_params)
-        cur_col += intsum_off_info['fg_tot']
-        col_idx_dict['intsum'].append((intsum_off_col_idx, cur_col))
-        cur_col += intsum_gm_sep_list[2]
-        # print('cur_col: %d' % cur_col)
-        # step 2C: place intsum DFE taps
-        num_intsum_gm = len(intsum_gm_fg_list)
-        num_dfe = num_intsum_gm - 3 + 1
-        new_dlat_params_list = [None] * len(dlat_params_list)
-        # NOTE: here DFE index start at 1.
-        for idx in range(3, num_intsum_gm):
-            # print('intsum_idx%d_col: %d' % (idx, cur_col))
-            intsum_dfe_fg_params = intsum_gm_fg_list[idx].copy()
-            dfe_idx = num_dfe - (idx - 3)
-            dlat_idx = dfe_idx - 2
-            dig_latch_params = dlat_params_list[dlat_idx].copy()
-            in_route = False
-            num_route_tracks = diff_clk_route_tracks
-            if dfe_idx > 2:
-                # for DFE tap > 2, the intsum Gm stage must align with the corresponding
-                # digital latch.
-                # set digital latch column index
-                if dfe_idx % 2 == 1:
-                    # for odd DFE taps, we have criss-cross signal connections, so fit 2 diff tracks + 2 clk tracks
-                    num_route_tracks = 4 * sig_width_vm + 2 * clk_width_vm + 3 * sig_space_vm + 3 * sig_clk_space_vm
-                    # for odd DFE taps > 3, we need to reserve additional input routing tracks
-                    in_route = dfe_idx > 3
-                else:
-                    # for even DFE taps, we have criss-cross bias connections, so fit 4 clk tracks
-                    num_route_tracks = max(4 * clk_width_vm + 4 * clk_space_vm, num_route_tracks)
-
-                # fit diff tracks and make diglatch and DFE tap have same width
-                intsum_dfe_fg_min = layout_info.num_tracks_to_fingers(vm_layer_id, num_route_tracks, cur_col)
-                dig_latch_params['min'] = intsum_dfe_fg_min
-                dlat_info = layout_info.get_diffamp_info(dig_latch_params)
-                intsum_dfe_fg_params['min'] = dlat_info['fg_tot']
-                intsum_dfe_info = layout_info.get_gm_info(intsum_dfe_fg_params)
-                num_fg = intsum_dfe_info['fg_tot']
-                intsum_dfe_fg_params['min'] = num_fg
-                dig_latch_params['min'] = num_fg
-                dig_latch_params['col_idx'] = cur_col
-                col_idx_dict['dlat'][dlat_idx] = (cur_col, cur_col + num_fg)
-                col_idx_dict['intsum'].append((cur_col, cur_col + num_fg))
-                cur_col += num_fg
-                # print('cur_col: %d' % cur_col)
-                if in_route:
-                    # allocate input route
-                    route_fg_min = layout_info.num_tracks_to_fingers(vm_layer_id, 2 * dtr_pitch, cur_col)
-                    intsum_gm_sep_list[idx] = route_fg_min
-                    col_idx_dict['dlat%d_inroute' % dlat_idx] = (cur_col, cur_col + route_fg_min)
-                    cur_col += route_fg_min
-                    # print('cur_col: %d' % cur_col)
-                else:
-                    cur_col += intsum_gm_sep_list[idx]
-                    # print('cur_col: %d' % cur_col)
-            else:
-                # for DFE tap 2, we have no requirements for digital latch
-                intsum_dfe_fg_min = layout_info.num_tracks_to_fingers(vm_layer_id, num_route_tracks, cur_col)
-                intsum_dfe_fg_params['min'] = intsum_dfe_fg_min
-                intsum_dfe_info = layout_info.get_gm_info(intsum_dfe_fg_params)
-                num_fg = intsum_dfe_info['fg_tot']
-                col_idx_dict['intsum'].append((cur_col, cur_col + num_fg))
-                # no need to add gm sep because this is the last tap.
-                cur_col += num_fg
-                # print('cur_col: %d' % cur_col)
-            # save modified parameters
-            new_dlat_params_list[dlat_idx] = dig_latch_params
-            new_intsum_gm_fg_list.append(intsum_dfe_fg_params)
-        # print('intsum_last_col: %d' % cur_col)
-        # step 2D: reserve routing tracks between intsum and summer
-        route_intsum_sum_fg = layout_info.num_tracks_to_fingers(vm_layer_id, 2 * dtr_pitch, cur_col)
-        col_idx_dict['summer_route'] = (cur_col, cur_col + route_intsum_sum_fg)
-        cur_col += route_intsum_sum_fg
-        # print('summer cur_col: %d' % cur_col)
-
-        # step 3: place DFE summer and first digital latch
-        # assumption: we assume the load fingers < total gm fingers,
-        # so we can use gm_info to determine sizing.
-        summer_col_idx = cur_col
-        col_idx_dict['summer'] = []
-        summer_gm_fg_list = summer_params['gm_fg_list']
-        summer_gm_sep_list = [layout_info.min_fg_sep]
-        # step 3A: place main tap.  No requirements.
-        summer_main_info = layout_info.get_gm_info(summer_gm_fg_list[0])
-        new_summer_gm_fg_list = [summer_gm_fg_list[0]]
-        cur_col += summer_main_info['fg_tot']
-        col_idx_dict['summer'].append((summer_col_idx, cur_col))
-        cur_col += summer_gm_sep_list[0]
-        # print('cur_col: %d' % cur_col)
-        # step 3B: place DFE tap.  must fit two differential tracks
-        summer_dfe_col_idx = cur_col
-        summer_dfe_fg_params = summer_gm_fg_list[1].copy()
-        summer_dfe_fg_min = layout_info.num_tracks_to_fingers(vm_layer_id, 4 * dtr_pitch, cur_col)
-        summer_dfe_fg_params['min'] = summer_dfe_fg_min
-        summer_dfe_info = layout_info.get_gm_info(summer_dfe_fg_params)
-        new_summer_gm_fg_list.append(summer_dfe_fg_params)
-        cur_col += summer_dfe_info['fg_tot']
-        tap1_col_intv = (summer_dfe_col_idx, cur_col)
-        col_idx_dict['summer'].append(tap1_col_intv)
-        # print('cur_col: %d' % cur_col)
-        # step 3C: place first digital latch
-        # only requirement is that the right side line up with summer.
-        dig_latch_params = dlat_params_list[0].copy()
-        new_dlat_params_list[0] = dig_latch_params
-        dlat_info = layout_info.get_diffamp_info(dig_latch_params)
-        dig_latch_params['col_idx'] = cur_col - dlat_info['fg_tot']
-        dig_latch_params['min'] = dlat_info['fg_tot']
-        col_idx_dict['dlat'][0] = (cur_col - dlat_info['fg_tot'], cur_col)
-
-        # step 4: add AC coupling off transistors
-        num_fg = layout_info.num_tracks_to_fingers(vm_layer_id, clk_width_vm * 2 + clk_space_vm * 3, cur_col)
-        num_fg = max(num_fg, 2 * nac_off + layout_info.min_fg_sep * 3)
-        col_idx_dict['acoff'] = (cur_col, cur_col + num_fg)
-        cur_col += num_fg
-
-        # add dummies until we have multiples of block pitch
-        fg_tot = layout_info.round_up_fg_tot(cur_col + ndumr)
+        floorplan.add_space(6)
+
+        plan['buf_params'] = new_buf_params
+        plan['integ_pmos_vm_tid'] = integ_pmos_vm_tid
+        plan['alat0_params'] = alat0_params
+        plan['alat1_params'] = alat1_params
+
+    def place(self, layout_info):
+        # type: (SerdesRXBaseInfo) -> Tuple[Instance, Instance, Dict[str, Any]]
+        buf_params = self.params['buf_params']
+
+        # compute block locations
+        plan = self.get_column_plan(layout_info, self.params)
+        col_idx_dict = plan['col_idx_dict']
+        fg_tot = plan['fg_tot']
+        alat0_params = plan['alat0_params']
+        alat1_params = plan['alat1_params']
+        new_dlat_params_list = plan['dlat_params_list']
         self._fg_tot = fg_tot
 
         # make RXHalfBottom
@@ -1516,7 +1209,7 @@ class RXHalf(TemplateBase):
         bot_params['fg_tot'] = fg_tot
         bot_params['alat_params'] = alat0_params
         bot_params['dlat_params_list'] = new_dlat_params_list
-        bot_params['tap1_col_intv'] = tap1_col_intv
+        bot_params['tap1_col_intv'] = plan['tap1_col_intv']
         bot_params['show_pins'] = False
         bot_master = self.new_template(params=bot_params, temp_cls=RXHalfBottom)
         bot_inst = self.add_instance(bot_master)
@@ -1527,31 +1220,12 @@ class RXHalf(TemplateBase):
                       if key in self.params}
         top_params['fg_tot'] = fg_tot
         top_params['alat_params'] = alat1_params
-        top_params['buf_params'] = new_buf_params
-        top_params['integ_pmos_vm_tid'] = integ_pmos_vm_tid
-        top_params['intsum_params'] = dict(
-            col_idx=intsum_col_idx,
-            fg_load=intsum_params['fg_load'],
-            gm_fg_list=new_intsum_gm_fg_list,
-            gm_sep_list=intsum_gm_sep_list,
-            sgn_list=intsum_params['sgn_list'],
-            flip_sd_list=intsum_params.get('flip_sd_list', None),
-            decap_list=intsum_params.get('decap_list', None),
-            load_decap_list=intsum_params.get('load_decap_list', None),
-        )
-        top_params['summer_params'] = dict(
-            col_idx=summer_col_idx,
-            fg_load=summer_params['fg_load'],
-            gm_fg_list=new_summer_gm_fg_list,
-            gm_sep_list=summer_gm_sep_list,
-            sgn_list=summer_params['sgn_list'],
-        )
-        top_params['acoff_params'] = dict(
-            col_intv=col_idx_dict['acoff'],
-            nac_off=nac_off,
-        )
+        top_params['buf_params'] = plan['buf_params']
+        top_params['integ_pmos_vm_tid'] = plan['integ_pmos_vm_tid']
+        top_params['intsum_params'] = plan['intsum_params']
+        top_params['summer_params'] = plan['summer_params']
+        top_params['acoff_params'] = plan['acoff_params']
         top_params['show_pins'] = False
-        # print('top summer col: %d' % top_params['summer_params']['col_idx'])
         top_master = self.new_template(params=top_params, temp_cls=RXHalfTop)
         top_inst = self.add_instance(top_master, orient='MX')
         top_inst.move_by(dy=bot_inst.array_box.top - top_inst.array_box.bottom)
@@ -1592,15 +1266,6 @@ class RXHalf(TemplateBase):
             )
             sch_alat_list.append(dict(integ_params=sch_integ_params, samp_params=sch_samp_params))
 
-        sch_dlat_list = []
-        for dlat_params in new_dlat_params_list:
-            sch_dlat_list.append(dict(
-                fg_dict={key: dlat_params[key] for key in mos_types if key in dlat_params},
-                fg_tot=dlat_params['min'],
-                flip_sd=dlat_params.get('flip_sd', False),
-                decap=dlat_params.get('decap', False),
-            ))
-
         self.sch_params = dict(
             lch=self.params['lch'],
             w_dict=w_dict,
@@ -1609,20 +1274,15 @@ class RXHalf(TemplateBase):
             alat_params_list=sch_alat_list,
             intsum_params=top_master.sch_intsum_params.copy(),
             summer_params=top_master.sch_summer_params.copy(),
-            dlat_params_list=sch_dlat_list,
+            dlat_params_list=self.get_dlat_sch_params(new_dlat_params_list),
             buf_params={key: buf_params[key] for key in ['nmos_type', 'fg0', 'fg1']},
             fg_tot=fg_tot,
         )
 
         return bot_inst, top_inst, col_idx_dict
 
-    def connect(self, layout_info, bot_inst, top_inst, col_idx_dict):
-        vm_space = self.params['sig_spaces'][0]
-        hm_layer = layout_info.mconn_port_layer + 1
-        vm_layer = hm_layer + 1
-        vm_width = self.params['sig_widths'][0]
-        nintsum = len(self.params['intsum_params']['gm_fg_list'])
-
+    def connect_frontend(self, layout_info, bot_inst, top_inst, col_idx_dict):
+        # type: (SerdesRXBaseInfo, Instance, Instance, Dict[str, Any]) -> None
         # connect clkp of integrators
         clk_prefix = 'clkp' if self.params['datapath_parity'] == 0 else 'clkn'
         clkpb = bot_inst.get_all_port_pins(clk_prefix + 'd')
@@ -1631,57 +1291,9 @@ class RXHalf(TemplateBase):
         self.connect_wires([warr] + clkpt)
         self.add_pin(clk_prefix + 'd', clkpb, show=self.params['show_pins'])
 
-        # connect intsum to summer
-        self._connect_diff_io(top_inst, col_idx_dict['summer_route'], layout_info, vm_layer,
-                              vm_width, vm_space, 'intsum_out{}', 'summer_in{}<0>')
-
-        # connect DFE tap 2
-        route_col_intv = col_idx_dict['intsum'][-1]
-        ptr_idx = layout_info.get_center_tracks(vm_layer, 2, route_col_intv, width=vm_width, space=vm_space)
-        ntr_idx = ptr_idx + vm_space + vm_width
-        p_list = [bot_inst.get_port('dlat0_outp').get_pins()[0],
-                  top_inst.get_port('intsum_inp<%d>' % (nintsum - 1)).get_pins()[0], ]
-        n_list = [bot_inst.get_port('dlat0_outn').get_pins()[0],
-                  top_inst.get_port('intsum_inn<%d>' % (nintsum - 1)).get_pins()[0], ]
-        if nintsum > 4:
-            p_list.append(bot_inst.get_port('dlat1_inp').get_pins()[0])
-            n_list.append(bot_inst.get_port('dlat1_inn').get_pins()[0])
-
-        self.connect_differential_tracks(p_list, n_list, vm_layer, ptr_idx, ntr_idx, width=vm_width)
-
-        # connect even DFE taps
-        ndfe = nintsum - 3 + 1
-        for dfe_idx in range(4, ndfe + 1, 2):
-            dlat_idx = dfe_idx - 2
-            intsum_idx = nintsum - 1 - dlat_idx
-            route_col_intv = col_idx_dict['intsum'][intsum_idx]
-            ptr_idx = layout_info.get_center_tracks(vm_layer, 2, route_col_intv, width=vm_width, space=vm_space)
-            ntr_idx = ptr_idx + vm_space + vm_width
-            p_list = [bot_inst.get_port('dlat%d_outp' % (dfe_idx - 2)).get_pins()[0],
-                      top_inst.get_port('intsum_inp<%d>' % intsum_idx).get_pins()[0], ]
-            n_list = [bot_inst.get_port('dlat%d_outn' % (dfe_idx - 2)).get_pins()[0],
-                      top_inst.get_port('intsum_inn<%d>' % intsum_idx).get_pins()[0], ]
-            self.connect_differential_tracks(p_list, n_list, vm_layer, ptr_idx, ntr_idx, width=vm_width)
-            if dfe_idx + 1 <= ndfe:
-                # connect to next digital latch
-                self._connect_diff_io(bot_inst, col_idx_dict['dlat%d_inroute' % (dfe_idx - 1)],
-                                      layout_info, vm_layer, vm_width, vm_space,
-                                      'dlat%d_out{}' % (dfe_idx - 2), 'dlat%d_in{}' % (dfe_idx - 1))
-
-    def _connect_diff_io(self, inst, route_col_intv, layout_info, vm_layer, vm_width, vm_space,
-                         out_name, in_name):
-        ptr_idx = layout_info.get_center_tracks(vm_layer, 2, route_col_intv, width=vm_width, space=vm_space)
-        ntr_idx = ptr_idx + vm_space + vm_width
-        p_warrs = [inst.get_port(out_name.format('p')).get_pins()[0],
-                   inst.get_port(in_name.format('p')).get_pins()[0], ]
-        n_warrs = [inst.get_port(out_name.format('n')).get_pins()[0],
-                   inst.get_port(in_name.format('n')).get_pins()[0], ]
-        self.connect_differential_tracks(p_warrs, n_warrs, vm_layer, ptr_idx, ntr_idx,
-                                         width=vm_width)
-
-
-class RXCore(TemplateBase):
-    """one data path of DDR burst mode RX core.
+
+class RXCore(RXCoreBase):
+    """DDR burst mode RX core with integrator/sampler analog latches.
 
     Parameters
     ----------
@@ -1698,353 +1310,19 @@ class RXCore(TemplateBase):
         :class:`bag.layout.template.TemplateBase` for details.
     """
 
+    half_cls = RXHalf
+    in_route_key = 'alat0'
+    alat_route_key = 'alat1'
+    clk_top_list = [('clk1', 1),
+                    ('clk2', 2),
+                    ('pmos_digital', 2),
+                    ('nmos_digital', 1),
+                    ('pmos_summer', 2),
+                    ('nmos_summer', 1),
+                    ('nmos_tap1', 1),
+                    ]
+    local_clk_names = ('clkpd', 'clknd')
+
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
         # type: (TemplateDB, str, Dict[str, Any], Set[str], **Any) -> None
         super(RXCore, self).__init__(temp_db, lib_name, params, used_names, **kwargs)
-        self._fg_tot = 0
-        self._in_xm_offset = None
-        self._sch_params = None
-
-    @classmethod
-    def get_default_param_values(cls):
-        # type: () -> Dict[str, Any]
-        """Returns a dictionary containing default parameter values.
-
-        Override this method to define default parameter values.  As good practice,
-        you should avoid defining default values for technology-dependent parameters
-        (such as channel length, transistor width, etc.), but only define default
-        values for technology-independent parameters (such as number of tracks).
-
-        Returns
-        -------
-        default_params : Dict[str, Any]
-            dictionary of default parameter values.
-        """
-        return dict(
-            th_dict={},
-            gds_space=1,
-            min_fg_sep=0,
-            nduml=4,
-            ndumr=4,
-            diff_space=1,
-            hm_width=1,
-            hm_cur_width=-1,
-            sig_widths=[1, 1],
-            sig_spaces=[1, 1],
-            clk_widths=[1, 1, 1],
-            clk_spaces=[1, 1, 1],
-            sig_clk_spaces=[1, 1],
-            show_pins=True,
-            rename_dict={},
-            guard_ring_nf=0,
-        )
-
-    @classmethod
-    def get_params_info(cls):
-        # type: () -> Dict[str, str]
-        """Returns a dictionary containing parameter descriptions.
-
-        Override this method to return a dictionary from parameter names to descriptions.
-
-        Returns
-        -------
-        param_info : Dict[str, str]
-            dictionary from parameter name to description.
-        """
-        return dict(
-            lch='channel length, in meters.',
-            ptap_w='NMOS substrate width, in meters/number of fins.',
-            ntap_w='PMOS substrate width, in meters/number of fins.',
-            w_dict='NMOS/PMOS width dictionary.',
-            th_dict='NMOS/PMOS threshold flavor dictionary.',
-            alat_params_list='Analog latch parameters',
-            intsum_params='Integrator summer parameters.',
-            summer_params='DFE tap-1 summer parameters.',
-            dlat_params_list='Digital latch parameters.',
-            buf_params='Integrator clock buffer parameters.',
-            nac_off='Number of off transistors for dlev AC coupling',
-            min_fg_sep='Minimum separation between transistors.',
-            nduml='number of dummy fingers on the left.',
-            ndumr='number of dummy fingers on the right.',
-            gds_space='number of tracks reserved as space between gate and drain/source tracks.',
-            diff_space='number of tracks reserved as space between differential tracks.',
-            hm_width='width of horizontal track wires.',
-            hm_cur_width='width of horizontal current track wires. If negative, defaults to hm_width.',
-            sig_widths='signal wire widths on each layer above hm layer.',
-            sig_spaces='signal wire spacing on each layer above hm layer.',
-            clk_widths='clk wire widths on each layer above hm layer.',
-            clk_spaces='clk wire spacing on each layer above hm layer.',
-            sig_clk_spaces='spacing between signal and clk on each layer above hm layer.',
-            show_pins='True to create pin labels.',
-            rename_dict='port renaming dictionary',
-            guard_ring_nf='Width of the guard ring, in number of fingers.  0 to disable guard ring.',
-        )
-
-    @property
-    def num_fingers(self):
-        # type: () -> int
-        return self._fg_tot
-
-    @property
-    def in_offset(self):
-        # type: () -> int
-        return self._in_xm_offset
-
-    @property
-    def sch_params(self):
-        # type: () -> Dict[str, Any]
-        return self._sch_params
-
-    def draw_layout(self):
-        half_params = self.params.copy()
-        half_params['datapath_parity'] = 0
-        half_params['show_pins'] = False
-        even_master = self.new_template(params=half_params, temp_cls=RXHalf)
-        half_params['datapath_parity'] = 1
-        half_params['show_pins'] = False
-        odd_master = self.new_template(params=half_params, temp_cls=RXHalf)
-        odd_inst = self.add_instance(odd_master, 'X1', orient='MX')
-        odd_inst.move_by(dy=odd_master.bound_box.height)
-        even_inst = self.add_instance(even_master, 'X0')
-        even_inst.move_by(dy=odd_inst.array_box.top - even_inst.array_box.bottom)
-
-        self._sch_params = odd_master.sch_params
-
-        self.array_box = odd_inst.array_box.merge(even_inst.array_box)
-        self.set_size_from_array_box(even_master.size[0])
-        self._fg_tot = even_master.num_fingers
-
-        col_idx_dict = even_master.get_column_index_table()
-        inst_list = [even_inst, odd_inst]
-        lch = self.params['lch']
-        guard_ring_nf = self.params['guard_ring_nf']
-        min_fg_sep = self.params['min_fg_sep']
-        layout_info = SerdesRXBaseInfo(self.grid, lch, guard_ring_nf, min_fg_sep=min_fg_sep)
-        self.connect_signal(inst_list, col_idx_dict, layout_info)
-        self.connect_bias(inst_list)
-        self.connect_supplies(inst_list)
-
-    def connect_signal(self, inst_list, col_idx_dict, layout_info):
-        hm_layer_id = layout_info.mconn_port_layer + 1
-        vm_layer_id = hm_layer_id + 1
-        xm_layer_id = vm_layer_id + 1
-        vm_space = self.params['sig_spaces'][0]
-        vm_width = self.params['sig_widths'][0]
-        vm_pitch = vm_width + vm_space
-        show_pins = self.params['show_pins']
-
-        # connect inputs of even and odd paths
-        route_col_intv = col_idx_dict['alat0']
-        ptr_idx = layout_info.get_center_tracks(vm_layer_id, 2, route_col_intv, width=vm_width, space=vm_space)
-        vm_sig_clk_space = self.params['sig_clk_spaces'][0]
-        vm_clk_width = self.params['clk_widths'][0]
-        ptr_idx -= vm_sig_clk_space + (vm_space + vm_clk_width) / 2 + vm_width
-        ports = ['integ_in{}']
-        inp, inn = self._connect_differential(inst_list, ptr_idx, vm_layer_id, vm_width, vm_space,
-                                              ports, ports)
-        in_xm_track = inst_list[0].master.in_xm_track
-        inp_track = inst_list[0].translate_master_track(xm_layer_id, in_xm_track)
-        inn_track = inst_list[1].translate_master_track(xm_layer_id, in_xm_track)
-        self._in_xm_offset = (inp_track - inn_track) / 2
-
-        inp, inn = self.connect_differential_tracks(inp, inn, xm_layer_id, inp_track, inn_track,
-                                                    width=self.params['sig_widths'][1])
-        # export inputs/outputs
-        self.add_pin('inp', inp, show=show_pins)
-        self.add_pin('inn', inn, show=show_pins)
-        for idx, prefix in ((0, 'even'), (1, 'odd')):
-            for pname, oname in (('summer', 'summer'), ('dlev', 'dlev'), ('integ', 'intamp'), ('intsum', 'intsum')):
-                self.reexport(inst_list[idx].get_port('%s_outp' % pname),
-                              net_name='outp_%s<%d>' % (oname, idx), show=show_pins)
-                self.reexport(inst_list[idx].get_port('%s_outn' % pname),
-                              net_name='outn_%s<%d>' % (oname, idx), show=show_pins)
-            for pname, num in (('alat', 2), ('dlat', 3)):
-                for pidx in range(num):
-                    pport = inst_list[idx].get_port('%s%d_outp' % (pname, pidx))
-                    nport = inst_list[idx].get_port('%s%d_outn' % (pname, pidx))
-                    self.reexport(pport, net_name='%s_outp_%s<%d>' % (prefix, pname, pidx), show=show_pins)
-                    self.reexport(nport, net_name='%s_outn_%s<%d>' % (prefix, pname, pidx), show=show_pins)
-
-        # connect alat0 outputs
-        route_col_intv = col_idx_dict['alat1']
-        ptr_idx = layout_info.get_center_tracks(vm_layer_id, 4, route_col_intv, width=vm_width, space=vm_space)
-        tr_idx_list = [ptr_idx, ptr_idx + vm_pitch, ptr_idx + 2 * vm_pitch, ptr_idx + 3 * vm_pitch]
-        warr_list_list = [[inst_list[0].get_port('alat0_outp').get_pins()[0],
-                           inst_list[0].get_port('alat1_inp').get_pins()[0],
-                           inst_list[1].get_port('ffe_inp').get_pins()[0],
-                           ],
-                          [inst_list[0].get_port('alat0_outn').get_pins()[0],
-                           inst_list[0].get_port('alat1_inn').get_pins()[0],
-                           inst_list[1].get_port('ffe_inn').get_pins()[0],
-                           ],
-                          [inst_list[1].get_port('alat0_outp').get_pins()[0],
-                           inst_list[1].get_port('alat1_inp').get_pins()[0],
-                           inst_list[0].get_port('ffe_inp').get_pins()[0],
-                           ],
-                          [inst_list[1].get_port('alat0_outn').get_pins()[0],
-                           inst_list[1].get_port('alat1_inn').get_pins()[0],
-                           inst_list[0].get_port('ffe_inn').get_pins()[0],
-                           ], ]
-        self.connect_matching_tracks(warr_list_list, vm_layer_id, tr_idx_list, width=vm_width)
-        # connect summer outputs
-        route_col_intv = col_idx_dict['summer'][1]
-        ptr_idx = layout_info.get_center_tracks(vm_layer_id, 4, route_col_intv, width=vm_width, space=vm_space)
-        ports0 = ['summer_out{}', 'dlat0_in{}']
-        ports1 = ['summer_in{}<1>']
-        self._connect_differential(inst_list, ptr_idx, vm_layer_id, vm_width, vm_space,
-                                   ports0, ports1)
-        ptr_idx += 2 * vm_pitch
-        self._connect_differential(inst_list, ptr_idx, vm_layer_id, vm_width, vm_space,
-                                   ports1, ports0)
-
-        # connect dlat1 outputs
-        route_col_intv = col_idx_dict['dlat'][1]
-        ptr_idx = layout_info.get_center_tracks(vm_layer_id, 4, route_col_intv, width=vm_width, space=vm_space)
-        tr_idx_list = [ptr_idx, ptr_idx + vm_width + vm_space]
-        warr_list_list = [[inst_list[0].get_port('dlat1_outp').get_pins()[0],
-                           inst_list[0].get_port('dlat2_inp').get_pins()[0],
-                           inst_list[1].get_port('intsum_inp<4>').get_pins()[0],
-                           ],
-                          [inst_list[0].get_port('dlat1_outn').get_pins()[0],
-                           inst_list[0].get_port('dlat2_inn').get_pins()[0],
-                           inst_list[1].get_port('intsum_inn<4>').get_pins()[0],
-                           ], ]
-        self.connect_matching_tracks(warr_list_list, vm_layer_id, tr_idx_list, width=vm_width)
-        tr_idx_list[0] += 2 * vm_pitch
-        tr_idx_list[1] += 2 * vm_pitch
-        warr_list_list = [[inst_list[1].get_port('dlat1_outp').get_pins()[0],
-                           inst_list[1].get_port('dlat2_inp').get_pins()[0],
-                           inst_list[0].get_port('intsum_inp<4>').get_pins()[0],
-                           ],
-                          [inst_list[1].get_port('dlat1_outn').get_pins()[0],
-                           inst_list[1].get_port('dlat2_inn').get_pins()[0],
-                           inst_list[0].get_port('intsum_inn<4>').get_pins()[0],
-                           ], ]
-        self.connect_matching_tracks(warr_list_list, vm_layer_id, tr_idx_list, width=vm_width)
-
-    def connect_bias(self, inst_list):
-        show_pins = self.params['show_pins']
-        clk_top_list = [('clk1', 1),
-                        ('clk2', 2),
-                        ('pmos_digital', 2),
-                        ('nmos_digital', 1),
-                        ('pmos_summer', 2),
-                        ('nmos_summer', 1),
-                        ('nmos_tap1', 1),
-                        ]
-
-        clk_ports = {'clk1': ['nmos_switch_alat1'], 'clk2': ['nmos_switch']}
-        clk_wires = {}
-        for inst in inst_list:
-            for name in inst.port_names_iter():
-                if name.startswith('clk') and name != 'clkpd' and name != 'clknd':
-                    if name not in clk_wires:
-                        clk_wires[name] = []
-                    clk_wires[name].extend(inst.get_all_port_pins(name))
-
-        for name in ['clkpd', 'clknd']:
-            self.connect_wires(inst_list[0].get_all_port_pins(name) + inst_list[1].get_all_port_pins(name))
-
-        for base_name, _ in clk_top_list:
-            if base_name.startswith('clk'):
-                pwires = []
-                nwires = []
-                for clk_port_name in clk_ports[base_name]:
-                    pwires.extend(clk_wires.pop('clkp_' + clk_port_name))
-                    nwires.extend(clk_wires.pop('clkn_' + clk_port_name))
-                pname = 'clkp'
-                nname = 'clkn'
-                labelp = 'clkp:'
-                labeln = 'clkn:'
-            else:
-                pname = 'clkp_' + base_name
-                nname = 'clkn_' + base_name
-                pwires = self.connect_wires(clk_wires.pop(pname))
-                nwires = self.connect_wires(clk_wires.pop(nname))
-                if base_name == 'nmos_tap1':
-                    pname = 'even_' + pname
-                    nname = 'odd_' + nname
-                labelp = pname + ':'
-                labeln = nname + ':'
-
-            self.add_pin(pname, pwires, label=labelp, show=show_pins)
-            self.add_pin(nname, nwires, label=labeln, show=show_pins)
-
-        for name, wires in clk_wires.items():
-            self.add_pin(name, wires, show=show_pins)
-
-        num_dfe = len(self.params['intsum_params']['gm_fg_list']) - 3 + 1
-        for inst, prefix in zip(inst_list, ('even_', 'odd_')):
-            for pname in ('bias_ffe', 'bias_dlevp', 'bias_dlevn',
-                          'ibias_nmos_integ', 'ibias_nmos_intsum', 'ibias_offset',
-                          'offp', 'offn'):
-                if inst.has_port(pname):
-                    self.reexport(inst.get_port(pname), net_name=prefix + pname, show=show_pins)
-            for idx in range(num_dfe):
-                if idx == 0:
-                    self.reexport(inst.get_port('en_dfe1'), net_name=prefix + 'en_dfe1', show=show_pins)
-                else:
-                    pname = 'ibias_dfe<%d>' % idx
-                    self.reexport(inst.get_port(pname), net_name=prefix + pname, show=show_pins)
-
-    def connect_supplies(self, inst_list):
-        show_pins = self.params['show_pins']
-
-        vdd_warrs, vss_warrs = [], []
-        vddx_warrs, vssx_warrs = [], []
-        for inst in inst_list:
-            vdd_warrs.extend(inst.get_all_port_pins('VDD'))
-            vss_warrs.extend(inst.get_all_port_pins('VSS'))
-            vddx_warrs.extend(inst.get_all_port_pins('VDDX'))
-            vssx_warrs.extend(inst.get_all_port_pins('VSSX'))
-
-        vddx_warrs = self.connect_wires(vddx_warrs)
-        vssx_warrs = self.connect_wires(vssx_warrs)
-
-        # connect X layer supplies to lower supplies
-        hm_layer = vdd_warrs[0].layer_id
-        vm_layer = hm_layer + 1
-        xm_layer = vm_layer + 1
-        hw = vdd_warrs[0].track_id.width
-        vidx_list = list(range(self.grid.get_num_tracks(self.size, vm_layer)))
-        margin = int(round(0.5 / self.grid.resolution))
-        for xwires, hwires in zip([vddx_warrs, vssx_warrs], [vdd_warrs, vss_warrs]):
-            for xwarr in xwires:
-                xtid = xwarr.track_id
-                xw = xtid.width
-                for xidx in xtid:
-                    # get all hm wires to connect to this one
-                    xlower, xupper = self.grid.get_wire_bounds(xm_layer, xidx, width=xw, unit_mode=True)
-                    hidx_list = []
-                    for hwarr in hwires:
-                        for hidx in hwarr.track_id:
-                            hlower, hupper = self.grid.get_wire_bounds(hm_layer, hidx, width=hw, unit_mode=True)
-                            if hlower >= xlower and hupper <= xupper:
-                                hidx_list.append(hidx)
-                    # get all available vm wires to use as vias
-                    avail_list = self.get_available_tracks(vm_layer, vidx_list, xlower, xupper,
-                                                           width=1, margin=margin, unit_mode=True)
-                    # connect
-                    vm_warr_list = []
-                    for vidx in avail_list:
-                        vm_warr_list.append(self.add_wires(vm_layer, vidx, xlower, xupper, unit_mode=True))
-                    self.connect_to_tracks(vm_warr_list, TrackID(xm_layer, xidx, width=xw))
-                    for hidx in hidx_list:
-                        self.connect_to_tracks(vm_warr_list, TrackID(hm_layer, hidx, width=hw))
-
-        self.add_pin('VDD', vddx_warrs, label='VDD:', show=show_pins)
-        self.add_pin('VSS', vssx_warrs, label='VSS:', show=show_pins)
-
-    def _connect_differential(self, inst_list, ptr_idx, vm_layer_id, vm_width, vm_space, even_ports, odd_ports):
-        tr_idx_list = [ptr_idx, ptr_idx + vm_width + vm_space]
-        warr_list_list = [[], []]
-        for parity, warr_list in zip(('p', 'n'), warr_list_list):
-            inst = inst_list[0]
-            for name_fmt in even_ports:
-                warr_list.append(inst.get_port(name_fmt.format(parity)).get_pins()[0])
-            inst = inst_list[1]
-            for name_fmt in odd_ports:
-                warr_list.append(inst.get_port(name_fmt.format(parity)).get_pins()[0])
-
-        trp, trn = self.connect_matching_tracks(warr_list_list, vm_layer_id, tr_idx_list, width=vm_width)
-        return trp, trn
@@ -0,0 +1,1097 @@
+# -*- coding: utf-8 -*-
+########################################################################################################################
+#
+# Copyright (c) 2014, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#   disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#    following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+########################################################################################################################
+"""This module defines the placement and routing engine shared by all DDR burst mode RX core variants.
+
+The RX core variants differ only in the analog frontend stage (integrating frontend or
+integrator/sampler analog latches).  Each variant subclasses RXHalfBase and RXCoreBase and
+implements the frontend hooks, while intsum/summer/digital latch placement, DFE tap routing,
+bias export and supply routing live here.
+"""
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+# noinspection PyUnresolvedReferences,PyCompatibility
+from builtins import *
+from future.utils import with_metaclass
+
+import abc
+import copy
+import math
+from typing import Dict, Any, Set, Tuple, List, Iterable
+
+from bag.layout.template import TemplateBase, TemplateDB
+from bag.layout.objects import Instance
+from bag.layout.routing import TrackID, RoutingGrid, WireArray
+
+from ..routing_util import to_hashable, get_grid_fingerprint, PortIndex, TrackAllocator
+from .base import SerdesRXBaseInfo
+from .floorplan import ColumnFloorplan, get_gm_sizer, get_diffamp_sizer
+
+# RXHalf column floorplans, keyed by RXHalf class, routing grid fingerprint and floorplan parameters.
+_column_plan_cache = {}  # type: Dict[Any, Dict[str, Any]]
+
+
+def connect_to_xm(template, warr_p, warr_n, col_intv, layout_info, sig_widths, sig_spaces, xm_mid_tr):
+    """Connect differential ports to xm layer.
+
+    Returns a list of [even_p, even_n, odd_p, odd_n] WireArrays on xm layer.
+    """
+    vm_width, xm_width = sig_widths
+    vm_space, xm_space = sig_spaces
+    hm_layer_id = layout_info.mconn_port_layer + 1
+    vm_layer_id = hm_layer_id + 1
+    xm_layer_id = vm_layer_id + 1
+
+    # get vm tracks
+    p_tr = layout_info.get_center_tracks(vm_layer_id, 2, col_intv, width=vm_width, space=vm_space)
+    n_tr = p_tr + vm_width + vm_space
+    # step 1B: connect to vm and xm layer
+    vmp, vmn = template.connect_differential_tracks(warr_p, warr_n, vm_layer_id, p_tr, n_tr, width=vm_width)
+    if xm_mid_tr is None:
+        xm_mid_tr = template.grid.coord_to_nearest_track(xm_layer_id, vmp.middle, half_track=True, mode=0)
+    nx_tr = xm_mid_tr - (xm_width + xm_space) / 2
+    px_tr = nx_tr + xm_width + xm_space
+    return template.connect_differential_tracks(vmp, vmn, xm_layer_id, px_tr, nx_tr, width=xm_width)
+
+
+def get_bias_tracks(layout_info, layer_id, col_intv, sig_width, sig_space, clk_width, sig_clk_space):
+    sig_left = layout_info.get_center_tracks(layer_id, 2, col_intv, width=sig_width, space=sig_space)
+    left_tr = sig_left - (sig_width + clk_width) / 2 - sig_clk_space
+    right_tr = sig_left + (sig_width + sig_space) + (sig_width + clk_width) / 2 + sig_clk_space
+    return left_tr, right_tr
+
+
+def check_bias_wires(grid, layer_id, net_wires):
+    # type: (RoutingGrid, int, Iterable[Tuple[str, WireArray]]) -> float
+    """Check that hand-placed bias wires on the given layer honor the track spacing rules.
+
+    Wires of the same net may overlap each other.
+
+    Parameters
+    ----------
+    grid : RoutingGrid
+        the RoutingGrid object.
+    layer_id : int
+        the routing layer ID.  Wires on other layers are ignored.
+    net_wires : Iterable[Tuple[str, WireArray]]
+        list of (net name, wire) tuples.
+
+    Returns
+    -------
+    utilization : float
+        the fraction of the routing area spanned by the given wires that is occupied.
+    """
+    net_names = []
+    net_table = {}
+    for net_name, warr in net_wires:
+        if warr.layer_id == layer_id:
+            if net_name not in net_table:
+                net_names.append(net_name)
+                net_table[net_name] = []
+            net_table[net_name].append(warr)
+
+    if not net_names:
+        return 0.0
+
+    res = grid.resolution
+    track_alloc = TrackAllocator(grid, layer_id)
+    tr_lower = lower = None
+    tr_upper = upper = None
+    for net_name in net_names:
+        warr_list = net_table[net_name]
+        # check all wires of this net before reserving any of them, so wires of the same net can overlap
+        for warr in warr_list:
+            tid = warr.track_id
+            wl = int(round(warr.lower / res))
+            wu = int(round(warr.upper / res))
+            for tr_idx in tid:
+                if not track_alloc.is_free(tr_idx, wl, wu, width=tid.width):
+                    raise ValueError('Bias wire %s on layer %d track %s is too close to another net.' %
+                                     (net_name, layer_id, tr_idx))
+                tr_lo = int(math.floor(tr_idx - (tid.width - 1) / 2))
+                tr_hi = int(math.ceil(tr_idx + (tid.width - 1) / 2))
+                tr_lower = tr_lo if tr_lower is None else min(tr_lower, tr_lo)
+                tr_upper = tr_hi if tr_upper is None else max(tr_upper, tr_hi)
+            lower = wl if lower is None else min(lower, wl)
+            upper = wu if upper is None else max(upper, wu)
+        track_alloc.reserve_wires(warr_list)
+
+    return track_alloc.get_utilization(tr_lower, tr_upper, lower, upper)
+
+
+class RXHalfBase(with_metaclass(abc.ABCMeta, TemplateBase)):
+    """one data path of DDR burst mode RX core.
+
+    Subclasses implement the analog frontend stage by overriding make_layout_info(),
+    plan_frontend(), place() and connect_frontend().
+
+    Parameters
+    ----------
+    temp_db : TemplateDB
+            the template database.
+    lib_name : str
+        the layout library name.
+    params : Dict[str, Any]
+        the parameter values.
+    used_names : Set[str]
+        a set of already used cell names.
+    **kwargs
+        dictionary of optional parameters.  See documentation of
+        :class:`bag.layout.template.TemplateBase` for details.
+    """
+
+    # parameters that affect the column floorplan.
+    column_plan_params = ('lch', 'guard_ring_nf', 'alat_params_list', 'buf_params', 'intsum_params',
+                          'summer_params', 'dlat_params_list', 'nduml', 'ndumr', 'nac_off',
+                          'sig_widths', 'sig_spaces', 'clk_widths', 'clk_spaces', 'sig_clk_spaces')
+
+    def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
+        # type: (TemplateDB, str, Dict[str, Any], Set[str], **Any) -> None
+        super(RXHalfBase, self).__init__(temp_db, lib_name, params, used_names, **kwargs)
+        self._fg_tot = 0
+        self._col_idx_dict = None
+        self.in_xm_track = None
+        self.sch_params = None
+        self.bias_utilization = None
+
+    @classmethod
+    def get_default_param_values(cls):
+        # type: () -> Dict[str, Any]
+        """Returns a dictionary containing default parameter values.
+
+        Override this method to define default parameter values.  As good practice,
+        you should avoid defining default values for technology-dependent parameters
+        (such as channel length, transistor width, etc.), but only define default
+        values for technology-independent parameters (such as number of tracks).
+
+        Returns
+        -------
+        default_params : Dict[str, Any]
+            dictionary of default parameter values.
+        """
+        return dict(
+            th_dict={},
+            gds_space=1,
+            diff_space=1,
+            min_fg_sep=0,
+            nduml=4,
+            ndumr=4,
+            hm_width=1,
+            hm_cur_width=-1,
+            sig_widths=[1, 1],
+            sig_spaces=[1, 1],
+            clk_widths=[1, 1, 1],
+            clk_spaces=[1, 1, 1],
+            sig_clk_spaces=[1, 1],
+            guard_ring_nf=0,
+            show_pins=False,
+            datapath_parity=0,
+        )
+
+    @classmethod
+    def get_params_info(cls):
+        # type: () -> Dict[str, str]
+        """Returns a dictionary containing parameter descriptions.
+
+        Override this method to return a dictionary from parameter names to descriptions.
+
+        Returns
+        -------
+        param_info : Dict[str, str]
+            dictionary from parameter name to description.
+        """
+        return dict(
+            lch='channel length, in meters.',
+            ptap_w='NMOS substrate width, in meters/number of fins.',
+            ntap_w='PMOS substrate width, in meters/number of fins.',
+            w_dict='NMOS/PMOS width dictionary.',
+            th_dict='NMOS/PMOS threshold flavor dictionary.',
+            alat_params_list='Analog latch parameters',
+            intsum_params='Integrator summer parameters.',
+            summer_params='DFE tap-1 summer parameters.',
+            dlat_params_list='Digital latch parameters.',
+            buf_params='integrator clock buffer parameters.',
+            min_fg_sep='Minimum separation between transistors.',
+            nduml='number of dummy fingers on the left.',
+            ndumr='number of dummy fingers on the right.',
+            nac_off='number of off transistors for dlev AC coupling',
+            gds_space='number of tracks reserved as space between gate and drain/source tracks.',
+            diff_space='number of tracks reserved as space between differential tracks.',
+            hm_width='width of horizontal track wires.',
+            hm_cur_width='width of horizontal current track wires. If negative, defaults to hm_width.',
+            sig_widths='signal wire widths on each layer above hm layer.',
+            sig_spaces='signal wire spacing on each layer above hm layer.',
+            clk_widths='clk wire widths on each layer above hm layer.',
+            clk_spaces='clk wire spacing on each layer above hm layer.',
+            sig_clk_spaces='spacing between signal and clk on each layer above hm layer.',
+            guard_ring_nf='Width of the guard ring, in number of fingers.  0 to disable guard ring.',
+            show_pins='True to draw layout pins.',
+            datapath_parity='Parity of the DDR datapath.  Either 0 or 1.',
+        )
+
+    @property
+    def num_fingers(self):
+        # type: () -> int
+        return self._fg_tot
+
+    def get_column_index_table(self):
+        return self._col_idx_dict
+
+    def draw_layout(self):
+        layout_info = self.make_layout_info(self.grid, self.params)
+
+        bot_inst, top_inst, col_idx_dict = self.place(layout_info)
+        self.bias_utilization = max(bot_inst.master.bias_utilization, top_inst.master.bias_utilization)
+        self.connect(layout_info, bot_inst, top_inst, col_idx_dict)
+        self.draw_xm_supplies(bot_inst, top_inst)
+        self._col_idx_dict = col_idx_dict
+
+    @classmethod
+    def make_layout_info(cls, grid, params):
+        # type: (RoutingGrid, Dict[str, Any]) -> SerdesRXBaseInfo
+        """Create the SerdesRXBaseInfo object used to floorplan this template.
+
+        Parameters
+        ----------
+        grid : RoutingGrid
+            the RoutingGrid object.
+        params : Dict[str, Any]
+            the parameters dictionary.
+
+        Returns
+        -------
+        layout_info : SerdesRXBaseInfo
+            the SerdesRXBaseInfo object.
+        """
+        return SerdesRXBaseInfo(grid, params['lch'], params['guard_ring_nf'], min_fg_sep=params['min_fg_sep'])
+
+    def draw_xm_supplies(self, bot_inst, top_inst):
+        show_pins = self.params['show_pins']
+        # draw xm VDD wire
+        bot_vdd = bot_inst.get_all_port_pins('VDD')[0]
+        top_vdd = top_inst.get_all_port_pins('VDD')[0]
+        hm_layer = bot_vdd.layer_id
+        lower = self.grid.get_wire_bounds(hm_layer, bot_vdd.track_id.base_index, bot_vdd.track_id.width,
+                                          unit_mode=True)[0]
+        upper = self.grid.get_wire_bounds(hm_layer, top_vdd.track_id.base_index, top_vdd.track_id.width,
+                                          unit_mode=True)[1]
+        xm_layer = hm_layer + 2
+        xtr_bot = self.grid.find_next_track(xm_layer, lower, half_track=False, mode=1, unit_mode=True)
+        xtr_top = self.grid.find_next_track(xm_layer, upper, half_track=False, mode=-1, unit_mode=True)
+        xnum_tr = xtr_top - xtr_bot + 1
+        xmid_tr = (xtr_top + xtr_bot) / 2
+        bot_vdd_box = bot_vdd.get_bbox_array(self.grid).base
+        xm_lower = bot_vdd_box.left_unit
+        xm_upper = bot_vdd_box.right_unit
+        warr = self.add_wires(xm_layer, xmid_tr, lower=xm_lower, upper=xm_upper, width=xnum_tr, unit_mode=True)
+        self.add_pin('VDDX', warr, show=show_pins)
+        # draw xm bottom VSS wire
+        bot_vss = bot_inst.get_all_port_pins('VSS')[0]
+        top_vss = top_inst.get_all_port_pins('VSS')[0]
+        upper = self.grid.get_wire_bounds(hm_layer, bot_vss.track_id.base_index, bot_vss.track_id.width,
+                                          unit_mode=True)[1]
+        xtr_top = self.grid.find_next_track(xm_layer, upper, half_track=False, mode=-1, unit_mode=True)
+        xmid_tr = xtr_top - (xnum_tr - 1) / 2
+        warr = self.add_wires(xm_layer, xmid_tr, lower=xm_lower, upper=xm_upper, width=xnum_tr, unit_mode=True)
+        self.add_pin('VSSX', warr, show=show_pins)
+        # draw xm top VSS wire
+        lower = self.grid.get_wire_bounds(hm_layer, top_vss.track_id.base_index, top_vss.track_id.width,
+                                          unit_mode=True)[0]
+        xtr_bot = self.grid.find_next_track(xm_layer, lower, half_track=False, mode=1, unit_mode=True)
+        xtr_top = self.grid.get_num_tracks(self.size, xm_layer) - 1
+        xnum_tr = xtr_top - xtr_bot + 1
+        xmid_tr = (xtr_top + xtr_bot) / 2
+        warr = self.add_wires(xm_layer, xmid_tr, lower=xm_lower, upper=xm_upper, width=xnum_tr, unit_mode=True)
+        self.add_pin('VSSX', warr, show=show_pins)
+
+    @classmethod
+    def get_column_plan(cls, layout_info, params):
+        # type: (SerdesRXBaseInfo, Dict[str, Any]) -> Dict[str, Any]
+        """Compute the column floorplan of this template without creating any masters.
+
+        This method only depends on the SerdesRXBaseInfo sizing methods, so it can be used
+        to quickly evaluate the total width of many tap configurations.
+
+        Parameters
+        ----------
+        layout_info : SerdesRXBaseInfo
+            the SerdesRXBaseInfo object.
+        params : Dict[str, Any]
+            the parameters dictionary.
+
+        Returns
+        -------
+        plan : Dict[str, Any]
+            the column floorplan.  col_idx_dict contains the column interval of each block,
+            fg_tot is the total number of fingers, and the rest are the updated frontend,
+            intsum, summer and digital latch parameters.  The plan does not depend on datapath
+            parity, so results are cached and shared between the even and odd RXHalf in RXCore.
+        """
+        key = (cls,
+               get_grid_fingerprint(layout_info.grid, layout_info.mconn_port_layer,
+                                    layout_info.mconn_port_layer + 3),
+               layout_info.min_fg_sep,
+               to_hashable({name: params[name] for name in cls.column_plan_params if name in params}))
+        plan = _column_plan_cache.get(key, None)
+        if plan is None:
+            floorplan = ColumnFloorplan(layout_info, layout_info.mconn_port_layer + 2, start_col=params['nduml'])
+            plan = dict(col_idx_dict={})
+            cls.plan_frontend(layout_info, params, floorplan, plan)
+            cls.plan_backend(layout_info, params, floorplan, plan)
+            plan['fg_tot'] = cls.round_up_fg_tot(layout_info, floorplan.cur_col + params['ndumr'])
+            _column_plan_cache[key] = plan
+        return copy.deepcopy(plan)
+
+    @classmethod
+    def round_up_fg_tot(cls, layout_info, fg_min):
+        # type: (SerdesRXBaseInfo, int) -> int
+        """Round up the total number of fingers to a multiple of the block pitch.
+
+        Parameters
+        ----------
+        layout_info : SerdesRXBaseInfo
+            the SerdesRXBaseInfo object.
+        fg_min : int
+            minimum number of fingers.
+
+        Returns
+        -------
+        fg_tot : int
+            the total number of fingers.
+        """
+        blk_w = layout_info.grid.get_block_size(layout_info.mconn_port_layer + 3, unit_mode=True)[0]
+        sd_pitch_unit = layout_info.sd_pitch_unit
+        cur_width = layout_info.get_total_width(fg_min) * sd_pitch_unit
+        final_w = -(-cur_width // blk_w) * blk_w
+        return final_w // sd_pitch_unit
+
+    @classmethod
+    def plan_clock_buffer(cls, layout_info, params):
+        # type: (SerdesRXBaseInfo, Dict[str, Any]) -> Tuple[Dict[str, Any], float, int]
+        """Place the integrator clock buffers.
+
+        The clock buffers are drawn in the top half, and overlap the frontend stage.
+
+        Parameters
+        ----------
+        layout_info : SerdesRXBaseInfo
+            the SerdesRXBaseInfo object.
+        params : Dict[str, Any]
+            the parameters dictionary.
+
+        Returns
+        -------
+        buf_params : Dict[str, Any]
+            the updated clock buffer parameters.
+        integ_pmos_vm_tid : float
+            the integrator pmos vm track index.
+        integ_fg_min : int
+            minimum number of integrator fingers.
+        """
+        buf_params = params['buf_params']
+        nduml = params['nduml']
+        clk_width_vm = params['clk_widths'][0]
+        clk_space_vm = params['clk_spaces'][0]
+        vm_layer_id = layout_info.mconn_port_layer + 2
+
+        floorplan = ColumnFloorplan(layout_info, vm_layer_id, start_col=nduml)
+        new_buf_params = buf_params.copy()
+        new_buf_params['col_idx0'] = floorplan.cur_col
+        fg_clk_route = floorplan.tracks_to_fingers(clk_width_vm + clk_space_vm)
+        floorplan.add_space(max(fg_clk_route, buf_params['fg0']) + fg_clk_route)
+        new_buf_params['col_idx1'] = buf_col_idx1 = floorplan.cur_col
+        # find minimum number of integrator frontend fingers and integrator frontend pmos vm track index.
+        fg1 = max(fg_clk_route, buf_params['fg1'])
+        integ_pmos_vm_tid = layout_info.get_center_tracks(vm_layer_id, 1, (buf_col_idx1, buf_col_idx1 + fg1),
+                                                          width=clk_width_vm, space=clk_space_vm)
+        integ_fg_min = buf_col_idx1 + fg1 - nduml
+        return new_buf_params, integ_pmos_vm_tid, integ_fg_min
+
+    @classmethod
+    @abc.abstractmethod
+    def plan_frontend(cls, layout_info, params, floorplan, plan):
+        # type: (SerdesRXBaseInfo, Dict[str, Any], ColumnFloorplan, Dict[str, Any]) -> None
+        """Place the analog frontend stage.
+
+        Implementations add the frontend blocks to the given floorplan, and record column intervals
+        in plan['col_idx_dict'] and updated frontend parameters in plan.  The frontend must end with
+        the routing channel or spacing required before the intsum.
+
+        Parameters
+        ----------
+        layout_info : SerdesRXBaseInfo
+            the SerdesRXBaseInfo object.
+        params : Dict[str, Any]
+            the parameters dictionary.
+        floorplan : ColumnFloorplan
+            the column floorplan, starting at the left dummy fingers.
+        plan : Dict[str, Any]
+            the column plan dictionary.
+        """
+        pass
+
+    @classmethod
+    def plan_backend(cls, layout_info, params, floorplan, plan):
+        # type: (SerdesRXBaseInfo, Dict[str, Any], ColumnFloorplan, Dict[str, Any]) -> None
+        """Place intsum, DFE summer, digital latches and AC coupling off transistors.
+
+        Parameters
+        ----------
+        layout_info : SerdesRXBaseInfo
+            the SerdesRXBaseInfo object.
+        params : Dict[str, Any]
+            the parameters dictionary.
+        floorplan : ColumnFloorplan
+            the column floorplan, starting right after the frontend stage.
+        plan : Dict[str, Any]
+            the column plan dictionary.
+        """
+        intsum_params = params['intsum_params']
+        summer_params = params['summer_params']
+        dlat_params_list = params['dlat_params_list']
+        nac_off = params['nac_off']
+        sig_width_vm = params['sig_widths'][0]
+        sig_space_vm = params['sig_spaces'][0]
+        clk_width_vm = params['clk_widths'][0]
+        clk_space_vm = params['clk_spaces'][0]
+        sig_clk_space_vm = params['sig_clk_spaces'][0]
+        dtr_pitch = sig_width_vm + sig_space_vm
+        diff_clk_route_tracks = 2 * sig_width_vm + 2 * clk_width_vm + sig_space_vm + 3 * sig_clk_space_vm
+        col_idx_dict = plan['col_idx_dict']
+
+        # step 2: place intsum and most digital latches
+        # assumption: we assume the load/offset fingers < total gm fingers,
+        # so we can use gm_info to determine sizing.
+        intsum_col_idx = floorplan.cur_col
+        col_idx_dict['intsum'] = []
+        col_idx_dict['dlat'] = [(0, 0)] * len(dlat_params_list)
+        intsum_gm_fg_list = intsum_params['gm_fg_list']
+        intsum_gm_sep_list = [layout_info.min_fg_sep] * (len(intsum_gm_fg_list) - 1)
+        # step 2A: place main tap.  No requirements.
+        intsum_main_params = intsum_gm_fg_list[0]
+        col_idx_dict['intsum'].append(floorplan.add_block(fg_min=intsum_main_params.get('min', 0),
+                                                          sizers=[get_gm_sizer(layout_info, intsum_main_params)]))
+        new_intsum_gm_fg_list = [intsum_main_params]
+        floorplan.add_space(intsum_gm_sep_list[0])
+        # step 2B: place precursor tap and offset cancellation.  must fit one differential track + 2 clk route track
+        for idx in (1, 2):
+            intsum_fg_params = intsum_gm_fg_list[idx].copy()
+            intsum_fg_params['min'] = floorplan.get_width(num_tracks=diff_clk_route_tracks)
+            col_idx_dict['intsum'].append(floorplan.add_block(fg_min=intsum_fg_params['min'],
+                                                              sizers=[get_gm_sizer(layout_info, intsum_fg_params)]))
+            new_intsum_gm_fg_list.append(intsum_fg_params)
+            floorplan.add_space(intsum_gm_sep_list[idx])
+        # step 2C: place intsum DFE taps
+        num_intsum_gm = len(intsum_gm_fg_list)
+        num_dfe = num_intsum_gm - 3 + 1
+        new_dlat_params_list = [None] * len(dlat_params_list)
+        # NOTE: here DFE index start at 1.
+        for idx in range(3, num_intsum_gm):
+            intsum_dfe_fg_params = intsum_gm_fg_list[idx].copy()
+            dfe_idx = num_dfe - (idx - 3)
+            dlat_idx = dfe_idx - 2
+            dig_latch_params = dlat_params_list[dlat_idx].copy()
+            in_route = False
+            num_route_tracks = diff_clk_route_tracks
+            if dfe_idx > 2:
+                # for DFE tap > 2, the intsum Gm stage must align with the corresponding
+                # digital latch.
+                if dfe_idx % 2 == 1:
+                    # for odd DFE taps, we have criss-cross signal connections, so fit 2 diff tracks + 2 clk tracks
+                    num_route_tracks = 4 * sig_width_vm + 2 * clk_width_vm + 3 * sig_space_vm + 3 * sig_clk_space_vm
+                    # for odd DFE taps > 3, we need to reserve additional input routing tracks
+                    in_route = dfe_idx > 3
+                else:
+                    # for even DFE taps, we have criss-cross bias connections, so fit 4 clk tracks
+                    num_route_tracks = max(4 * clk_width_vm + 4 * clk_space_vm, num_route_tracks)
+
+                # fit diff tracks and make diglatch and DFE tap have same width
+                sizers = [get_diffamp_sizer(layout_info, dig_latch_params, name='dlat%d' % dlat_idx),
+                          get_gm_sizer(layout_info, intsum_dfe_fg_params, name='intsum DFE tap %d' % dfe_idx)]
+                col_intv = floorplan.add_block(num_tracks=num_route_tracks, sizers=sizers)
+                num_fg = col_intv[1] - col_intv[0]
+                intsum_dfe_fg_params['min'] = num_fg
+                dig_latch_params['min'] = num_fg
+                dig_latch_params['col_idx'] = col_intv[0]
+                col_idx_dict['dlat'][dlat_idx] = col_intv
+                col_idx_dict['intsum'].append(col_intv)
+                if in_route:
+                    # allocate input route
+                    route_intv = floorplan.add_channel(2 * dtr_pitch)
+                    intsum_gm_sep_list[idx] = route_intv[1] - route_intv[0]
+                    col_idx_dict['dlat%d_inroute' % dlat_idx] = route_intv
+                else:
+                    floorplan.add_space(intsum_gm_sep_list[idx])
+            else:
+                # for DFE tap 2, we have no requirements for digital latch
+                # no need to add gm sep because this is the last tap.
+                intsum_dfe_fg_params['min'] = floorplan.get_width(num_tracks=num_route_tracks)
+                col_idx_dict['intsum'].append(floorplan.add_block(fg_min=intsum_dfe_fg_params['min'],
+                                                                  sizers=[get_gm_sizer(layout_info,
+                                                                                       intsum_dfe_fg_params)]))
+            # save modified parameters
+            new_dlat_params_list[dlat_idx] = dig_latch_params
+            new_intsum_gm_fg_list.append(intsum_dfe_fg_params)
+        # step 2D: reserve routing tracks between intsum and summer
+        col_idx_dict['summer_route'] = floorplan.add_channel(2 * dtr_pitch)
+
+        # step 3: place DFE summer and first digital latch
+        # assumption: we assume the load fingers < total gm fingers,
+        # so we can use gm_info to determine sizing.
+        summer_col_idx = floorplan.cur_col
+        summer_gm_fg_list = summer_params['gm_fg_list']
+        summer_gm_sep_list = [layout_info.min_fg_sep]
+        # step 3A: place main tap.  No requirements.
+        summer_main_params = summer_gm_fg_list[0]
+        col_idx_dict['summer'] = [floorplan.add_block(fg_min=summer_main_params.get('min', 0),
+                                                      sizers=[get_gm_sizer(layout_info, summer_main_params)])]
+        new_summer_gm_fg_list = [summer_main_params]
+        floorplan.add_space(summer_gm_sep_list[0])
+        # step 3B: place DFE tap.  must fit two differential tracks
+        summer_dfe_fg_params = summer_gm_fg_list[1].copy()
+        summer_dfe_fg_params['min'] = floorplan.get_width(num_tracks=4 * dtr_pitch)
+        tap1_col_intv = floorplan.add_block(fg_min=summer_dfe_fg_params['min'],
+                                            sizers=[get_gm_sizer(layout_info, summer_dfe_fg_params)])
+        new_summer_gm_fg_list.append(summer_dfe_fg_params)
+        col_idx_dict['summer'].append(tap1_col_intv)
+        # step 3C: place first digital latch
+        # only requirement is that the right side line up with summer.
+        dig_latch_params = dlat_params_list[0].copy()
+        new_dlat_params_list[0] = dig_latch_params
+        dlat_fg_tot = layout_info.get_diffamp_info(dig_latch_params)['fg_tot']
+        dig_latch_params['col_idx'] = floorplan.cur_col - dlat_fg_tot
+        dig_latch_params['min'] = dlat_fg_tot
+        col_idx_dict['dlat'][0] = (floorplan.cur_col - dlat_fg_tot, floorplan.cur_col)
+
+        # step 4: add AC coupling off transistors
+        col_idx_dict['acoff'] = floorplan.add_block(fg_min=2 * nac_off + layout_info.min_fg_sep * 3,
+                                                    num_tracks=clk_width_vm * 2 + clk_space_vm * 3)
+
+        plan['intsum_params'] = dict(
+            col_idx=intsum_col_idx,
+            fg_load=intsum_params['fg_load'],
+            gm_fg_list=new_intsum_gm_fg_list,
+            gm_sep_list=intsum_gm_sep_list,
+            sgn_list=intsum_params['sgn_list'],
+            flip_sd_list=intsum_params.get('flip_sd_list', None),
+            decap_list=intsum_params.get('decap_list', None),
+            load_decap_list=intsum_params.get('load_decap_list', None),
+        )
+        plan['summer_params'] = dict(
+            col_idx=summer_col_idx,
+            fg_load=summer_params['fg_load'],
+            gm_fg_list=new_summer_gm_fg_list,
+            gm_sep_list=summer_gm_sep_list,
+            sgn_list=summer_params['sgn_list'],
+        )
+        plan['acoff_params'] = dict(
+            col_intv=col_idx_dict['acoff'],
+            nac_off=nac_off,
+        )
+        plan['dlat_params_list'] = new_dlat_params_list
+        plan['tap1_col_intv'] = tap1_col_intv
+
+    @abc.abstractmethod
+    def place(self, layout_info):
+        # type: (SerdesRXBaseInfo) -> Tuple[Instance, Instance, Dict[str, Any]]
+        """Create the bottom and top halves from the column plan.
+
+        Parameters
+        ----------
+        layout_info : SerdesRXBaseInfo
+            the SerdesRXBaseInfo object.
+
+        Returns
+        -------
+        bot_inst : Instance
+            the bottom half instance.
+        top_inst : Instance
+            the top half instance.
+        col_idx_dict : Dict[str, Any]
+            the column index dictionary.
+        """
+        return None, None, {}
+
+    def get_dlat_sch_params(self, dlat_params_list):
+        # type: (List[Dict[str, Any]]) -> List[Dict[str, Any]]
+        """Returns the digital latch schematic parameters."""
+        mos_types = list(self.params['w_dict'].keys())
+        sch_dlat_list = []
+        for dlat_params in dlat_params_list:
+            sch_dlat_list.append(dict(
+                fg_dict={key: dlat_params[key] for key in mos_types if key in dlat_params},
+                fg_tot=dlat_params['min'],
+                flip_sd=dlat_params.get('flip_sd', False),
+                decap=dlat_params.get('decap', False),
+            ))
+        return sch_dlat_list
+
+    @abc.abstractmethod
+    def connect_frontend(self, layout_info, bot_inst, top_inst, col_idx_dict):
+        # type: (SerdesRXBaseInfo, Instance, Instance, Dict[str, Any]) -> None
+        """Connect the frontend stage clocks and signals up to the intsum inputs.
+
+        Parameters
+        ----------
+        layout_info : SerdesRXBaseInfo
+            the SerdesRXBaseInfo object.
+        bot_inst : Instance
+            the bottom half instance.
+        top_inst : Instance
+            the top half instance.
+        col_idx_dict : Dict[str, Any]
+            the column index dictionary.
+        """
+        pass
+
+    def connect(self, layout_info, bot_inst, top_inst, col_idx_dict):
+        vm_space = self.params['sig_spaces'][0]
+        hm_layer = layout_info.mconn_port_layer + 1
+        vm_layer = hm_layer + 1
+        vm_width = self.params['sig_widths'][0]
+        nintsum = len(self.params['intsum_params']['gm_fg_list'])
+
+        self.connect_frontend(layout_info, bot_inst, top_inst, col_idx_dict)
+
+        # connect intsum to summer
+        self._connect_diff_io(top_inst, col_idx_dict['summer_route'], layout_info, vm_layer,
+                              vm_width, vm_space, 'intsum_out{}', 'summer_in{}<0>')
+
+        # connect DFE tap 2
+        route_col_intv = col_idx_dict['intsum'][-1]
+        ptr_idx = layout_info.get_center_tracks(vm_layer, 2, route_col_intv, width=vm_width, space=vm_space)
+        ntr_idx = ptr_idx + vm_space + vm_width
+        p_list = [bot_inst.get_port('dlat0_outp').get_pins()[0],
+                  top_inst.get_port('intsum_inp<%d>' % (nintsum - 1)).get_pins()[0], ]
+        n_list = [bot_inst.get_port('dlat0_outn').get_pins()[0],
+                  top_inst.get_port('intsum_inn<%d>' % (nintsum - 1)).get_pins()[0], ]
+        if nintsum > 4:
+            p_list.append(bot_inst.get_port('dlat1_inp').get_pins()[0])
+            n_list.append(bot_inst.get_port('dlat1_inn').get_pins()[0])
+
+        self.connect_differential_tracks(p_list, n_list, vm_layer, ptr_idx, ntr_idx, width=vm_width)
+
+        # connect even DFE taps
+        ndfe = nintsum - 3 + 1
+        for dfe_idx in range(4, ndfe + 1, 2):
+            dlat_idx = dfe_idx - 2
+            intsum_idx = nintsum - 1 - dlat_idx
+            route_col_intv = col_idx_dict['intsum'][intsum_idx]
+            ptr_idx = layout_info.get_center_tracks(vm_layer, 2, route_col_intv, width=vm_width, space=vm_space)
+            ntr_idx = ptr_idx + vm_space + vm_width
+            p_list = [bot_inst.get_port('dlat%d_outp' % (dfe_idx - 2)).get_pins()[0],
+                      top_inst.get_port('intsum_inp<%d>' % intsum_idx).get_pins()[0], ]
+            n_list = [bot_inst.get_port('dlat%d_outn' % (dfe_idx - 2)).get_pins()[0],
+                      top_inst.get_port('intsum_inn<%d>' % intsum_idx).get_pins()[0], ]
+            self.connect_differential_tracks(p_list, n_list, vm_layer, ptr_idx, ntr_idx, width=vm_width)
+            if dfe_idx + 1 <= ndfe:
+                # connect to next digital latch
+                self._connect_diff_io(bot_inst, col_idx_dict['dlat%d_inroute' % (dfe_idx - 1)],
+                                      layout_info, vm_layer, vm_width, vm_space,
+                                      'dlat%d_out{}' % (dfe_idx - 2), 'dlat%d_in{}' % (dfe_idx - 1))
+
+    def _connect_diff_io(self, inst, route_col_intv, layout_info, vm_layer, vm_width, vm_space,
+                         out_name, in_name):
+        ptr_idx = layout_info.get_center_tracks(vm_layer, 2, route_col_intv, width=vm_width, space=vm_space)
+        ntr_idx = ptr_idx + vm_space + vm_width
+        p_warrs = [inst.get_port(out_name.format('p')).get_pins()[0],
+                   inst.get_port(in_name.format('p')).get_pins()[0], ]
+        n_warrs = [inst.get_port(out_name.format('n')).get_pins()[0],
+                   inst.get_port(in_name.format('n')).get_pins()[0], ]
+        self.connect_differential_tracks(p_warrs, n_warrs, vm_layer, ptr_idx, ntr_idx,
+                                         width=vm_width)
+
+
+class RXCoreBase(TemplateBase):
+    """DDR burst mode RX core, consisting of the even and odd data paths.
+
+    Subclasses set half_cls to the RXHalfBase subclass of the data path, and the frontend
+    specific routing attributes.
+
+    Parameters
+    ----------
+    temp_db : TemplateDB
+            the template database.
+    lib_name : str
+        the layout library name.
+    params : Dict[str, Any]
+        the parameter values.
+    used_names : Set[str]
+        a set of already used cell names.
+    **kwargs
+        dictionary of optional parameters.  See documentation of
+        :class:`bag.layout.template.TemplateBase` for details.
+    """
+
+    # the data path class.
+    half_cls = None  # type: type
+    # column index table entries used to route the inputs and the first analog latch outputs.
+    in_route_key = ''
+    alat_route_key = ''
+    # clock/bias wires to export, with the number of tracks each wire uses in the top level.
+    clk_top_list = []  # type: List[Tuple[str, int]]
+    # clock wires local to the RX core that connect even and odd data paths.
+    local_clk_names = ()  # type: Tuple[str, ...]
+
+    def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
+        # type: (TemplateDB, str, Dict[str, Any], Set[str], **Any) -> None
+        super(RXCoreBase, self).__init__(temp_db, lib_name, params, used_names, **kwargs)
+        self._fg_tot = 0
+        self._in_xm_offset = None
+        self._sch_params = None
+
+    @classmethod
+    def get_default_param_values(cls):
+        # type: () -> Dict[str, Any]
+        """Returns a dictionary containing default parameter values.
+
+        Override this method to define default parameter values.  As good practice,
+        you should avoid defining default values for technology-dependent parameters
+        (such as channel length, transistor width, etc.), but only define default
+        values for technology-independent parameters (such as number of tracks).
+
+        Returns
+        -------
+        default_params : Dict[str, Any]
+            dictionary of default parameter values.
+        """
+        return dict(
+            th_dict={},
+            gds_space=1,
+            min_fg_sep=0,
+            nduml=4,
+            ndumr=4,
+            diff_space=1,
+            hm_width=1,
+            hm_cur_width=-1,
+            sig_widths=[1, 1],
+            sig_spaces=[1, 1],
+            clk_widths=[1, 1, 1],
+            clk_spaces=[1, 1, 1],
+            sig_clk_spaces=[1, 1],
+            show_pins=True,
+            rename_dict={},
+            guard_ring_nf=0,
+        )
+
+    @classmethod
+    def get_params_info(cls):
+        # type: () -> Dict[str, str]
+        """Returns a dictionary containing parameter descriptions.
+
+        Override this method to return a dictionary from parameter names to descriptions.
+
+        Returns
+        -------
+        param_info : Dict[str, str]
+            dictionary from parameter name to description.
+        """
+        return dict(
+            lch='channel length, in meters.',
+            ptap_w='NMOS substrate width, in meters/number of fins.',
+            ntap_w='PMOS substrate width, in meters/number of fins.',
+            w_dict='NMOS/PMOS width dictionary.',
+            th_dict='NMOS/PMOS threshold flavor dictionary.',
+            alat_params_list='Analog latch parameters',
+            intsum_params='Integrator summer parameters.',
+            summer_params='DFE tap-1 summer parameters.',
+            dlat_params_list='Digital latch parameters.',
+            buf_params='Integrator clock buffer parameters.',
+            nac_off='Number of off transistors for dlev AC coupling',
+            min_fg_sep='Minimum separation between transistors.',
+            nduml='number of dummy fingers on the left.',
+            ndumr='number of dummy fingers on the right.',
+            gds_space='number of tracks reserved as space between gate and drain/source tracks.',
+            diff_space='number of tracks reserved as space between differential tracks.',
+            hm_width='width of horizontal track wires.',
+            hm_cur_width='width of horizontal current track wires. If negative, defaults to hm_width.',
+            sig_widths='signal wire widths on each layer above hm layer.',
+            sig_spaces='signal wire spacing on each layer above hm layer.',
+            clk_widths='clk wire widths on each layer above hm layer.',
+            clk_spaces='clk wire spacing on each layer above hm layer.',
+            sig_clk_spaces='spacing between signal and clk on each layer above hm layer.',
+            show_pins='True to create pin labels.',
+            rename_dict='port renaming dictionary',
+            guard_ring_nf='Width of the guard ring, in number of fingers.  0 to disable guard ring.',
+        )
+
+    @property
+    def num_fingers(self):
+        # type: () -> int
+        return self._fg_tot
+
+    @property
+    def in_offset(self):
+        # type: () -> int
+        return self._in_xm_offset
+
+    @property
+    def sch_params(self):
+        # type: () -> Dict[str, Any]
+        return self._sch_params
+
+    def draw_layout(self):
+        half_params = self.params.copy()
+        half_params['datapath_parity'] = 0
+        half_params['show_pins'] = False
+        even_master = self.new_template(params=half_params, temp_cls=self.half_cls)
+        half_params['datapath_parity'] = 1
+        half_params['show_pins'] = False
+        odd_master = self.new_template(params=half_params, temp_cls=self.half_cls)
+        odd_inst = self.add_instance(odd_master, 'X1', orient='MX')
+        odd_inst.move_by(dy=odd_master.bound_box.height)
+        even_inst = self.add_instance(even_master, 'X0')
+        even_inst.move_by(dy=odd_inst.array_box.top - even_inst.array_box.bottom)
+
+        self._sch_params = odd_master.sch_params
+
+        self.array_box = odd_inst.array_box.merge(even_inst.array_box)
+        self.set_size_from_array_box(even_master.size[0])
+        self._fg_tot = even_master.num_fingers
+
+        col_idx_dict = even_master.get_column_index_table()
+        port_list = [PortIndex(even_inst), PortIndex(odd_inst)]
+        lch = self.params['lch']
+        guard_ring_nf = self.params['guard_ring_nf']
+        min_fg_sep = self.params['min_fg_sep']
+        layout_info = SerdesRXBaseInfo(self.grid, lch, guard_ring_nf, min_fg_sep=min_fg_sep)
+        self.connect_signal(port_list, col_idx_dict, layout_info)
+        self.connect_bias(port_list)
+        self.connect_supplies(port_list)
+
+    def connect_signal(self, port_list, col_idx_dict, layout_info):
+        hm_layer_id = layout_info.mconn_port_layer + 1
+        vm_layer_id = hm_layer_id + 1
+        xm_layer_id = vm_layer_id + 1
+        vm_space = self.params['sig_spaces'][0]
+        vm_width = self.params['sig_widths'][0]
+        vm_pitch = vm_width + vm_space
+        show_pins = self.params['show_pins']
+
+        # connect inputs of even and odd paths
+        route_col_intv = col_idx_dict[self.in_route_key]
+        ptr_idx = layout_info.get_center_tracks(vm_layer_id, 2, route_col_intv, width=vm_width, space=vm_space)
+        vm_sig_clk_space = self.params['sig_clk_spaces'][0]
+        vm_clk_width = self.params['clk_widths'][0]
+        ptr_idx -= vm_sig_clk_space + (vm_space + vm_clk_width) / 2 + vm_width
+        ports = ['integ_in{}']
+        inp, inn = self._connect_differential(port_list, ptr_idx, vm_layer_id, vm_width, vm_space,
+                                              ports, ports)
+        in_xm_track = port_list[0].inst.master.in_xm_track
+        inp_track = port_list[0].inst.translate_master_track(xm_layer_id, in_xm_track)
+        inn_track = port_list[1].inst.translate_master_track(xm_layer_id, in_xm_track)
+        self._in_xm_offset = (inp_track - inn_track) / 2
+
+        inp, inn = self.connect_differential_tracks(inp, inn, xm_layer_id, inp_track, inn_track,
+                                                    width=self.params['sig_widths'][1])
+        # export inputs/outputs
+        self.add_pin('inp', inp, show=show_pins)
+        self.add_pin('inn', inn, show=show_pins)
+        for idx, prefix in ((0, 'even'), (1, 'odd')):
+            for pname, oname in (('summer', 'summer'), ('dlev', 'dlev'), ('integ', 'intamp'), ('intsum', 'intsum')):
+                self.reexport(port_list[idx].get_port('%s_outp' % pname),
+                              net_name='outp_%s<%d>' % (oname, idx), show=show_pins)
+                self.reexport(port_list[idx].get_port('%s_outn' % pname),
+                              net_name='outn_%s<%d>' % (oname, idx), show=show_pins)
+            for pname, num in (('alat', 2), ('dlat', 3)):
+                for pidx in range(num):
+                    pport = port_list[idx].get_port('%s%d_outp' % (pname, pidx))
+                    nport = port_list[idx].get_port('%s%d_outn' % (pname, pidx))
+                    self.reexport(pport, net_name='%s_outp_%s<%d>' % (prefix, pname, pidx), show=show_pins)
+                    self.reexport(nport, net_name='%s_outn_%s<%d>' % (prefix, pname, pidx), show=show_pins)
+
+        # connect alat0 outputs
+        route_col_intv = col_idx_dict[self.alat_route_key]
+        ptr_idx = layout_info.get_center_tracks(vm_layer_id, 4, route_col_intv, width=vm_width, space=vm_space)
+        tr_idx_list = [ptr_idx, ptr_idx + vm_pitch, ptr_idx + 2 * vm_pitch, ptr_idx + 3 * vm_pitch]
+        warr_list_list = [[port_list[0].get_pin('alat0_outp'),
+                           port_list[0].get_pin('alat1_inp'),
+                           port_list[1].get_pin('ffe_inp'),
+                           ],
+                          [port_list[0].get_pin('alat0_outn'),
+                           port_list[0].get_pin('alat1_inn'),
+                           port_list[1].get_pin('ffe_inn'),
+                           ],
+                          [port_list[1].get_pin('alat0_outp'),
+                           port_list[1].get_pin('alat1_inp'),
+                           port_list[0].get_pin('ffe_inp'),
+                           ],
+                          [port_list[1].get_pin('alat0_outn'),
+                           port_list[1].get_pin('alat1_inn'),
+                           port_list[0].get_pin('ffe_inn'),
+                           ], ]
+        self.connect_matching_tracks(warr_list_list, vm_layer_id, tr_idx_list, width=vm_width)
+        # connect summer outputs
+        route_col_intv = col_idx_dict['summer'][1]
+        ptr_idx = layout_info.get_center_tracks(vm_layer_id, 4, route_col_intv, width=vm_width, space=vm_space)
+        ports0 = ['summer_out{}', 'dlat0_in{}']
+        ports1 = ['summer_in{}<1>']
+        self._connect_differential(port_list, ptr_idx, vm_layer_id, vm_width, vm_space,
+                                   ports0, ports1)
+        ptr_idx += 2 * vm_pitch
+        self._connect_differential(port_list, ptr_idx, vm_layer_id, vm_width, vm_space,
+                                   ports1, ports0)
+
+        # connect dlat1 outputs
+        route_col_intv = col_idx_dict['dlat'][1]
+        ptr_idx = layout_info.get_center_tracks(vm_layer_id, 4, route_col_intv, width=vm_width, space=vm_space)
+        tr_idx_list = [ptr_idx, ptr_idx + vm_width + vm_space]
+        warr_list_list = [[port_list[0].get_pin('dlat1_outp'),
+                           port_list[0].get_pin('dlat2_inp'),
+                           port_list[1].get_pin('intsum_inp<4>'),
+                           ],
+                          [port_list[0].get_pin('dlat1_outn'),
+                           port_list[0].get_pin('dlat2_inn'),
+                           port_list[1].get_pin('intsum_inn<4>'),
+                           ], ]
+        self.connect_matching_tracks(warr_list_list, vm_layer_id, tr_idx_list, width=vm_width)
+        tr_idx_list[0] += 2 * vm_pitch
+        tr_idx_list[1] += 2 * vm_pitch
+        warr_list_list = [[port_list[1].get_pin('dlat1_outp'),
+                           port_list[1].get_pin('dlat2_inp'),
+                           port_list[0].get_pin('intsum_inp<4>'),
+                           ],
+                          [port_list[1].get_pin('dlat1_outn'),
+                           port_list[1].get_pin('dlat2_inn'),
+                           port_list[0].get_pin('intsum_inn<4>'),
+                           ], ]
+        self.connect_matching_tracks(warr_list_list, vm_layer_id, tr_idx_list, width=vm_width)
+
+    def connect_bias(self, port_list):
+        show_pins = self.params['show_pins']
+        clk_ports = {'clk1': ['nmos_switch_alat1'], 'clk2': ['nmos_switch']}
+        clk_wires = {}
+        for ports in port_list:
+            for name in ports.get_names_with_prefix('clk'):
+                if name not in self.local_clk_names:
+                    if name not in clk_wires:
+                        clk_wires[name] = []
+                    clk_wires[name].extend(ports.get_all_port_pins(name))
+
+        for name in self.local_clk_names:
+            self.connect_wires(port_list[0].get_all_port_pins(name) + port_list[1].get_all_port_pins(name))
+
+        for base_name, _ in self.clk_top_list:
+            if base_name.startswith('clk'):
+                pwires = []
+                nwires = []
+                for clk_port_name in clk_ports[base_name]:
+                    pwires.extend(clk_wires.pop('clkp_' + clk_port_name))
+                    nwires.extend(clk_wires.pop('clkn_' + clk_port_name))
+                pname = 'clkp'
+                nname = 'clkn'
+                labelp = 'clkp:'
+                labeln = 'clkn:'
+            else:
+                pname = 'clkp_' + base_name
+                nname = 'clkn_' + base_name
+                pwires = self.connect_wires(clk_wires.pop(pname))
+                nwires = self.connect_wires(clk_wires.pop(nname))
+                if base_name == 'nmos_tap1':
+                    pname = 'even_' + pname
+                    nname = 'odd_' + nname
+                labelp = pname + ':'
+                labeln = nname + ':'
+
+            self.add_pin(pname, pwires, label=labelp, show=show_pins)
+            self.add_pin(nname, nwires, label=labeln, show=show_pins)
+
+        for name, wires in clk_wires.items():
+            self.add_pin(name, wires, show=show_pins)
+
+        num_dfe = len(self.params['intsum_params']['gm_fg_list']) - 3 + 1
+        for ports, prefix in zip(port_list, ('even_', 'odd_')):
+            for pname in ('bias_ffe', 'bias_dlevp', 'bias_dlevn',
+                          'ibias_nmos_integ', 'ibias_nmos_intsum', 'ibias_offset',
+                          'offp', 'offn'):
+                if ports.has_port(pname):
+                    self.reexport(ports.get_port(pname), net_name=prefix + pname, show=show_pins)
+            for idx in range(num_dfe):
+                if idx == 0:
+                    self.reexport(ports.get_port('en_dfe1'), net_name=prefix + 'en_dfe1', show=show_pins)
+                else:
+                    pname = 'ibias_dfe<%d>' % idx
+                    self.reexport(ports.get_port(pname), net_name=prefix + pname, show=show_pins)
+
+    def connect_supplies(self, port_list):
+        show_pins = self.params['show_pins']
+
+        vdd_warrs, vss_warrs = [], []
+        vddx_warrs, vssx_warrs = [], []
+        for ports in port_list:
+            vdd_warrs.extend(ports.get_all_port_pins('VDD'))
+            vss_warrs.extend(ports.get_all_port_pins('VSS'))
+            vddx_warrs.extend(ports.get_all_port_pins('VDDX'))
+            vssx_warrs.extend(ports.get_all_port_pins('VSSX'))
+
+        vddx_warrs = self.connect_wires(vddx_warrs)
+        vssx_warrs = self.connect_wires(vssx_warrs)
+
+        # connect X layer supplies to lower supplies
+        hm_layer = vdd_warrs[0].layer_id
+        vm_layer = hm_layer + 1
+        xm_layer = vm_layer + 1
+        hw = vdd_warrs[0].track_id.width
+        vidx_list = list(range(self.grid.get_num_tracks(self.size, vm_layer)))
+        margin = int(round(0.5 / self.grid.resolution))
+        for xwires, hwires in zip([vddx_warrs, vssx_warrs], [vdd_warrs, vss_warrs]):
+            for xwarr in xwires:
+                xtid = xwarr.track_id
+                xw = xtid.width
+                for xidx in xtid:
+                    # get all hm wires to connect to this one
+                    xlower, xupper = self.grid.get_wire_bounds(xm_layer, xidx, width=xw, unit_mode=True)
+                    hidx_list = []
+                    for hwarr in hwires:
+                        for hidx in hwarr.track_id:
+                            hlower, hupper = self.grid.get_wire_bounds(hm_layer, hidx, width=hw, unit_mode=True)
+                            if hlower >= xlower and hupper <= xupper:
+                                hidx_list.append(hidx)
+                    # get all available vm wires to use as vias
+                    avail_list = self.get_available_tracks(vm_layer, vidx_list, xlower, xupper,
+                                                           width=1, margin=margin, unit_mode=True)
+                    # connect
+                    vm_warr_list = []
+                    for vidx in avail_list:
+                        vm_warr_list.append(self.add_wires(vm_layer, vidx, xlower, xupper, unit_mode=True))
+                    self.connect_to_tracks(vm_warr_list, TrackID(xm_layer, xidx, width=xw))
+                    for hidx in hidx_list:
+                        self.connect_to_tracks(vm_warr_list, TrackID(hm_layer, hidx, width=hw))
+
+        self.add_pin('VDD', vddx_warrs, label='VDD:', show=show_pins)
+        self.add_pin('VSS', vssx_warrs, label='VSS:', show=show_pins)
+
+    def _connect_differential(self, port_list, ptr_idx, vm_layer_id, vm_width, vm_space, even_ports, odd_ports):
+        tr_idx_list = [ptr_idx, ptr_idx + vm_width + vm_space]
+        warr_list_list = [[], []]
+        for parity, warr_list in zip(('p', 'n'), warr_list_list):
+            ports = port_list[0]
+            for name_fmt in even_ports:
+                warr_list.append(ports.get_pin(name_fmt.format(parity)))
+            ports = port_list[1]
+            for name_fmt in odd_ports:
+                warr_list.append(ports.get_pin(name_fmt.format(parity)))
+
+        trp, trn = self.connect_matching_tracks(warr_list_list, vm_layer_id, tr_idx_list, width=vm_width)
+        return trp, trn
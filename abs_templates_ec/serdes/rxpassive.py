@@ -34,6 +34,7 @@ from bag.layout.routing import TrackID, WireArray
 from bag.layout.util import BBox
 
 from ..resistor.core import ResArrayBase
+from ..routing_util import TrackAllocator
 from ..analog_core import AnalogBase, SubstrateContact
 from ..passives.hp_filter import HighPassFilter
 
@@ -442,13 +443,16 @@ class BiasBusIO(TemplateBase):
         for lay, track, width in reserve_list:
             self.reserve_tracks(lay, track, width)
 
-        # draw supply wires
+        # draw supply wires.  The only wires on the supply layers are the reserved tracks.
+        track_allocs = {lay: TrackAllocator(self.grid, lay) for lay in wire_layers}
+        for lay, track, width in reserve_list:
+            track_allocs[lay].reserve(track, bus_wl, bus_wu, width=width)
         sup_warr_list = None
         sup_pitch = last_sup_track - bus_margin
         for lay in wire_layers:
             tr_max = self.grid.find_next_track(lay, bus_upper, mode=1, unit_mode=True)
             tr_idx_list = list(range(1, tr_max + 1, 2))
-            avail_list = self.get_available_tracks(lay, tr_idx_list, bus_wl, bus_wu, unit_mode=True)
+            avail_list = track_allocs[lay].get_available_tracks(tr_idx_list, bus_wl, bus_wu)
             # connect
             sup_warr_list = []
             for aidx in avail_list:
@@ -728,18 +732,14 @@ class CTLECore(ResArrayBase):
 
     def _connect_snake(self, nr1, nr2, ndumr, ndumc, io_width, show_pins):
         nrow_half = max(nr1, nr2) + ndumr
-        for idx in range(nr1):
-            if idx != 0:
-                self._connect_mirror(nrow_half, (idx - 1, ndumc), (idx, ndumc), 1, 0)
-                self._connect_mirror(nrow_half, (idx - 1, ndumc + 1), (idx, ndumc + 1), 1, 0)
-            if idx == nr1 - 1:
-                self._connect_mirror(nrow_half, (idx, ndumc), (idx, ndumc + 1), 1, 1)
-        for idx in range(nr2):
-            if idx != 0:
-                self._connect_mirror(nrow_half, (idx - 1, ndumc + 2), (idx, ndumc + 2), 1, 0)
-                self._connect_mirror(nrow_half, (idx - 1, ndumc + 3), (idx, ndumc + 3), 1, 0)
-            if idx == nr2 - 1:
-                self._connect_mirror(nrow_half, (idx, ndumc + 2), (idx, ndumc + 3), 1, 1)
+        # each resistor column is a vertical snake, and the two columns of r1/r2 are joined at the end.
+        group_list = []
+        for col_idx, num_res in ((ndumc, nr1), (ndumc + 2, nr2)):
+            if num_res > 0:
+                for cur_col in (col_idx, col_idx + 1):
+                    group_list.append([(idx - 1, cur_col, 1, idx, cur_col, 0) for idx in range(1, num_res)])
+                group_list.append([(num_res - 1, col_idx, 1, num_res - 1, col_idx + 1, 1)])
+        self._connect_mirror(nrow_half, group_list)
 
         # connect outp/outn
         outpl = self.get_res_ports(nrow_half, ndumc + 1)[0]
@@ -777,34 +777,53 @@ class CTLECore(ResArrayBase):
 
         return inp, inn, outp, outn, outcm_v
 
-    def _connect_mirror(self, offset, loc1, loc2, port1, port2):
-        r1, c1 = loc1
-        r2, c2 = loc2
-        for sgn in (-1, 1):
-            cur_r1 = offset + sgn * r1
-            cur_r2 = offset + sgn * r2
-            if sgn < 0:
-                cur_r1 -= 1
-                cur_r2 -= 1
-            if sgn < 0:
-                cur_port1 = 1 - port1
-                cur_port2 = 1 - port2
-            else:
-                cur_port1 = port1
-                cur_port2 = port2
-            wa1 = self.get_res_ports(cur_r1, c1)[cur_port1]
-            wa2 = self.get_res_ports(cur_r2, c2)[cur_port2]
+    def _connect_mirror(self, offset, group_list):
+        """Connect groups of resistor pairs and their mirror images about the given row.
+
+        Each pair is given as (row1, col1, port1, row2, col2, port2), with rows relative to offset.
+        The ports of all resistors are computed with a single get_res_ports_array() call.  In a
+        group, pairs on a single horizontal track are on distinct tracks from each other, so they
+        are connected with one connect_wires() call.  Other pairs all share the vertical track of
+        the group's first resistor column, but are connected separately so they are not shorted.
+        """
+        spec_list = []
+        for gidx, group in enumerate(group_list):
+            for r1, c1, port1, r2, c2, port2 in group:
+                spec_list.append((gidx, offset + r1, c1, port1, offset + r2, c2, port2))
+                # bottom half is flipped, so bottom and top ports are swapped.
+                spec_list.append((gidx, offset - r1 - 1, c1, 1 - port1, offset - r2 - 1, c2, 1 - port2))
+        if not spec_list:
+            return
+
+        gidx_list, r1_list, c1_list, port1_list, r2_list, c2_list, port2_list = zip(*spec_list)
+        ports1 = self.get_res_ports_array(r1_list, c1_list)
+        ports2 = self.get_res_ports_array(r2_list, c2_list)
+        wire_table = [[] for _ in group_list]
+        pair_table = [[] for _ in group_list]
+        for idx, (gidx, port1, port2) in enumerate(zip(gidx_list, port1_list, port2_list)):
+            wa1 = ports1[port1][idx]
+            wa2 = ports2[port2][idx]
             if wa1.track_id.base_index == wa2.track_id.base_index:
-                self.connect_wires([wa1, wa2])
+                wire_table[gidx].append(wa1)
+                wire_table[gidx].append(wa2)
             else:
+                pair_table[gidx].append((wa1, wa2))
+
+        for wire_list, pair_list in zip(wire_table, pair_table):
+            if wire_list:
+                self.connect_wires(wire_list)
+            if pair_list:
+                wa1 = pair_list[0][0]
                 vm_layer = wa1.layer_id + 1
-                vm = self.grid.coord_to_nearest_track(vm_layer, wa1.middle, half_track=True)
-                self.connect_to_tracks([wa1, wa2], TrackID(vm_layer, vm))
+                vm_tid = TrackID(vm_layer, self.grid.coord_to_nearest_track(vm_layer, wa1.middle, half_track=True))
+                for wa1, wa2 in pair_list:
+                    self.connect_to_tracks([wa1, wa2], vm_tid)
 
     def _connect_dummies(self, nr1, nr2, ndumr, ndumc, sup_name, show_pins):
         num_per_col = [0] * ndumc + [nr1, nr1, nr2, nr2] + [0] * ndumc
         nrow_half = max(nr1, nr2) + ndumr
-        bot_warrs, top_warrs = [], []
+        # list dummy segments of all columns, then get the ports of all dummies at once.
+        seg_list = []
         for col_idx, res_num in enumerate(num_per_col):
             if res_num == 0:
                 cur_ndum = nrow_half * 2
@@ -814,19 +833,25 @@ class CTLECore(ResArrayBase):
                 bot_idx_list = [0, nrow_half + res_num]
 
             for bot_idx in bot_idx_list:
-                top_idx = bot_idx + cur_ndum
-                warr_list = []
-                for ridx in range(bot_idx, top_idx):
-                    bp, tp = self.get_res_ports(ridx, col_idx)
-                    warr_list.append(bp)
-                    warr_list.append(tp)
-                vm_layer = warr_list[0].layer_id + 1
-                vm = self.grid.coord_to_nearest_track(vm_layer, warr_list[0].middle, half_track=True)
-                sup_warr = self.connect_to_tracks(warr_list, TrackID(vm_layer, vm))
-                if bot_idx == 0:
-                    bot_warrs.append(sup_warr)
-                if bot_idx != 0 or res_num == 0:
-                    top_warrs.append(sup_warr)
+                seg_list.append((col_idx, res_num, bot_idx, bot_idx + cur_ndum))
+
+        row_list = [ridx for _, _, bot_idx, top_idx in seg_list for ridx in range(bot_idx, top_idx)]
+        col_list = [col_idx for col_idx, _, bot_idx, top_idx in seg_list for _ in range(bot_idx, top_idx)]
+        bp_list, tp_list = self.get_res_ports_array(row_list, col_list)
+
+        bot_warrs, top_warrs = [], []
+        start = 0
+        for col_idx, res_num, bot_idx, top_idx in seg_list:
+            stop = start + top_idx - bot_idx
+            warr_list = [warr for bp_tp in zip(bp_list[start:stop], tp_list[start:stop]) for warr in bp_tp]
+            start = stop
+            vm_layer = warr_list[0].layer_id + 1
+            vm = self.grid.coord_to_nearest_track(vm_layer, warr_list[0].middle, half_track=True)
+            sup_warr = self.connect_to_tracks(warr_list, TrackID(vm_layer, vm))
+            if bot_idx == 0:
+                bot_warrs.append(sup_warr)
+            if bot_idx != 0 or res_num == 0:
+                top_warrs.append(sup_warr)
 
         hm_layer = bot_warrs[0].layer_id + 1
         hm_pitch = self.grid.get_track_pitch(hm_layer, unit_mode=True)
@@ -59,6 +59,18 @@ class RXFrontendCore(TemplateBase):
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
         # type: (TemplateDB, str, Dict[str, Any], Set[str], **Any) -> None
         super(RXFrontendCore, self).__init__(temp_db, lib_name, params, used_names, **kwargs)
+        self._bias_width = None
+        self._sup_layer = None
+
+    @property
+    def bias_width(self):
+        # type: () -> int
+        return self._bias_width
+
+    @property
+    def sup_layer(self):
+        # type: () -> int
+        return self._sup_layer
 
     @classmethod
     def get_default_param_values(cls):
@@ -105,6 +117,7 @@ class RXFrontendCore(TemplateBase):
         # type: () -> None
         show_pins = self.params['show_pins']
         clk_inst0, clk_inst1, core_inst, ctle_inst, vdd_list, vss_list, x0 = self._place()
+        self._bias_width = x0
 
         self.reexport(core_inst.get_port('even_outp_dlat<0>'), net_name='outp_data<0>', show=show_pins)
         self.reexport(core_inst.get_port('odd_outp_dlat<0>'), net_name='outp_data<1>', show=show_pins)
@@ -204,6 +217,7 @@ class RXFrontendCore(TemplateBase):
             self.reexport(clk_inst0.get_port(sup_name), label=sup_name + ':')
             self.reexport(clk_inst1.get_port(sup_name), label=sup_name + ':')
 
+        self._sup_layer = player
         vdd_indices = sup_indices[0::2]
         vss_indices = sup_indices[1::2]
         vdd_top_list, vss_top_list = [], []
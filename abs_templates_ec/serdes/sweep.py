@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+########################################################################################################################
+#
+# Copyright (c) 2014, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following
+#   disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the
+#    following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES,
+# INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+########################################################################################################################
+
+
+"""This module sweeps the parameters of serdes amplifier templates.
+
+Variants are grouped by their transistor row stack, so that variants in the same group share
+AnalogBase row and substrate masters in a single TemplateDB.  Groups are built serially or on
+a process pool, and build results are streamed to a CSV file.
+"""
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+# noinspection PyUnresolvedReferences,PyCompatibility
+from builtins import *
+
+from typing import Dict, Any, List, Tuple
+
+import csv
+import copy
+import time
+import itertools
+import multiprocessing
+
+from bag.layout.routing import RoutingGrid
+from bag.layout.template import TemplateBase, TemplateDB
+
+from ..routing_util import to_hashable
+from .amplifier import DiffAmp, IntegSummer, Tap1Summer
+
+# template classes supported by the sweep.
+sweep_classes = {
+    'DiffAmp': DiffAmp,
+    'IntegSummer': IntegSummer,
+    'Tap1Summer': Tap1Summer,
+}
+
+# parameters that determine the AnalogBase row stack and substrate masters.
+row_signature_keys = ('lch', 'ptap_w', 'ntap_w', 'w_dict', 'th_dict', 'gds_space', 'diff_space',
+                      'hm_width', 'hm_cur_width', 'min_fg_sep', 'guard_ring_nf')
+
+# columns of the CSV report, in order.  Swept parameter columns are inserted after temp_cls.
+report_columns = ('cell_name', 'temp_cls', 'group', 'width', 'height', 'num_fingers', 'port_tracks', 'build_time')
+
+
+def set_param(params, name, value):
+    # type: (Dict[str, Any], str, Any) -> None
+    """Set a possibly nested parameter value in place.
+
+    Parameters
+    ----------
+    params : Dict[str, Any]
+        the parameter dictionary.
+    name : str
+        the parameter name.  Nested dictionary entries and list items are separated by periods,
+        for example 'fg_dict.in' or 'gm_fg_list.0.tail'.
+    value : Any
+        the parameter value.
+    """
+    path = name.split('.')
+    obj = params
+    for key in path[:-1]:
+        obj = obj[int(key)] if isinstance(obj, list) else obj[key]
+    key = path[-1]
+    if isinstance(obj, list):
+        obj[int(key)] = value
+    else:
+        obj[key] = value
+
+
+def get_variants(specs):
+    # type: (Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[str]]
+    """Expand the sweep grids of the sweep specification dictionary into variants.
+
+    Parameters
+    ----------
+    specs : Dict[str, Any]
+        the sweep specification dictionary.  See generate_sweep() for details.
+
+    Returns
+    -------
+    var_list : List[Dict[str, Any]]
+        list of variants.  Each variant has entries cell_name, temp_cls, params and sweep_values.
+    sweep_names : List[str]
+        list of all swept parameter names.
+    """
+    cell_prefix = specs.get('cell_prefix', 'AMP')
+    var_list = []
+    sweep_names = []
+    for amp_specs in specs['amplifiers']:
+        cls_name = amp_specs['temp_cls']
+        if cls_name not in sweep_classes:
+            raise ValueError('Unsupported template class %s.  Must be one of %s.' %
+                             (cls_name, sorted(sweep_classes.keys())))
+
+        base_params = sweep_classes[cls_name].get_default_param_values()
+        base_params.update(amp_specs['params'])
+        base_params['show_pins'] = False
+        sweep = amp_specs.get('sweep', {})
+        names = sorted(sweep.keys())
+        for name in names:
+            if name not in sweep_names:
+                sweep_names.append(name)
+
+        for values in itertools.product(*(sweep[name] for name in names)):
+            params = copy.deepcopy(base_params)
+            for name, val in zip(names, values):
+                set_param(params, name, val)
+            var_list.append(dict(
+                cell_name='%s_%d' % (cell_prefix, len(var_list)),
+                temp_cls=cls_name,
+                params=params,
+                sweep_values=dict(zip(names, values)),
+            ))
+
+    return var_list, sweep_names
+
+
+def group_variants(var_list):
+    # type: (List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]
+    """Group variants by row stack signature.
+
+    Parameters
+    ----------
+    var_list : List[Dict[str, Any]]
+        list of variants.  The group index is recorded in each variant.
+
+    Returns
+    -------
+    groups : List[List[Dict[str, Any]]]
+        list of variant groups, in order of first appearance.
+    """
+    group_table = {}
+    groups = []
+    for var in var_list:
+        params = var['params']
+        sig = to_hashable([params.get(key, None) for key in row_signature_keys])
+        if sig not in group_table:
+            group_table[sig] = len(groups)
+            groups.append([])
+        var['group'] = group_table[sig]
+        groups[var['group']].append(var)
+    return groups
+
+
+def make_template_db(tech_info, specs):
+    # type: (Any, Dict[str, Any]) -> TemplateDB
+    """Create a new TemplateDB from the sweep specification dictionary.
+
+    Parameters
+    ----------
+    tech_info : Any
+        the TechInfo object.
+    specs : Dict[str, Any]
+        the sweep specification dictionary.
+
+    Returns
+    -------
+    temp_db : TemplateDB
+        the template database.
+    """
+    grid_specs = specs['routing_grid']
+    routing_grid = RoutingGrid(tech_info, grid_specs['layers'], grid_specs['spaces'],
+                               grid_specs['widths'], grid_specs['bot_dir'])
+    return TemplateDB(specs.get('template_libs', 'template_libs.def'), routing_grid, specs['lib_name'],
+                      use_cybagoa=specs.get('use_cybagoa', True))
+
+
+def get_port_tracks(template):
+    # type: (TemplateBase) -> str
+    """Returns the track locations of all signal ports of the given template.
+
+    Parameters
+    ----------
+    template : TemplateBase
+        the template.
+
+    Returns
+    -------
+    port_tracks : str
+        semicolon separated list of name=layer/track entries, sorted by port name.
+    """
+    entries = []
+    for name in sorted(template.port_names_iter()):
+        if name != 'VDD' and name != 'VSS':
+            tid = template.get_port(name).get_pins()[0].track_id
+            entries.append('%s=%d/%s' % (name, tid.layer_id, tid.base_index))
+    return ';'.join(entries)
+
+
+def build_group(temp_db, group):
+    # type: (TemplateDB, List[Dict[str, Any]]) -> Tuple[List[TemplateBase], List[Dict[str, Any]]]
+    """Build a group of variants in the given template database.
+
+    Parameters
+    ----------
+    temp_db : TemplateDB
+        the template database.  All variants in the group share row and substrate masters through
+        this database.
+    group : List[Dict[str, Any]]
+        list of variants to build.
+
+    Returns
+    -------
+    temp_list : List[TemplateBase]
+        list of constructed templates.
+    rows : List[Dict[str, Any]]
+        list of report rows.
+    """
+    temp_list = []
+    rows = []
+    for var in group:
+        start = time.time()
+        template = temp_db.new_template(params=var['params'], temp_cls=sweep_classes[var['temp_cls']], debug=False)
+        build_time = time.time() - start
+
+        box = template.bound_box
+        row = dict(
+            cell_name=var['cell_name'],
+            temp_cls=var['temp_cls'],
+            group=var['group'],
+            width=box.width,
+            height=box.height,
+            num_fingers=template.num_fingers,
+            port_tracks=get_port_tracks(template),
+            build_time=build_time,
+        )
+        row.update(var['sweep_values'])
+        temp_list.append(template)
+        rows.append(row)
+
+    return temp_list, rows
+
+
+def _build_group_worker(args):
+    # type: (Tuple[Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]
+    """Worker process function that builds a group of variants in its own template database."""
+    from bag.core import create_tech_info
+
+    specs, group = args
+    temp_db = make_template_db(create_tech_info(), specs)
+    return build_group(temp_db, group)[1]
+
+
+def generate_sweep(prj, specs, num_workers=1, instantiate=False):
+    # type: (Any, Dict[str, Any], int, bool) -> List[Dict[str, Any]]
+    """Build all variants of a serdes amplifier parameter sweep.
+
+    The sweep specification dictionary has the following entries:
+
+    lib_name : str
+        the layout library name.
+    routing_grid : Dict[str, Any]
+        routing grid specification, with entries layers, spaces, widths and bot_dir.
+    amplifiers : List[Dict[str, Any]]
+        list of amplifier sweeps.  Each sweep has entries temp_cls (DiffAmp, IntegSummer or
+        Tap1Summer), params (the base parameters), and sweep (a dictionary from parameter name
+        to list of values).  Variants are the cartesian product of all swept values.  Nested
+        parameters are separated by periods, for example 'fg_dict.in' or 'w_dict.tail'.
+    csv_fname : str
+        the CSV report file name.  Defaults to '<lib_name>_sweep.csv'.
+    cell_prefix : str
+        the variant cell name prefix.  Defaults to 'AMP'.
+
+    Variants with the same row stack parameters are built in the same TemplateDB, so they share
+    AnalogBase row and substrate masters.  If num_workers is greater than 1, groups are built in
+    worker processes, and layouts are not instantiated.  Report rows are written to the CSV file
+    as soon as each variant (serial mode) or group (parallel mode) is built.
+
+    Parameters
+    ----------
+    prj : Any
+        the BagProject instance.
+    specs : Dict[str, Any]
+        the sweep specification dictionary.
+    num_workers : int
+        number of worker processes.
+    instantiate : bool
+        True to instantiate the layouts of all variants.  Ignored in parallel mode.
+
+    Returns
+    -------
+    report : List[Dict[str, Any]]
+        list of report rows, sorted by cell name order.
+    """
+    var_list, sweep_names = get_variants(specs)
+    if not var_list:
+        raise ValueError('No amplifier variants to build.')
+    groups = group_variants(var_list)
+
+    columns = list(report_columns)
+    columns[2:2] = sweep_names
+    csv_fname = specs.get('csv_fname', '%s_sweep.csv' % specs['lib_name'])
+    report = []
+    with open(csv_fname, 'w') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval='')
+        writer.writeheader()
+
+        if num_workers > 1:
+            # largest groups first, so that workers finish at roughly the same time.
+            groups = sorted(groups, key=len, reverse=True)
+            pool = multiprocessing.Pool(processes=num_workers)
+            try:
+                for rows in pool.imap_unordered(_build_group_worker, [(specs, group) for group in groups]):
+                    writer.writerows(rows)
+                    f.flush()
+                    report.extend(rows)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            temp_db = make_template_db(prj.tech_info, specs)
+            temp_list = []
+            for group in groups:
+                for var in group:
+                    cur_temps, rows = build_group(temp_db, [var])
+                    writer.writerows(rows)
+                    f.flush()
+                    temp_list.extend(cur_temps)
+                    report.extend(rows)
+            if instantiate:
+                temp_db.batch_layout(prj, temp_list, [row['cell_name'] for row in report])
+
+    var_order = {var['cell_name']: idx for idx, var in enumerate(var_list)}
+    report.sort(key=lambda row: var_order[row['cell_name']])
+    print_report(report, len(groups))
+    return report
+
+
+def print_report(report, num_groups):
+    # type: (List[Dict[str, Any]], int) -> None
+    """Print a summary of the sweep.
+
+    Parameters
+    ----------
+    report : List[Dict[str, Any]]
+        list of report rows.
+    num_groups : int
+        number of row stack groups.
+    """
+    print('%d variants built in %d row stack groups.' % (len(report), num_groups))
+    fmt = '%-20s %-12s %6s %10s %10s %8s %10s'
+    print(fmt % ('cell', 'class', 'group', 'width', 'height', 'fg', 'time (s)'))
+    for row in report:
+        print('%-20s %-12s %6d %10.3f %10.3f %8d %10.3f' %
+              (row['cell_name'], row['temp_cls'], row['group'], row['width'], row['height'],
+               row['num_fingers'], row['build_time']))
@@ -37,6 +37,7 @@ from bag.layout.template import TemplateBase, TemplateDB
 
 from ..resistor.core import ResArrayBase
 from ..analog_core import SubstrateContact, AnalogBase, AnalogBaseInfo
+from ..routing_util import get_min_track_width
 
 
 class LoadResistor(ResArrayBase):
@@ -359,11 +360,11 @@ class CMLCorePMOS(AnalogBase):
 
         # find number of tracks needed for output/tail tracks from EM specs
         hm_layer = layout_info.mconn_port_layer + 1
-        hm_width = self.grid.get_min_track_width(hm_layer, **em_specs)
+        hm_width = get_min_track_width(self.grid, hm_layer, em_specs)
         hm_space = self.grid.get_num_space_tracks(hm_layer, hm_width)
         vm_layer = hm_layer + 1
         hm_width_layout = self.grid.get_track_width(hm_layer, hm_width)
-        vm_width = self.grid.get_min_track_width(vm_layer, bot_w=hm_width_layout, **em_specs)
+        vm_width = get_min_track_width(self.grid, vm_layer, em_specs, bot_w=hm_width_layout)
 
         # find number of tracks needed for current reference from EM specs
         cur_ratio = fg / fg_ref
@@ -372,7 +373,7 @@ class CMLCorePMOS(AnalogBase):
         for key in ['idc', 'iac_rms', 'iac_peak']:
             if key in ref_em_specs:
                 ref_em_specs[key] *= num_seg / cur_ratio
-        hm_width_ref = self.grid.get_min_track_width(hm_layer, **ref_em_specs)
+        hm_width_ref = get_min_track_width(self.grid, hm_layer, ref_em_specs)
         hm_space_ref = self.grid.get_num_space_tracks(hm_layer, hm_width_ref)
 
         input_space = max(input_space, hm_space_ref, hm_space)
@@ -615,16 +616,8 @@ class CMLDriverPMOS(TemplateBase):
         prev_layer = warrs[0].track_id.layer_id
         prev_width_layout = self.grid.get_track_width(prev_layer, warrs[0].track_id.width)
         for cur_layer in range(prev_layer + 1, top_layer):
-            cur_width = self.grid.get_min_track_width(cur_layer, **em_specs, bot_w=prev_width_layout)
-
             # make sure we can draw via to next layer up
-            good = False
-            while not good:
-                try:
-                    self.grid.get_via_extensions(cur_layer, cur_width, 1)
-                    good = True
-                except ValueError:
-                    cur_width += 1
+            cur_width = get_min_track_width(self.grid, cur_layer, em_specs, bot_w=prev_width_layout, via_up=True)
 
             cur_warrs = []
             for warr in warrs:
@@ -643,7 +636,7 @@ class CMLDriverPMOS(TemplateBase):
             if key in new_em_specs:
                 new_em_specs[key] *= num_seg
 
-        top_width = self.grid.get_min_track_width(top_layer, **new_em_specs)
+        top_width = get_min_track_width(self.grid, top_layer, new_em_specs)
         tr = self.grid.coord_to_nearest_track(top_layer, warrs[0].middle)
         tid = TrackID(top_layer, tr, width=top_width)
         warr = self.connect_to_tracks(warrs, tid)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+import yaml
+
+import bag
+from abs_templates_ec.serdes.sweep import generate_sweep
+
+# Example sweep specification file:
+#
+# lib_name: AAAFOO_amp_sweep
+# cell_prefix: DIFFAMP
+# csv_fname: diffamp_sweep.csv
+# routing_grid:
+#   layers: [4, 5, 6, 7]
+#   spaces: [0.084, 0.080, 0.084, 0.080]
+#   widths: [0.060, 0.100, 0.060, 0.100]
+#   bot_dir: 'x'
+# amplifiers:
+#   - temp_cls: DiffAmp
+#     params:
+#       lch: 16.0e-9
+#       ptap_w: 6
+#       ntap_w: 6
+#       w_dict: {load: 6, casc: 4, in: 4, tail: 4}
+#       th_dict: {load: ulvt, casc: ulvt, in: ulvt, tail: ulvt}
+#       fg_dict: {load: 2, casc: 4, in: 4, tail: 4}
+#       min_fg_sep: 4
+#       hm_cur_width: 2
+#     sweep:
+#       fg_dict.in: [2, 4, 6, 8]
+#       fg_dict.tail: [4, 8]
+#       th_dict.in: [ulvt, svt]
+
+
+if __name__ == '__main__':
+
+    spec_fname = sys.argv[1] if len(sys.argv) > 1 else 'amp_sweep.yaml'
+    num_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    with open(spec_fname, 'r') as f:
+        sweep_specs = yaml.load(f)
+
+    local_dict = locals()
+    if 'bprj' not in local_dict:
+        print('creating BAG project')
+        bprj = bag.BagProject()
+
+        generate_sweep(bprj, sweep_specs, num_workers=num_workers)
+    else:
+        print('loading BAG project')
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+import yaml
+
+import bag
+from abs_templates_ec.laygo.library import generate_library
+
+# Example library specification file:
+#
+# lib_name: AAAFOO_laygo_lib
+# routing_grid:
+#   layers: [1, 2, 3, 4, 5]
+#   spaces: [0.052, 0.05, 0.05, 0.05, 0.05]
+#   widths: [0.04, 0.04, 0.04, 0.04, 0.04]
+#   bot_dir: 'y'
+# config:
+#   lch: 16.0e-9
+#   ...
+# cells:
+#   - cell_name: NAND_GATE
+#     temp_cls: nand.NAND
+#     params: {threshold: ulvt, draw_boundaries: true, num_blk: 2, show_pins: true}
+#   - cell_name: STACK_DRIVER
+#     temp_cls: stack_driver.StackDriver
+#     params: {...}
+
+
+if __name__ == '__main__':
+
+    spec_fname = sys.argv[1] if len(sys.argv) > 1 else 'laygo_lib.yaml'
+    num_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    with open(spec_fname, 'r') as f:
+        lib_specs = yaml.load(f)
+
+    local_dict = locals()
+    if 'bprj' not in local_dict:
+        print('creating BAG project')
+        bprj = bag.BagProject()
+
+        generate_library(bprj, lib_specs, num_workers=num_workers)
+    else:
+        print('loading BAG project')
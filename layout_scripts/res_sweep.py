@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+import yaml
+
+import bag
+from abs_templates_ec.resistor.sweep import generate_candidates
+
+# Example sweep specification file:
+#
+# lib_name: AAAFOO_res_sweep
+# cell_prefix: RLADDER
+# routing_grid:
+#   layers: [4, 5, 6, 7]
+#   spaces: [0.084, 0.080, 0.084, 0.080]
+#   widths: [0.060, 0.100, 0.060, 0.100]
+#   bot_dir: 'x'
+# res_params: {l: 2.0e-6, w: 0.4e-6, sub_type: ntap, threshold: standard, grid_type: low_res}
+# targets: [1000.0, 2000.0, 4000.0]
+# r_unit: 500.0
+# common_centroid: true
+# ndum_list: [1, 2]
+# num_build: 5
+
+
+if __name__ == '__main__':
+
+    spec_fname = sys.argv[1] if len(sys.argv) > 1 else 'res_sweep.yaml'
+    num_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    with open(spec_fname, 'r') as f:
+        sweep_specs = yaml.load(f)
+
+    local_dict = locals()
+    if 'bprj' not in local_dict:
+        print('creating BAG project')
+        bprj = bag.BagProject()
+
+        generate_candidates(bprj, sweep_specs, num_workers=num_workers)
+    else:
+        print('loading BAG project')
@@ -5,14 +5,14 @@ import pprint
 import bag
 from abs_templates_ec.serdes.rxcore import RXCore
 from abs_templates_ec.serdes.rxtop import RXFrontendCore
+from abs_templates_ec.serdes.rxarray import RXFrontendArray
+from abs_templates_ec.serdes.base import get_info_cache_stats
 from bag.layout import RoutingGrid, TemplateDB
 
 # impl_lib = 'craft_io_ec'
 
 
-def rxfrontend(prj, temp_db):
-    cell_name = 'rx_frontend'
-
+def get_rxfrontend_params():
     params = dict(
         lch=16e-9,
         w_dict={'load': 3, 'casc': 4, 'in': 3, 'sw': 3, 'tail': 3},
@@ -134,11 +134,31 @@ def rxfrontend(prj, temp_db):
         dlev_cap_params=dlev_cap_params,
     )
 
+    return layout_params
+
+
+def rxfrontend(prj, temp_db):
+    cell_name = 'rx_frontend'
+
+    layout_params = get_rxfrontend_params()
+
     pprint.pprint(layout_params)
     template = temp_db.new_template(params=layout_params, temp_cls=RXFrontendCore, debug=False)
     temp_db.instantiate_layout(prj, template, cell_name, debug=True)
 
 
+def rxfrontend_array(prj, temp_db, num_lanes=8):
+    cell_name = 'rx_frontend_x%d' % num_lanes
+
+    layout_params = dict(
+        frontend_params=get_rxfrontend_params(),
+        num_lanes=num_lanes,
+    )
+
+    template = temp_db.new_template(params=layout_params, temp_cls=RXFrontendArray, debug=False)
+    temp_db.instantiate_layout(prj, template, cell_name, debug=True)
+
+
 def rxcore(prj, temp_db):
     cell_name = 'rxcore_ffe1_dfe4'
 
@@ -204,6 +224,8 @@ def rxcore(prj, temp_db):
     pprint.pprint(layout_params)
     template = temp_db.new_template(params=layout_params, temp_cls=RXCore, debug=False)
     print('total number of fingers: %d' % template.num_fingers)
+    info_stats = get_info_cache_stats()
+    print('layout info requests: %d, served from cache: %d' % (info_stats['calls'], info_stats['hits']))
     temp_db.instantiate_layout(prj, template, cell_name, debug=True)
     return template.sch_params
 
@@ -239,5 +261,6 @@ if __name__ == '__main__':
         # sch_params = rxcore(bprj, tdb)
         # rxcore_sch(bprj, sch_params)
         rxfrontend(bprj, tdb)
+        # rxfrontend_array(bprj, tdb, num_lanes=32)
     else:
         print('loading BAG project')
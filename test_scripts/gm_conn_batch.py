@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""Compare serdes amplifiers built with batched and with per-stage Gm connections.
+
+Each template is built on fresh template databases with SerdesRXBase.batch_gm_conn set to False
+and to True.  The port geometries are compared, and all wires and vias drawn in the top level
+template are recorded and compared.  Wire intervals on the same track are merged before comparison
+and duplicate vias are removed, since per-stage connection draws overlapping wires that are merged
+afterwards.
+
+Example specification file:
+
+routing_grid:
+  layers: [4, 5, 6, 7]
+  spaces: [0.084, 0.080, 0.084, 0.080]
+  widths: [0.060, 0.100, 0.060, 0.100]
+  bot_dir: 'x'
+common:
+  lch: !!float 16e-9
+  ptap_w: 6
+  ntap_w: 6
+  w_dict: {load: 3, casc: 4, in: 3, sw: 3, tail: 3}
+  th_dict: {load: 'ulvt', casc: 'ulvt', in: 'ulvt', sw: 'ulvt', tail: 'svt'}
+  nduml: 4
+  ndumr: 4
+  min_fg_sep: 4
+  gds_space: 1
+  diff_space: 1
+  hm_width: 1
+  hm_cur_width: 2
+  show_pins: True
+  guard_ring_nf: 0
+templates:
+  DiffAmp:
+    fg_dict: {load: 4, casc: 8, in: 6, sw: 4, tail: 8}
+    tail_decap: False
+    flip_sd: False
+  IntegSummer:
+    fg_load: 12
+    gm_fg_list:
+      - {in: 2, sw: 2, tail: 4, ref: 2}
+      - {casc: 4, in: 2, sw: 2, tail: 4}
+      - {in: 4, tail: 2, ref: 2}
+      - {in: 4, sw: 2, tail: 2, ref: 2}
+    flip_sd_list: [True, False, True, True]
+    sgn_list: [1, -1, -1, -1]
+  Tap1Summer:
+    fg_load: 8
+    gm_fg_list:
+      - {casc: 10, in: 8, sw: 4, tail: 12}
+      - {casc: 8, in: 8, sw: 4, tail: 2}
+    flip_sd_list: [False, False]
+    sgn_list: [1, -1]
+"""
+
+import sys
+import inspect
+
+import yaml
+
+from bag.core import BagProject
+from bag.layout import RoutingGrid, TemplateDB
+from bag.layout.template import TemplateBase
+
+from abs_templates_ec.serdes.base import SerdesRXBase
+from abs_templates_ec.serdes.amplifier import DiffAmp, IntegSummer, Tap1Summer
+
+temp_cls_table = dict(
+    DiffAmp=DiffAmp,
+    IntegSummer=IntegSummer,
+    Tap1Summer=Tap1Summer,
+)
+
+# TemplateBase methods to record when building templates.
+record_methods = ('add_wires', 'add_via', 'add_via_on_grid')
+
+
+def make_tdb(prj, target_lib, specs):
+    grid_specs = specs['routing_grid']
+    layers = grid_specs['layers']
+    spaces = grid_specs['spaces']
+    widths = grid_specs['widths']
+    bot_dir = grid_specs['bot_dir']
+
+    routing_grid = RoutingGrid(prj.tech_info, layers, spaces, widths, bot_dir)
+    tdb = TemplateDB('template_libs.def', routing_grid, target_lib, use_cybagoa=True)
+    return tdb
+
+
+def _make_recorder(fun):
+    def recorder(self, *args, **kwargs):
+        call_args = inspect.getcallargs(fun, self, *args, **kwargs)
+        del call_args['self']
+        self.__dict__.setdefault('_draw_record', []).append((fun.__name__, call_args))
+        return fun(self, *args, **kwargs)
+
+    recorder.__name__ = fun.__name__
+    return recorder
+
+
+def _to_unit(val, res, unit_mode):
+    return val if unit_mode else int(round(val / res))
+
+
+def _merge_intervals(intv_list):
+    merged = []
+    for lower, upper in sorted(intv_list):
+        if merged and lower <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], upper)
+        else:
+            merged.append([lower, upper])
+    return [tuple(intv) for intv in merged]
+
+
+def get_draw_summary(template):
+    """Returns the merged wires and unique vias drawn in the given template."""
+    res = template.grid.resolution
+    wire_table = {}
+    via_set = set()
+    for name, args in template.__dict__.get('_draw_record', []):
+        unit_mode = args.get('unit_mode', False)
+        if name == 'add_wires':
+            lower = _to_unit(args['lower'], res, unit_mode)
+            upper = _to_unit(args['upper'], res, unit_mode)
+            for idx in range(args['num']):
+                key = (args['layer_id'], args['track_idx'] + idx * args['pitch'], args['width'])
+                wire_table.setdefault(key, []).append((lower, upper))
+        elif name == 'add_via':
+            bbox = args['bbox']
+            via_set.add(('via', bbox.left_unit, bbox.bottom_unit, bbox.right_unit, bbox.top_unit,
+                         args['bot_layer'], args['top_layer'], args['bot_dir'], args['nx'], args['ny'],
+                         _to_unit(args['spx'], res, unit_mode), _to_unit(args['spy'], res, unit_mode)))
+        else:
+            via_set.add(('via_on_grid', args['bot_layer_id'], args['bot_track'], args['top_track'],
+                         args['bot_width'], args['top_width']))
+
+    wire_list = sorted((key, _merge_intervals(intv_list)) for key, intv_list in wire_table.items())
+    return wire_list, sorted(via_set, key=repr)
+
+
+def get_port_summary(template):
+    port_info = []
+    for name in sorted(template.port_names_iter()):
+        pin_list = []
+        for warr in template.get_port(name).get_pins():
+            tid = warr.track_id
+            pin_list.append((warr.layer_id, tid.base_index, tid.num, tid.pitch, tid.width,
+                             warr.lower, warr.upper))
+        port_info.append((name, sorted(pin_list)))
+    return template.size, template.array_box, port_info
+
+
+def build_templates(prj, target_lib, specs, batch_gm_conn):
+    temp_db = make_tdb(prj, target_lib, specs)
+    orig_batch = SerdesRXBase.batch_gm_conn
+    orig_funs = [(name, getattr(TemplateBase, name)) for name in record_methods]
+    SerdesRXBase.batch_gm_conn = batch_gm_conn
+    for name, fun in orig_funs:
+        setattr(TemplateBase, name, _make_recorder(fun))
+    try:
+        result = {}
+        for cls_name, temp_params in sorted(specs['templates'].items()):
+            params = specs['common'].copy()
+            params.update(temp_params)
+            template = temp_db.new_template(params=params, temp_cls=temp_cls_table[cls_name], debug=False)
+            result[cls_name] = get_port_summary(template), get_draw_summary(template)
+    finally:
+        SerdesRXBase.batch_gm_conn = orig_batch
+        for name, fun in orig_funs:
+            setattr(TemplateBase, name, fun)
+
+    return result
+
+
+def run_compare(prj, specs):
+    target_lib = 'AAAFOO_gm_conn_batch'
+    ref_table = build_templates(prj, target_lib, specs, False)
+    new_table = build_templates(prj, target_lib, specs, True)
+
+    num_fail = 0
+    for cls_name in sorted(ref_table.keys()):
+        (ref_ports, (ref_wires, ref_vias)) = ref_table[cls_name]
+        (new_ports, (new_wires, new_vias)) = new_table[cls_name]
+        fail_list = []
+        if ref_ports != new_ports:
+            fail_list.append('ports')
+        if ref_wires != new_wires:
+            fail_list.append('wires')
+        if ref_vias != new_vias:
+            fail_list.append('vias')
+        if fail_list:
+            num_fail += 1
+            print('%s: mismatch in %s.' % (cls_name, ', '.join(fail_list)))
+        else:
+            print('%s: matched, %d ports, %d wire tracks, %d vias.' % (cls_name, len(ref_ports[2]),
+                                                                      len(ref_wires), len(ref_vias)))
+
+    print('%d/%d templates matched.' % (len(ref_table) - num_fail, len(ref_table)))
+    return num_fail
+
+
+if __name__ == '__main__':
+
+    spec_fname = sys.argv[1] if len(sys.argv) > 1 else 'test_specs/gm_conn_batch.yaml'
+
+    with open(spec_fname, 'r') as f:
+        block_specs = yaml.load(f)
+
+    local_dict = locals()
+    if 'bprj' not in local_dict:
+        print('creating BAG project')
+        bprj = BagProject()
+
+        if run_compare(bprj, block_specs) > 0:
+            sys.exit(1)
+    else:
+        print('loading BAG project')
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""Randomized equivalence check of ResTech.check_density_rule_core().
+
+The closed form solver is compared against the original exhaustive search, which is kept
+here as the reference implementation.
+"""
+
+import sys
+import math
+import random
+
+from abs_templates_ec.resistor.base import ResTech
+
+
+class DensityTech(ResTech):
+    """A ResTech with configurable density.  Only used through class methods."""
+    density = 0.5
+
+    @classmethod
+    def get_res_density(cls):
+        return cls.density
+
+
+def check_density_rule_ref(wres, hres, wblk, hblk, ares, ext_dir, density):
+    """The original exhaustive search implementation of check_density_rule_core()."""
+    nxblk = wres // wblk
+    nyblk = hres // hblk
+
+    ares = float(ares)
+    if ares < wres * hres * density:
+        return nxblk, nyblk
+
+    nxblk_max = int(math.ceil(ares / density / hres / wblk))
+    nyblk_max = int(math.ceil(ares / density / wres / hblk))
+    if ext_dir == 'x':
+        return nxblk_max, nyblk
+    elif ext_dir == 'y':
+        return nxblk, nyblk_max
+
+    opt = nxblk, nyblk_max
+    opt_area = nxblk * nyblk_max * wblk * hblk
+    for nxblk_cur in range(nxblk + 1, nxblk_max + 1):
+        wcur = nxblk_cur * wblk
+        for nyblk_cur in range(nyblk, nyblk_max + 1):
+            acur = wcur * nyblk_cur * hblk
+            if acur >= opt_area:
+                break
+            if ares < acur * density:
+                opt_area = acur
+                opt = nxblk_cur, nyblk_cur
+
+    return opt
+
+
+def run_check(num_trials, seed):
+    rand = random.Random(seed)
+    density_list = [0.1, 0.25, 0.3, 0.4, 0.5, 0.6, 0.75, 0.8, 0.95]
+    ext_list = [None, None, None, 'x', 'y']
+    num_fail = 0
+    for _ in range(num_trials):
+        wblk = rand.randint(1, 40) * 10
+        hblk = rand.randint(1, 40) * 10
+        wres = wblk * rand.randint(1, 30)
+        hres = hblk * rand.randint(1, 30)
+        ares = rand.randint(1, 2 * wres * hres)
+        ext_dir = rand.choice(ext_list)
+        DensityTech.density = rand.choice(density_list)
+
+        expect = check_density_rule_ref(wres, hres, wblk, hblk, ares, ext_dir, DensityTech.density)
+        actual = DensityTech.check_density_rule_core(wres, hres, wblk, hblk, ares, ext_dir)
+        if tuple(actual) != tuple(expect):
+            num_fail += 1
+            print('mismatch: wres=%d, hres=%d, wblk=%d, hblk=%d, ares=%d, ext_dir=%s, density=%.2f, '
+                  'expect=%s, actual=%s' % (wres, hres, wblk, hblk, ares, ext_dir, DensityTech.density,
+                                            expect, actual))
+
+    print('%d/%d trials matched.' % (num_trials - num_fail, num_trials))
+    return num_fail
+
+
+if __name__ == '__main__':
+
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rand_seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    if run_check(trials, rand_seed) > 0:
+        sys.exit(1)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+"""Compare resistor templates built with and without the resistor routing grid cache.
+
+A library of TerminationCore templates is built on fresh template databases, with get_res_grid()
+caching and with a new resistor routing grid for every template.  All resistor and routing caches
+are cleared before each build, and the two builds alternate over several repeats, so neither build
+benefits from caches warmed by the other.  The template sizes and pin geometries are compared, and
+the best and average generation times are reported.
+
+Example specification file:
+
+routing_grid:
+  layers: [1, 2, 3]
+  spaces: [0.052, 0.052, 0.052]
+  widths: [0.048, 0.048, 0.048]
+  bot_dir: 'x'
+params:
+  l: 1.0e-6
+  w: 0.5e-6
+  sub_type: ntap
+  threshold: ulvt
+  res_type: standard
+  em_specs: {}
+sweep:
+  nx: [2, 4, 6, 8, 10]
+  ny: [1, 2, 3, 4, 5]
+  l: [1.0e-6, 2.0e-6]
+"""
+
+import sys
+import time
+import itertools
+
+import yaml
+
+from bag.core import BagProject
+from bag.layout import RoutingGrid, TemplateDB
+
+import abs_templates_ec.routing_util as routing_util
+import abs_templates_ec.resistor.base as res_base
+import abs_templates_ec.resistor.core as res_core
+from abs_templates_ec.resistor.core import TerminationCore
+
+
+def make_tdb(prj, target_lib, specs):
+    grid_specs = specs['routing_grid']
+    layers = grid_specs['layers']
+    spaces = grid_specs['spaces']
+    widths = grid_specs['widths']
+    bot_dir = grid_specs['bot_dir']
+
+    routing_grid = RoutingGrid(prj.tech_info, layers, spaces, widths, bot_dir)
+    tdb = TemplateDB('template_libs.def', routing_grid, target_lib, use_cybagoa=True)
+    return tdb
+
+
+def get_params_list(specs):
+    base_params = specs['params']
+    sweep = specs['sweep']
+    sweep_keys = sorted(sweep.keys())
+    params_list = []
+    for values in itertools.product(*(sweep[key] for key in sweep_keys)):
+        params = base_params.copy()
+        params.update(zip(sweep_keys, values))
+        params_list.append(params)
+    return params_list
+
+
+def get_template_summary(template):
+    port_info = []
+    for name in sorted(template.port_names_iter()):
+        pin_list = []
+        for warr in template.get_port(name).get_pins():
+            tid = warr.track_id
+            pin_list.append((warr.layer_id, tid.base_index, tid.num, tid.pitch, tid.width,
+                             warr.lower, warr.upper))
+        port_info.append((name, sorted(pin_list)))
+    return template.size, template.array_box, port_info
+
+
+def clear_caches():
+    routing_util._track_width_cache.clear()
+    res_base._fill_table_cache.clear()
+    res_base._res_info_cache.clear()
+    res_base._res_port_cache.clear()
+    res_core._res_grid_cache.clear()
+
+
+def build_library(prj, target_lib, specs, params_list, use_cache):
+    temp_db = make_tdb(prj, target_lib, specs)
+    clear_caches()
+    orig_fun = res_core.get_res_grid
+    if not use_cache:
+        res_core.get_res_grid = res_core.make_res_grid
+    try:
+        start = time.time()
+        temp_list = [temp_db.new_template(params=params, temp_cls=TerminationCore, debug=False)
+                     for params in params_list]
+        elapsed = time.time() - start
+    finally:
+        res_core.get_res_grid = orig_fun
+
+    num_grids = len(res_core._res_grid_cache)
+    return [get_template_summary(temp) for temp in temp_list], elapsed, num_grids
+
+
+def run_compare(prj, specs, num_repeat=3):
+    target_lib = 'AAAFOO_res_grid_cache'
+    params_list = get_params_list(specs)
+    print('building %d resistor templates, %d repeats.' % (len(params_list), num_repeat))
+
+    ref_list = new_list = None
+    t_ref_list, t_new_list = [], []
+    num_grids = 0
+    for idx in range(num_repeat):
+        # alternate build order between repeats
+        for use_cache in ((False, True) if idx % 2 == 0 else (True, False)):
+            summary, elapsed, cur_grids = build_library(prj, target_lib, specs, params_list, use_cache)
+            if use_cache:
+                new_list = summary
+                t_new_list.append(elapsed)
+                num_grids = cur_grids
+            else:
+                ref_list = summary
+                t_ref_list.append(elapsed)
+
+    num_fail = 0
+    for params, ref, new in zip(params_list, ref_list, new_list):
+        if ref != new:
+            num_fail += 1
+            print('mismatch for parameters: %s' % params)
+
+    print('%d/%d templates matched.' % (len(params_list) - num_fail, len(params_list)))
+    print('without cache: best %.4g s, mean %.4g s' % (min(t_ref_list), sum(t_ref_list) / num_repeat))
+    print('with cache: best %.4g s, mean %.4g s, cached grids: %d' %
+          (min(t_new_list), sum(t_new_list) / num_repeat, num_grids))
+    return num_fail
+
+
+if __name__ == '__main__':
+
+    spec_fname = sys.argv[1] if len(sys.argv) > 1 else 'test_specs/res_grid_cache.yaml'
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with open(spec_fname, 'r') as f:
+        block_specs = yaml.load(f)
+
+    local_dict = locals()
+    if 'bprj' not in local_dict:
+        print('creating BAG project')
+        bprj = BagProject()
+
+        run_compare(bprj, block_specs, num_repeat=repeats)
+    else:
+        print('loading BAG project')
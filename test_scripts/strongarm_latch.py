@@ -23,13 +23,19 @@
 ########################################################################################################################
 
 
-"""This script tests that AnalogBase draws rows of transistors properly."""
+"""This script tests that AnalogBase draws rows of transistors properly.
 
-from typing import Dict, Any, Set
+If ref_num_nblk is specified, a reference latch with that number of nmos blocks is also built, and the
+rows that are the same in both latches are copied from the reference latch with LaygoBase.copy_rows().
+The copied rows are then checked against the rows of a latch drawn from scratch.
+"""
+
+from typing import Dict, Any, Set, List, Tuple
 
 import yaml
 
 from bag import BagProject
+from bag.layout.objects import Instance
 from bag.layout.routing import RoutingGrid, TrackID
 from bag.layout.template import TemplateDB
 
@@ -57,6 +63,39 @@ class StrongArmLatch(LaygoBase):
     def __init__(self, temp_db, lib_name, params, used_names, **kwargs):
         # type: (TemplateDB, str, Dict[str, Any], Set[str], **Any) -> None
         super(StrongArmLatch, self).__init__(temp_db, lib_name, params, used_names, **kwargs)
+        self._row_plan = None
+        self._copied_rows = []
+
+    @property
+    def row_plan(self):
+        # type: () -> Dict[int, Tuple[int, ...]]
+        """Returns a dictionary from row index to the block counts that determine the row placement."""
+        return self._row_plan
+
+    @property
+    def copied_rows(self):
+        # type: () -> List[int]
+        """Returns the list of rows copied from the reference latch."""
+        return self._copied_rows
+
+    @classmethod
+    def get_default_param_values(cls):
+        # type: () -> Dict[str, Any]
+        """Returns a dictionary containing default parameter values.
+
+        Override this method to define default parameter values.  As good practice,
+        you should avoid defining default values for technology-dependent parameters
+        (such as channel length, transistor width, etc.), but only define default
+        values for technology-independent parameters (such as number of tracks).
+
+        Returns
+        -------
+        default_params : dict[str, any]
+            dictionary of default parameter values.
+        """
+        return dict(
+            ref_num_nblk=None,
+        )
 
     @classmethod
     def get_params_info(cls):
@@ -78,6 +117,7 @@ class StrongArmLatch(LaygoBase):
             num_nand_blk='number of nand blocks.',
             num_dblk='number of dummy blocks on both sides of latch.',
             show_pins='True to draw pin geometries.',
+            ref_num_nblk='If not None, copy unchanged rows from the latch with this number of nmos blocks.',
         )
 
     def draw_layout(self):
@@ -94,6 +134,7 @@ class StrongArmLatch(LaygoBase):
         num_dblk = self.params['num_dblk']
         num_nand_blk = self.params['num_nand_blk']
         show_pins = self.params['show_pins']
+        ref_num_nblk = self.params['ref_num_nblk']
         wire_sp = 2
         wire_nand_sp = 2
         nand_sp_blk = 1
@@ -156,47 +197,56 @@ class StrongArmLatch(LaygoBase):
         tot_nand_blk = num_sp_blk + 2 * num_nand_blk + nand_sp_blk
         tot_blk = tot_latch_blk + tot_nand_blk
 
+        # rows 0 and 5 only depend on the total number of blocks.  Row 4 also depends on the
+        # pmos dummy and NAND spacing blocks.
+        self._row_plan = {
+            0: (tot_blk, ),
+            4: (tot_blk, colp, num_sp_blk),
+            5: (tot_blk, ),
+        }
+
+        # copy unchanged rows from the reference latch
+        copy_dict = {}
+        if ref_num_nblk is not None and ref_num_nblk != num_nblk:
+            ref_params = self.params.copy()
+            ref_params['num_nblk'] = ref_num_nblk
+            ref_params['ref_num_nblk'] = None
+            ref_master = self.new_template(params=ref_params, temp_cls=StrongArmLatch)
+            ref_plan = ref_master.row_plan
+            self._copied_rows = sorted((row_idx for row_idx, plan in self._row_plan.items()
+                                        if ref_plan[row_idx] == plan))
+            copy_dict = self.copy_rows(ref_master, self._copied_rows)
+
         # add blocks
         pdum_list, ndum_list = [], []
         blk_type = 'fg2d'
 
         # nwell tap
         cur_col, row_idx = 0, 5
-        nw_tap = self.add_laygo_primitive('sub', loc=(cur_col, row_idx), nx=tot_blk, spx=1)
+        if row_idx in copy_dict:
+            nw_tap = copy_dict[row_idx][0]
+        else:
+            nw_tap = self.add_laygo_primitive('sub', loc=(cur_col, row_idx), nx=tot_blk, spx=1)
 
         # pmos inverter row
-        cur_col, row_idx = 0, 4
-        pdum_list.append((self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx), nx=colp, spx=1), 0))
-        cur_col += colp
-        rst_midp = self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx))
-        cur_col += 1
-        rst_outp = self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx))
-        cur_col += 1
-        invp_outp = self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx), nx=num_pblk, spx=1)
-        cur_col += num_pblk
-        pdum_list.append((self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx)), 0))
-        cur_col += 1
-        invp_outn = self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx), nx=num_pblk, spx=1)
-        cur_col += num_pblk
-        rst_outn = self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx))
-        cur_col += 1
-        rst_midn = self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx))
-        cur_col += 1
-        pdum_list.append((self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx), nx=colp, spx=1), 0))
-        cur_col += colp + num_sp_blk
+        row_idx = 4
+        if row_idx in copy_dict:
+            pinst_list = copy_dict[row_idx]
+        else:
+            pinst_list = self._draw_pmos_row(row_idx, blk_type, colp, num_pblk, num_sp_blk, num_nand_blk, nand_sp_blk)
+        pdum_list.extend(((pinst_list[idx], 0) for idx in (0, 4, 8)))
+        rst_midp, rst_outp, invp_outp = pinst_list[1:4]
+        invp_outn, rst_outn, rst_midn = pinst_list[5:8]
+        # NAND primitives, with the space block in between
         nandpl, nandpr = {'gb': [], 'gt': [], 'd': [], 's': []}, {'gb': [], 'gt': [], 'd': [], 's': []}
-        for nand_blk_idx, nand_dict in enumerate([nandpl, nandpr]):
-            for idx in range(num_nand_blk):
-                inst = self.add_laygo_primitive('fg2s', loc=(cur_col + idx, row_idx), flip=idx % 2 == 1)
+        nand_start = 9
+        for nand_dict in (nandpl, nandpr):
+            for inst in pinst_list[nand_start:nand_start + num_nand_blk]:
                 nand_dict['gb'].extend(inst.get_all_port_pins('g0'))
                 nand_dict['gt'].extend(inst.get_all_port_pins('g1'))
                 nand_dict['d'].extend(inst.get_all_port_pins('d'))
                 nand_dict['s'].extend(inst.get_all_port_pins('s'))
-            cur_col += num_nand_blk
-            if nand_blk_idx == 0:
-                # add space block, cut g/gb
-                self.add_laygo_space(3, num_blk=nand_sp_blk, loc=(cur_col, row_idx), sep_mode=3)
-            cur_col += nand_sp_blk
+            nand_start += num_nand_blk + 1
 
         # nmos inverter row
         cur_col, row_idx = 0, 3
@@ -260,7 +310,10 @@ class StrongArmLatch(LaygoBase):
 
         # pwell tap
         cur_col, row_idx = 0, 0
-        pw_tap = self.add_laygo_primitive('sub', loc=(cur_col, row_idx), nx=tot_blk, spx=1)
+        if row_idx in copy_dict:
+            pw_tap = copy_dict[row_idx][0]
+        else:
+            pw_tap = self.add_laygo_primitive('sub', loc=(cur_col, row_idx), nx=tot_blk, spx=1)
 
         # compute overall block size
         self.set_laygo_size(num_col=tot_blk)
@@ -439,6 +492,42 @@ class StrongArmLatch(LaygoBase):
         self.add_pin('midn', outn, show=show_pins)
         self.connect_differential_tracks(outn, outp, ym_layer, nand_inn_tid, nand_inp_tid)
 
+    def _draw_pmos_row(self, row_idx, blk_type, colp, num_pblk, num_sp_blk, num_nand_blk, nand_sp_blk):
+        # type: (int, str, int, int, int, int, int) -> List[Instance]
+        """Draw the pmos inverter and NAND row, and return the instances in the order they were added."""
+        inst_list = []
+        cur_col = 0
+        inst_list.append(self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx), nx=colp, spx=1))
+        cur_col += colp
+        # reset mid, reset out, and inverter of the positive side
+        inst_list.append(self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx)))
+        cur_col += 1
+        inst_list.append(self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx)))
+        cur_col += 1
+        inst_list.append(self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx), nx=num_pblk, spx=1))
+        cur_col += num_pblk
+        inst_list.append(self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx)))
+        cur_col += 1
+        # inverter, reset out, and reset mid of the negative side
+        inst_list.append(self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx), nx=num_pblk, spx=1))
+        cur_col += num_pblk
+        inst_list.append(self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx)))
+        cur_col += 1
+        inst_list.append(self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx)))
+        cur_col += 1
+        inst_list.append(self.add_laygo_primitive(blk_type, loc=(cur_col, row_idx), nx=colp, spx=1))
+        cur_col += colp + num_sp_blk
+        for nand_blk_idx in range(2):
+            for idx in range(num_nand_blk):
+                inst_list.append(self.add_laygo_primitive('fg2s', loc=(cur_col + idx, row_idx), flip=idx % 2 == 1))
+            cur_col += num_nand_blk
+            if nand_blk_idx == 0:
+                # add space block, cut g/gb
+                inst_list.append(self.add_laygo_space(3, num_blk=nand_sp_blk, loc=(cur_col, row_idx), sep_mode=3))
+            cur_col += nand_sp_blk
+
+        return inst_list
+
 
 def make_tdb(prj, target_lib, specs):
     grid_specs = specs['routing_grid']
@@ -452,6 +541,43 @@ def make_tdb(prj, target_lib, specs):
     return tdb
 
 
+def get_row_summary(template, row_idx):
+    # masters are compared by identity, both latches are built in the same template database.
+    return [(rec.kind, rec.master, rec.inst_name, rec.loc, rec.orient, rec.nx, rec.spx,
+             rec.intv_list, rec.is_fill) for rec in template.get_row_log(row_idx)]
+
+
+def get_port_summary(template):
+    port_info = []
+    for name in sorted(template.port_names_iter()):
+        pin_list = []
+        for warr in template.get_port(name).get_pins():
+            tid = warr.track_id
+            pin_list.append((warr.layer_id, tid.base_index, tid.num, tid.pitch, tid.width,
+                             warr.lower, warr.upper))
+        port_info.append((name, sorted(pin_list)))
+    return template.size, template.array_box, port_info
+
+
+def check_copy_rows(template, temp_db, params):
+    """Check that the rows copied from the reference latch match the rows of a latch drawn from scratch."""
+    new_params = params.copy()
+    new_params['ref_num_nblk'] = None
+    new_temp = temp_db.new_template(params=new_params, temp_cls=StrongArmLatch, debug=False)
+
+    num_fail = 0
+    for row_idx in template.copied_rows:
+        if get_row_summary(template, row_idx) != get_row_summary(new_temp, row_idx):
+            num_fail += 1
+            print('copied row %d does not match.' % row_idx)
+    if get_port_summary(template) != get_port_summary(new_temp):
+        num_fail += 1
+        print('ports do not match.')
+
+    print('copied rows: %s, %d mismatches.' % (template.copied_rows, num_fail))
+    return num_fail
+
+
 def generate(prj, specs):
     lib_name = 'AAAFOO'
 
@@ -460,6 +586,8 @@ def generate(prj, specs):
     temp_db = make_tdb(prj, lib_name, specs)
 
     template = temp_db.new_template(params=params, temp_cls=StrongArmLatch, debug=False)
+    if params.get('ref_num_nblk', None) is not None and check_copy_rows(template, temp_db, params) > 0:
+        raise ValueError('copied rows do not match the original rows.')
     name = 'STRONGARM_LATCH'
     print('create layout')
     temp_db.batch_layout(prj, [template], [name])